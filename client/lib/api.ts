@@ -2,6 +2,8 @@
 
 const RAW = process.env.NEXT_PUBLIC_API_BASE_URL || "";
 const BASE_URL = RAW.replace(/\/$/, "");
+// O SSE roda num processo ASGI próprio (processo "events" do procfile).
+const EVENTS_BASE_URL = (process.env.NEXT_PUBLIC_EVENTS_BASE_URL || RAW).replace(/\/$/, "");
 
 export interface PortfolioProfile {
   id: number;
@@ -84,6 +86,33 @@ export interface Language {
   order_index: number;
 }
 
+export interface ProjectImageVariant {
+  url: string;
+  width: number;
+  height: number;
+  format: "webp" | "jpeg";
+}
+
+export interface ProjectImage {
+  id: number;
+  url: string | null;
+  alt_text: string;
+  width: number | null;
+  height: number | null;
+  variants: ProjectImageVariant[];
+}
+
+export interface ProjectRepository {
+  full_name: string;
+  description: string;
+  url: string;
+  stars: number;
+  forks: number;
+  language: string | null;
+  languages: string[];
+  pushed_at: string | null;
+}
+
 export interface Project {
   id: number;
   title: string;
@@ -93,22 +122,27 @@ export interface Project {
   repo_url: string | null;
   demo_url: string | null;
   highlight: boolean;
+  images: ProjectImage[];
+  repository: ProjectRepository | null;
   created_at: string | null;
   updated_at: string | null;
 }
 
+// Seções desabilitadas no admin (ou fora de `sections`) não vêm na resposta.
 export interface PortfolioResponse {
-  profile: PortfolioProfile | null;
-  sections: SectionConfig[];
-  skills: Skill[];
-  experiences: Experience[];
-  certifications: Certification[];
-  education: Education[];
-  services: Service[];
-  languages: Language[];
-  projects: Project[];
+  profile?: PortfolioProfile | null;
+  sections?: SectionConfig[];
+  skills?: Skill[];
+  experiences?: Experience[];
+  certifications?: Certification[];
+  education?: Education[];
+  services?: Service[];
+  languages?: Language[];
+  projects?: Project[];
 }
 
+export type PortfolioSection = keyof PortfolioResponse;
+
 async function safeJson<T>(res: Response): Promise<T | null> {
   try {
     return (await res.json()) as T;
@@ -117,11 +151,21 @@ async function safeJson<T>(res: Response): Promise<T | null> {
   }
 }
 
-export async function fetchPortfolio(): Promise<PortfolioResponse | null> {
+// `lang` força o idioma do conteúdo; sem ele o backend usa o Accept-Language.
+// `sections` limita a resposta aos blocos informados.
+export async function fetchPortfolio(
+  lang?: string,
+  sections?: PortfolioSection[]
+): Promise<PortfolioResponse | null> {
   if (!BASE_URL) return null;
 
+  const params = new URLSearchParams();
+  if (lang) params.set("lang", lang);
+  if (sections?.length) params.set("sections", sections.join(","));
+  const query = params.toString() ? `?${params.toString()}` : "";
+
   try {
-    const res = await fetch(`${BASE_URL}/api/portfolio/`, {
+    const res = await fetch(`${BASE_URL}/api/portfolio/${query}`, {
       cache: "no-store",
     });
 
@@ -133,6 +177,118 @@ export async function fetchPortfolio(): Promise<PortfolioResponse | null> {
   }
 }
 
+export interface StatsDuration {
+  days: number;
+  months: number;
+  years: number;
+  periods: number;
+  since: string | null;
+}
+
+export interface PortfolioStats {
+  as_of: string;
+  experience: StatsDuration & {
+    roles: number;
+    current_roles: number;
+    past_roles: number;
+    companies: number;
+  };
+  education: StatsDuration & {
+    total: number;
+    in_progress: number;
+    completed: number;
+  };
+  skills: {
+    total: number;
+    by_category: Record<string, number>;
+  };
+  certifications: {
+    total: number;
+    valid: number;
+    expired: number;
+    no_expiration: number;
+  };
+}
+
+export async function fetchStats(): Promise<PortfolioStats | null> {
+  if (!BASE_URL) return null;
+
+  try {
+    const res = await fetch(`${BASE_URL}/api/stats/`, {
+      cache: "no-store",
+    });
+
+    if (!res.ok) return null;
+
+    return (await res.json()) as PortfolioStats;
+  } catch {
+    return null;
+  }
+}
+
+export interface Suggestion {
+  type: "skill" | "project" | "company";
+  label: string;
+  id?: number; // habilidades
+  slug?: string; // projetos
+}
+
+// Autocomplete da busca; sem diferença de acentos e maiúsculas.
+export async function fetchSuggestions(
+  prefix: string,
+  limit?: number
+): Promise<Suggestion[]> {
+  if (!BASE_URL || !prefix.trim()) return [];
+
+  const params = new URLSearchParams({ prefix });
+  if (limit) params.set("limit", String(limit));
+
+  try {
+    const res = await fetch(`${BASE_URL}/api/suggest/?${params.toString()}`);
+
+    if (!res.ok) return [];
+
+    const data = await safeJson<{ results: Suggestion[] }>(res);
+    return data?.results ?? [];
+  } catch {
+    return [];
+  }
+}
+
+export interface BatchItem {
+  id: string;
+  path: string; // ex.: "/api/projects/?highlight=true"
+}
+
+export interface BatchResult<T = unknown> {
+  id: string;
+  status: number;
+  body: T;
+}
+
+// Vários GETs da API em uma única requisição; resultados na mesma ordem.
+export async function fetchBatch(
+  requests: BatchItem[]
+): Promise<BatchResult[] | null> {
+  if (!BASE_URL) return null;
+
+  try {
+    const res = await fetch(`${BASE_URL}/api/batch/`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ requests }),
+      cache: "no-store",
+    });
+
+    if (!res.ok) return null;
+
+    const data = await safeJson<{ responses: BatchResult[] }>(res);
+    return data?.responses ?? null;
+  } catch {
+    return null;
+  }
+}
+
 export async function sendContactMessage(payload: {
   name: string;
   email: string;
@@ -155,4 +311,27 @@ export async function sendContactMessage(payload: {
   }
 
   return res.json();
-}
\ No newline at end of file
+}
+
+/**
+ * Assina o canal SSE de invalidação de conteúdo.
+ * `onChange` recebe a nova versão sempre que algum dado do portfólio mudar.
+ * Retorna uma função para encerrar a conexão.
+ */
+export function subscribeContentVersion(
+  onChange: (version: number) => void
+): () => void {
+  if (!EVENTS_BASE_URL || typeof EventSource === "undefined") return () => {};
+
+  const source = new EventSource(`${EVENTS_BASE_URL}/api/events/`);
+  source.addEventListener("content-version", (event) => {
+    try {
+      const { version } = JSON.parse((event as MessageEvent).data);
+      onChange(version);
+    } catch {
+      // evento malformado: ignora
+    }
+  });
+
+  return () => source.close();
+}
@@ -1,3 +1,344 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db.models import Max, Min
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.functional import cached_property
 
-# Register your models here.
+from . import inbox, ordering, rollups
+from .models import (
+    UserProfile,
+    Skill,
+    Experience,
+    Certification,
+    Project,
+    ProjectImage,
+    ContactMessage,
+    ContactInboxCounter,
+    ContactDailyCount,
+    Education,
+    Service,
+    Language,
+    SectionConfig,
+    LinkHealth,
+    RepositoryMetadata,
+)
+
+
+# ---------- Conteúdo do portfólio ----------
+
+class OrderedAdminMixin:
+    """
+    Ações de ordem para models com order_index (core.ordering): mover as
+    selecionadas para o topo/fim grava só as chaves delas; renumerar
+    reescreve a seção num único bulk_update.
+    """
+    actions = ["move_to_top", "move_to_bottom", "renumber_order"]
+
+    def _selected_in_order(self, queryset) -> list:
+        selected = set(queryset.values_list("pk", flat=True))
+        return [pk for pk, _ in ordering.current_order(self.model) if pk in selected]
+
+    @admin.action(description="Mover para o topo", permissions=["change"])
+    def move_to_top(self, request, queryset):
+        moves = [(pk, ordering.FIRST) for pk in reversed(self._selected_in_order(queryset))]
+        result = ordering.move(self.model, moves)
+        self.message_user(request, f"{result['changed']} item(ns) com a ordem alterada.")
+
+    @admin.action(description="Mover para o fim", permissions=["change"])
+    def move_to_bottom(self, request, queryset):
+        moves = [(pk, ordering.LAST) for pk in self._selected_in_order(queryset)]
+        result = ordering.move(self.model, moves)
+        self.message_user(request, f"{result['changed']} item(ns) com a ordem alterada.")
+
+    @admin.action(description="Renumerar a ordem da seção (espaçada)", permissions=["change"])
+    def renumber_order(self, request, queryset):
+        changed = ordering.renumber(self.model)
+        self.message_user(request, f"{changed} item(ns) renumerado(s).")
+
+
+@admin.register(UserProfile)
+class UserProfileAdmin(admin.ModelAdmin):
+    list_display = ("full_name", "job_title", "email", "portfolio_slug", "updated_at")
+    search_fields = ("full_name", "email")
+    prepopulated_fields = {"portfolio_slug": ("full_name",)}
+
+
+@admin.register(Skill)
+class SkillAdmin(OrderedAdminMixin, admin.ModelAdmin):
+    list_display = ("name", "category", "level", "order_index")
+    list_editable = ("order_index",)
+    list_filter = ("category",)
+    search_fields = ("name",)
+
+
+@admin.register(Experience)
+class ExperienceAdmin(OrderedAdminMixin, admin.ModelAdmin):
+    list_display = ("role", "company_name", "start_date", "end_date", "is_current", "order_index")
+    list_editable = ("order_index",)
+    list_filter = ("is_current",)
+    search_fields = ("role", "company_name")
+
+
+@admin.register(Certification)
+class CertificationAdmin(OrderedAdminMixin, admin.ModelAdmin):
+    list_display = ("name", "institution", "issue_date", "expiration_date", "order_index")
+    list_editable = ("order_index",)
+    search_fields = ("name", "institution")
+
+
+class ProjectImageInline(admin.TabularInline):
+    model = ProjectImage
+    extra = 0
+    fields = ("image", "alt_text", "order_index", "width", "height", "variant_count")
+    readonly_fields = ("width", "height", "variant_count")
+
+    @admin.display(description="Variantes")
+    def variant_count(self, obj):
+        return len(obj.variants or [])
+
+
+@admin.register(Project)
+class ProjectAdmin(admin.ModelAdmin):
+    list_display = ("title", "slug", "highlight", "created_at")
+    list_filter = ("highlight",)
+    search_fields = ("title", "slug")
+    prepopulated_fields = {"slug": ("title",)}
+    inlines = [ProjectImageInline]
+
+
+@admin.register(RepositoryMetadata)
+class RepositoryMetadataAdmin(admin.ModelAdmin):
+    list_display = ("full_name", "project", "stars", "forks", "language", "pushed_at", "fetched_at")
+    search_fields = ("full_name",)
+    readonly_fields = [f.name for f in RepositoryMetadata._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ProjectImage)
+class ProjectImageAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "project", "width", "height", "order_index", "created_at")
+    list_filter = ("project",)
+    readonly_fields = ("width", "height", "content_hash", "variants", "created_at")
+
+
+@admin.register(Education)
+class EducationAdmin(OrderedAdminMixin, admin.ModelAdmin):
+    list_display = ("degree", "institution", "start_date", "end_date", "is_current", "order_index")
+    list_editable = ("order_index",)
+    search_fields = ("degree", "institution")
+
+
+@admin.register(Service)
+class ServiceAdmin(OrderedAdminMixin, admin.ModelAdmin):
+    list_display = ("title", "highlight", "order_index")
+    list_editable = ("order_index",)
+    list_filter = ("highlight",)
+    search_fields = ("title",)
+
+
+@admin.register(Language)
+class LanguageAdmin(OrderedAdminMixin, admin.ModelAdmin):
+    list_display = ("name", "level", "order_index")
+    list_editable = ("order_index",)
+
+
+@admin.register(SectionConfig)
+class SectionConfigAdmin(OrderedAdminMixin, admin.ModelAdmin):
+    list_display = ("section_key", "is_enabled", "order_index")
+    list_editable = ("is_enabled", "order_index")
+
+
+# ---------- Caixa de entrada (ContactMessage) ----------
+
+class KnownCountPaginator(Paginator):
+    """
+    Paginator que usa um total já conhecido em vez de rodar COUNT(*).
+    """
+
+    def __init__(self, object_list, per_page, known_count: int, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.known_count = known_count
+
+    @cached_property
+    def count(self):
+        return self.known_count
+
+
+@admin.register(ContactMessage)
+class ContactMessageAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "name", "email", "subject", "is_read")
+    list_filter = ("is_read",)
+    search_fields = ("email", "subject")
+    readonly_fields = ("created_at",)
+    show_full_result_count = False
+    actions = ["mark_as_read", "mark_as_unread", "delete_messages"]
+    inbox_page_size = 50
+
+    def get_actions(self, request):
+        # A ação padrão monta uma página de confirmação carregando cada linha.
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        params = set(request.GET) - {"p", "o"}
+        known = None
+        if not params:
+            known = inbox.get_counters().total_count
+        elif params == {"is_read__exact"}:
+            counters = inbox.get_counters()
+            if request.GET["is_read__exact"] == "0":
+                known = counters.unread_count
+            elif request.GET["is_read__exact"] == "1":
+                known = counters.total_count - counters.unread_count
+        if known is None:
+            return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+        return KnownCountPaginator(
+            queryset, per_page, known, orphans=orphans, allow_empty_first_page=allow_empty_first_page
+        )
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context["title"] = (
+            f"Mensagens de contato ({inbox.unread_count()} não lidas)"
+        )
+        return super().changelist_view(request, extra_context=extra_context)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and "is_read" in form.changed_data:
+            inbox.adjust_counters(unread=-1 if obj.is_read else 1)
+            day = rollups.day_of(obj.created_at)
+            rollups.adjust({(day, obj.is_read): 1, (day, not obj.is_read): -1})
+
+    def delete_model(self, request, obj):
+        inbox.delete_messages(ContactMessage.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        inbox.delete_messages(queryset)
+
+    @admin.action(description="Marcar como lidas")
+    def mark_as_read(self, request, queryset):
+        changed = inbox.set_read(queryset, True)
+        self.message_user(request, f"{changed} mensagem(ns) marcada(s) como lida(s).")
+
+    @admin.action(description="Marcar como não lidas")
+    def mark_as_unread(self, request, queryset):
+        changed = inbox.set_read(queryset, False)
+        self.message_user(request, f"{changed} mensagem(ns) marcada(s) como não lida(s).")
+
+    @admin.action(description="Excluir selecionadas (sem confirmação)", permissions=["delete"])
+    def delete_messages(self, request, queryset):
+        deleted = inbox.delete_messages(queryset)
+        self.message_user(request, f"{deleted} mensagem(ns) excluída(s).")
+
+    # ----- Caixa de entrada com paginação por cursor -----
+
+    def get_urls(self):
+        urls = [
+            path(
+                "inbox/",
+                self.admin_site.admin_view(self.inbox_view),
+                name="core_contactmessage_inbox",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def inbox_view(self, request):
+        if not self.has_view_permission(request):
+            return redirect("admin:index")
+
+        if request.method == "POST":
+            try:
+                ids = [int(pk) for pk in request.POST.getlist("ids")]
+            except ValueError:
+                self.message_user(request, "Seleção inválida.", level=messages.ERROR)
+                return redirect(request.get_full_path())
+            action = request.POST.get("action")
+            selected = ContactMessage.objects.filter(pk__in=ids)
+            if action == "mark_read" and self.has_change_permission(request):
+                changed = inbox.set_read(selected, True)
+                self.message_user(request, f"{changed} mensagem(ns) marcada(s) como lida(s).")
+            elif action == "delete" and self.has_delete_permission(request):
+                deleted = inbox.delete_messages(selected)
+                self.message_user(request, f"{deleted} mensagem(ns) excluída(s).")
+            else:
+                self.message_user(request, "Ação inválida.", level=messages.ERROR)
+            return redirect(request.get_full_path())
+
+        unread_only = request.GET.get("unread") == "1"
+        items, next_cursor = inbox.keyset_page(
+            cursor=request.GET.get("cursor"),
+            unread_only=unread_only,
+            limit=self.inbox_page_size,
+        )
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Caixa de entrada",
+            "items": items,
+            "next_cursor": next_cursor,
+            "unread_only": unread_only,
+            "counters": inbox.get_counters(),
+            "changelist_url": reverse("admin:core_contactmessage_changelist"),
+        }
+        return TemplateResponse(request, "admin/core/contactmessage/inbox.html", context)
+
+
+@admin.register(ContactInboxCounter)
+class ContactInboxCounterAdmin(admin.ModelAdmin):
+    list_display = ("unread_count", "total_count")
+    readonly_fields = ("total_count", "unread_count")
+    actions = ["reconcile"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Recalcular a partir das mensagens")
+    def reconcile(self, request, queryset):
+        counter = inbox.reconcile_counters()
+        self.message_user(request, f"Contadores recalculados: {counter}.")
+
+
+# ---------- Verificação de links ----------
+
+@admin.register(LinkHealth)
+class LinkHealthAdmin(admin.ModelAdmin):
+    list_display = ("url", "status", "status_code", "response_ms", "consecutive_failures", "checked_at")
+    list_filter = ("status",)
+    search_fields = ("url",)
+    readonly_fields = [f.name for f in LinkHealth._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ContactDailyCount)
+class ContactDailyCountAdmin(admin.ModelAdmin):
+    list_display = ("day", "is_read", "count")
+    list_filter = ("is_read",)
+    date_hierarchy = "day"
+    readonly_fields = ("day", "is_read", "count")
+    actions = ["reconcile"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Recalcular os dias selecionados a partir das mensagens")
+    def reconcile(self, request, queryset):
+        days = queryset.aggregate(first=Min("day"), last=Max("day"))
+        differences = rollups.reconcile(days["first"], days["last"])
+        self.message_user(
+            request,
+            f"{len(differences)} contagem(ns) corrigida(s) entre {days['first']} e {days['last']}.",
+        )
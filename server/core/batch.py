@@ -0,0 +1,151 @@
+# core/batch.py
+"""
+Execução de /api/batch/: vários GETs da API em uma única requisição.
+
+Cada sub-request é resolvido pelo URLconf e chama a view diretamente, sem
+passar de novo pelos middlewares: usuário, cookies e cabeçalhos vêm da
+requisição do lote, e o idioma é negociado por sub-request (?lang=).
+Sub-requests iguais rodam uma vez só, e as versões de conteúdo são lidas do
+cache uma vez para o lote inteiro (core.cache.shared_versions).
+
+Os sub-requests rodam em sequência na thread da requisição, sobre a mesma
+conexão com o banco: quase todos são leituras de payload cacheado ou
+consultas de poucos milissegundos, e rodar em threads exigiria uma conexão
+por thread.
+"""
+import json
+from urllib.parse import urlsplit
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+from . import locales
+from .cache import shared_versions
+
+API_PREFIX = "/api/"
+BATCH_PATH = "/api/batch/"
+
+# Cabeçalhos do lote que não valem para os sub-requests: as respostas
+# entram no corpo do lote sem compressão e sem revalidação própria.
+DROPPED_HEADERS = (
+    "HTTP_ACCEPT_ENCODING",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "CONTENT_TYPE",
+    "CONTENT_LENGTH",
+)
+
+
+class BatchError(ValueError):
+    pass
+
+
+def parse_batch(payload, max_requests: int) -> list:
+    """
+    Valida o corpo do lote e devolve [(id, path, query)] na ordem pedida.
+
+    Formato: {"requests": [{"id": "perfil", "path": "/api/profile/"}, ...]};
+    "id" é opcional (padrão: a posição na lista).
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("requests"), list):
+        raise BatchError('Use {"requests": [{"id": "...", "path": "/api/..."}]}.')
+    items = payload["requests"]
+    if not items:
+        raise BatchError("Informe ao menos um sub-request.")
+    if len(items) > max_requests:
+        raise BatchError(f"No máximo {max_requests} sub-requests por lote.")
+
+    parsed, ids = [], set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            raise BatchError(f"Sub-request {index}: 'path' obrigatório.")
+        item_id = item.get("id", str(index))
+        if not isinstance(item_id, str) or item_id in ids:
+            raise BatchError(f"Sub-request {index}: 'id' deve ser texto único.")
+        method = str(item.get("method", "GET")).upper()
+        if method != "GET":
+            raise BatchError(f"Sub-request {index}: só GET é permitido no lote.")
+        ids.add(item_id)
+
+        parts = urlsplit(item["path"])
+        path = parts.path
+        if parts.scheme or parts.netloc or not path.startswith(API_PREFIX):
+            raise BatchError(f"Sub-request {index}: o path deve começar com {API_PREFIX}.")
+        if not path.endswith("/"):
+            path += "/"
+        if path == BATCH_PATH:
+            raise BatchError(f"Sub-request {index}: lotes não podem ser aninhados.")
+        parsed.append((item_id, path, parts.query))
+    return parsed
+
+
+def _sub_request(request, path: str, query: str) -> HttpRequest:
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = path
+    sub.META = {key: value for key, value in request.META.items() if key not in DROPPED_HEADERS}
+    sub.META.update(REQUEST_METHOD="GET", PATH_INFO=path, QUERY_STRING=query)
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    for name in ("user", "session"):
+        if hasattr(request, name):
+            setattr(sub, name, getattr(request, name))
+    sub.content_locale = locales.negotiate(
+        sub.GET.get("lang"), sub.META.get("HTTP_ACCEPT_LANGUAGE")
+    )
+    return sub
+
+
+def _error(message: str) -> bytes:
+    return json.dumps({"error": message}).encode("utf-8")
+
+
+def _execute(request, path: str, query: str) -> tuple:
+    """
+    (status, corpo JSON em bytes) de um sub-request.
+    """
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return 404, _error("Rota não encontrada.")
+
+    sub = _sub_request(request, path, query)
+    try:
+        with locales.using_locale(sub.content_locale):
+            response = match.func(sub, *match.args, **match.kwargs)
+    except Http404 as exc:
+        return 404, _error(str(exc) or "Não encontrado.")
+    except Exception as exc:
+        return 500, json.dumps({"error": "Erro interno.", "detail": str(exc)}).encode("utf-8")
+
+    if response.streaming:
+        return 400, _error("Rota não suportada no lote.")
+    content = response.content
+    if response.get("Content-Type", "").startswith("application/json"):
+        return response.status_code, content
+    # Redirecionamentos (ex.: login do admin) e respostas que não são JSON.
+    return response.status_code, json.dumps(
+        {"location": response.get("Location")} if response.has_header("Location")
+        else content.decode("utf-8", "replace"),
+        cls=DjangoJSONEncoder,
+    ).encode("utf-8")
+
+
+def run_batch(request, items) -> bytes:
+    """
+    Executa os sub-requests e monta o corpo do lote:
+    {"responses": [{"id": ..., "status": ..., "body": ...}, ...]}, na ordem
+    pedida. Os corpos JSON das views entram como estão, sem reserializar.
+    """
+    results = {}
+    parts = []
+    with shared_versions():
+        for item_id, path, query in items:
+            key = (path, query)
+            if key not in results:
+                results[key] = _execute(request, path, query)
+            status, body = results[key]
+            head = json.dumps({"id": item_id, "status": status})[:-1]
+            parts.append(head.encode("utf-8") + b', "body": ' + body + b"}")
+    return b'{"responses": [' + b", ".join(parts) + b"]}"
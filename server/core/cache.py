@@ -0,0 +1,115 @@
+# core/cache.py
+"""
+Versões de conteúdo mantidas no cache do Django.
+
+Cada bloco do payload do portfólio (profile, skills, projects...) tem um
+contador próprio, além do contador global "content". Qualquer alteração em
+um model de conteúdo incrementa o contador do bloco e o global; caches e
+consumidores (SSE, front) usam esses números para saber quando revalidar.
+
+Alterações que valem para todos os idiomas incrementam também "shared";
+as que mexem só nas traduções de um idioma incrementam as versões daquele
+idioma ("skills@en", "content@en") e deixam as dos outros intactas.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.dispatch import Signal
+
+VERSION_KEY_PREFIX = "core:version:"
+CONTENT_SCOPE = "content"
+SHARED_SCOPE = "shared"
+
+
+# Enviado depois de cada bump_versions(scopes=..., locale=...); usado para
+# o purge do cache de borda (core.edgecache).
+versions_bumped = Signal()
+
+# Versões já lidas dentro de shared_versions(): {bloco: versão}.
+_memo = contextvars.ContextVar("core_version_memo", default=None)
+
+
+def _version_key(scope: str) -> str:
+    return f"{VERSION_KEY_PREFIX}{scope}"
+
+
+def locale_scope(scope: str, locale: str) -> str:
+    return f"{scope}@{locale}"
+
+
+def _initial_version() -> int:
+    # Baseado no relógio para que uma chave expulsa do cache nunca volte a
+    # um número já entregue a algum cliente.
+    return time.time_ns() // 1_000_000
+
+
+def get_version(scope: str = CONTENT_SCOPE) -> int:
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key, _initial_version())
+    return version
+
+
+def get_versions(scopes) -> dict:
+    """
+    Lê várias versões em uma única ida ao cache.
+    """
+    memo = _memo.get()
+    if memo is not None:
+        missing = [scope for scope in scopes if scope not in memo]
+        if missing:
+            memo.update(_read_versions(missing))
+        return {scope: memo[scope] for scope in scopes}
+    return _read_versions(scopes)
+
+
+def _read_versions(scopes) -> dict:
+    keys = {_version_key(scope): scope for scope in scopes}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, scope in keys.items():
+        versions[scope] = found[key] if key in found else get_version(scope)
+    return versions
+
+
+@contextmanager
+def shared_versions():
+    """
+    Dentro do bloco cada versão é lida do cache uma vez só, e as próximas
+    leituras vêm da memória. Usado por /api/batch/, em que vários
+    sub-requests consultam as mesmas versões.
+    """
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def bump_versions(*scopes: str, locale: str | None = None) -> None:
+    """
+    Incrementa as versões dos blocos informados e a versão global. Com
+    locale, as versões dos blocos naquele idioma.
+    """
+    if locale is None:
+        targets = {*scopes, SHARED_SCOPE}
+    else:
+        targets = {locale_scope(scope, locale) for scope in (*scopes, CONTENT_SCOPE)}
+    memo = _memo.get()
+    if memo is not None:
+        memo.clear()
+    for scope in {*targets, CONTENT_SCOPE}:
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+    versions_bumped.send(sender=None, scopes=scopes, locale=locale)
+
+
+def get_content_version() -> int:
+    return get_version(CONTENT_SCOPE)
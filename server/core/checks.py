@@ -0,0 +1,51 @@
+# core/checks.py
+"""
+Checagens de configuração de produção: rodam com `manage.py check --deploy`,
+que o release do procfile executa antes de subir os processos.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends cujo conteúdo não sai do processo.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+# Compartilhados, mas cada leitura é uma ida ao banco / ao disco e o incr
+# não é atômico (bumps concorrentes de versão se perdem).
+NON_ATOMIC_CACHES = (
+    "django.core.cache.backends.db.DatabaseCache",
+    "django.core.cache.backends.filebased.FileBasedCache",
+)
+
+HINT = "Configure REDIS_URL (ou memcached via CACHE_BACKEND / CACHE_LOCATION)."
+
+
+@register(Tags.caches, deploy=True)
+def shared_cache_check(app_configs, **kwargs):
+    """
+    Fora do DEBUG o cache default precisa ser compartilhado e atômico: com
+    um cache por processo, uma alteração de conteúdo só invalida o worker
+    que a recebeu e os outros servem payloads velhos.
+    """
+    if settings.DEBUG:
+        return []
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend in PROCESS_LOCAL_CACHES:
+        return [
+            Error(
+                f"CACHES['default'] usa {backend}, que não é compartilhado entre processos.",
+                hint=HINT,
+                id="core.E001",
+            )
+        ]
+    if backend in NON_ATOMIC_CACHES:
+        return [
+            Error(
+                f"CACHES['default'] usa {backend}: o incr não é atômico e cada "
+                "leitura de versão ou payload vira uma consulta.",
+                hint=HINT,
+                id="core.E002",
+            )
+        ]
+    return []
@@ -0,0 +1,41 @@
+# core/dbpool.py
+"""
+Instrumentação do pool de conexões do psycopg 3 (settings.DB_POOL).
+
+pool_metrics() devolve as estatísticas do psycopg_pool acrescidas de
+utilização e tempo médio de espera por conexão. Sem pool configurado
+(SQLite, DB_POOL desligado) retorna None.
+"""
+from django.db import connections
+
+
+def get_pool(alias: str = "default"):
+    return getattr(connections[alias], "pool", None)
+
+
+def pool_metrics(alias: str = "default") -> dict | None:
+    pool = get_pool(alias)
+    if pool is None:
+        return None
+
+    stats = pool.get_stats()
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    in_use = size - available
+    requests = stats.get("requests_num", 0)
+    return {
+        **stats,
+        "alias": alias,
+        "in_use": in_use,
+        "utilization": round(in_use / stats["pool_max"], 4) if stats.get("pool_max") else 0.0,
+        "avg_wait_ms": round(stats.get("requests_wait_ms", 0) / requests, 3) if requests else 0.0,
+    }
+
+
+def all_pool_metrics() -> dict:
+    metrics = {}
+    for alias in connections:
+        data = pool_metrics(alias)
+        if data is not None:
+            metrics[alias] = data
+    return metrics
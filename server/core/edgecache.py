@@ -0,0 +1,150 @@
+# core/edgecache.py
+"""
+Cache de borda (CDN / proxy reverso) para a API pública.
+
+- edge_cached(política, chaves) marca as respostas 200 de uma view com
+  Cache-Control (max-age, s-maxage, stale-while-revalidate, stale-if-error,
+  de EDGE_CACHE_POLICIES) e Surrogate-Key com os blocos de conteúdo de que
+  a resposta depende ("skills", "projects"...).
+- Quando a versão de um bloco muda (core.cache.bump_versions, chamado
+  pelos sinais e pelas escritas em massa), o purger configurado em
+  EDGE_PURGER pede à borda que descarte as respostas com aquelas chaves.
+  Assim a borda pode guardar as respostas até o conteúdo mudar de fato.
+
+Purgers: NullPurger (padrão, não faz nada) e HTTPPurger, que faz
+POST EDGE_PURGE_URL com o cabeçalho Surrogate-Key (formato do purge em
+lote do Fastly; outros CDNs ou um proxy local podem receber o mesmo
+POST). Os pedidos saem de uma thread, agrupados, fora do request.
+"""
+import logging
+import queue
+import threading
+from functools import lru_cache, wraps
+
+import httpx
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+SURROGATE_KEY_HEADER = "Surrogate-Key"
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+def cache_control(policy: str) -> dict:
+    values = settings.EDGE_CACHE_POLICIES[policy]
+    return {
+        "public": True,
+        "max_age": values["max_age"],
+        "s_maxage": values["s_maxage"],
+        "stale_while_revalidate": values["stale_while_revalidate"],
+        "stale_if_error": values["stale_if_error"],
+    }
+
+
+def surrogate_keys(scopes) -> list:
+    prefix = settings.EDGE_CACHE_KEY_PREFIX
+    return sorted(f"{prefix}{scope}" for scope in scopes)
+
+
+def edge_cached(policy: str, scopes=()):
+    """
+    Decorator de view: respostas 200 a GET/HEAD sem cookies ganham a
+    política de cache `policy` e as chaves dos blocos `scopes` (ou de
+    scopes(request), quando eles dependem da requisição).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if (
+                settings.EDGE_CACHE_ENABLED
+                and request.method in CACHEABLE_METHODS
+                and response.status_code == 200
+                and not response.cookies
+                and not response.has_header("Cache-Control")
+            ):
+                patch_cache_control(response, **cache_control(policy))
+                # Prefixo lido a cada resposta, como em purge_scopes: as chaves
+                # marcadas e as purgadas nunca divergem.
+                keys = surrogate_keys(scopes(request) if callable(scopes) else scopes)
+                if keys:
+                    response[SURROGATE_KEY_HEADER] = " ".join(keys)
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+class NullPurger:
+    def purge(self, keys) -> None:
+        pass
+
+
+class HTTPPurger:
+    """
+    Envia os purges para EDGE_PURGE_URL a partir de uma thread: chaves que
+    chegam enquanto um pedido está em curso vão juntas no próximo.
+    """
+
+    def __init__(self, url: str, token: str | None, token_header: str, timeout: float):
+        self.url = url
+        self.headers = {token_header: token} if token else {}
+        self.timeout = timeout
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def purge(self, keys) -> None:
+        if not keys:
+            return
+        self._queue.put(tuple(keys))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name="edge-purger", daemon=True
+                )
+                self._thread.start()
+
+    def _drain(self) -> set:
+        keys = set(self._queue.get())
+        while True:
+            try:
+                keys.update(self._queue.get_nowait())
+            except queue.Empty:
+                return keys
+
+    def _loop(self) -> None:
+        with httpx.Client(timeout=self.timeout) as client:
+            while True:
+                keys = self._drain()
+                try:
+                    response = client.post(
+                        self.url,
+                        headers={**self.headers, SURROGATE_KEY_HEADER: " ".join(sorted(keys))},
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError as exc:
+                    # A borda volta a servir dados novos quando o s-maxage vencer.
+                    logger.warning("Falha no purge de %s: %s", sorted(keys), exc)
+
+
+@lru_cache(maxsize=1)
+def get_purger():
+    purger = import_string(settings.EDGE_PURGER)
+    if purger is HTTPPurger:
+        return HTTPPurger(
+            settings.EDGE_PURGE_URL,
+            settings.EDGE_PURGE_TOKEN,
+            settings.EDGE_PURGE_TOKEN_HEADER,
+            settings.EDGE_PURGE_TIMEOUT,
+        )
+    return purger()
+
+
+def purge_scopes(scopes) -> None:
+    # Desligado, nenhuma resposta saiu marcada para a borda: nada a purgar.
+    if settings.EDGE_CACHE_ENABLED:
+        get_purger().purge(surrogate_keys(scopes))
@@ -0,0 +1,175 @@
+# core/events.py
+"""
+Canal SSE (Server-Sent Events) de invalidação de conteúdo.
+
+Servido direto pela aplicação ASGI (server/asgi.py), fora do ciclo de
+request/response do Django, para que cada conexão ociosa custe apenas uma
+corrotina esperando um asyncio.Event compartilhado.
+
+Um único "broadcaster" por processo consulta a versão global de conteúdo
+(core.cache) a cada CONTENT_EVENTS_POLL_INTERVAL segundos e acorda todos os
+clientes quando ela muda. Sem mudanças, cada cliente recebe um comentário
+de heartbeat a cada CONTENT_EVENTS_HEARTBEAT segundos.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .cache import get_content_version
+
+RETRY_MS = 5000
+
+
+class ContentVersionBroadcaster:
+    """
+    Observa a versão de conteúdo e distribui as mudanças para os assinantes.
+
+    A consulta ao cache roda só enquanto houver pelo menos um assinante.
+    """
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self.version = None
+        self.subscribers = 0
+        self._changed = None
+        self._task = None
+
+    async def subscribe(self) -> int:
+        """
+        Conta o assinante e retorna a versão atual. Se falhar (cache
+        indisponível, cancelamento), o assinante não fica contado.
+        """
+        self.subscribers += 1
+        try:
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            if self._task is None or self._task.done():
+                # Sem polling ativo a versão guardada pode estar velha.
+                self.version = await sync_to_async(
+                    get_content_version, thread_sensitive=False
+                )()
+                self._task = asyncio.create_task(self._poll())
+        except BaseException:
+            self.subscribers -= 1
+            raise
+        return self.version
+
+    def unsubscribe(self) -> None:
+        self.subscribers -= 1
+
+    async def wait_for_change(self, known: int, timeout: float):
+        """
+        Retorna a nova versão ou None se o tempo acabar sem mudanças.
+        """
+        if self.version != known:
+            return self.version
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.version
+
+    async def _poll(self) -> None:
+        read_version = sync_to_async(get_content_version, thread_sensitive=False)
+        while self.subscribers > 0:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                version = await read_version()
+            except Exception:
+                # Cache indisponível: mantém a versão atual e tenta de novo.
+                continue
+            if version != self.version:
+                self.version = version
+                changed, self._changed = self._changed, asyncio.Event()
+                changed.set()
+        self._task = None
+
+
+broadcaster = ContentVersionBroadcaster(settings.CONTENT_EVENTS_POLL_INTERVAL)
+
+
+def _format_event(version: int) -> bytes:
+    data = json.dumps({"version": version})
+    return f"id: {version}\nevent: content-version\ndata: {data}\n\n".encode()
+
+
+def _response_headers(scope) -> list:
+    headers = [
+        (b"content-type", b"text/event-stream; charset=utf-8"),
+        (b"cache-control", b"no-cache"),
+        (b"x-accel-buffering", b"no"),
+    ]
+    # Esta resposta não passa pelo CorsMiddleware, então o header é aplicado aqui.
+    origin = dict(scope.get("headers", [])).get(b"origin", b"").decode("latin-1")
+    if origin and origin in settings.CORS_ALLOWED_ORIGINS:
+        headers.append((b"access-control-allow-origin", origin.encode("latin-1")))
+        headers.append((b"vary", b"Origin"))
+    return headers
+
+
+def _last_event_id(scope):
+    raw = dict(scope.get("headers", [])).get(b"last-event-id")
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
+async def content_events_app(scope, receive, send):
+    """
+    Aplicação ASGI do endpoint CONTENT_EVENTS_PATH.
+
+    Envia "content-version" assim que conecta (ou só se a versão diferir do
+    Last-Event-ID de uma reconexão) e depois a cada mudança.
+    """
+    if scope["method"] != "GET":
+        await send({
+            "type": "http.response.start",
+            "status": 405,
+            "headers": [(b"allow", b"GET"), (b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": b'{"error": "Method not allowed."}'})
+        return
+
+    stream_task = asyncio.current_task()
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                stream_task.cancel()
+                return
+
+    heartbeat = settings.CONTENT_EVENTS_HEARTBEAT
+    watcher = asyncio.create_task(watch_disconnect())
+    subscribed = False
+    try:
+        version = await broadcaster.subscribe()
+        subscribed = True
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": _response_headers(scope),
+        })
+        first = f"retry: {RETRY_MS}\n\n".encode()
+        if _last_event_id(scope) != version:
+            first += _format_event(version)
+        await send({"type": "http.response.body", "body": first, "more_body": True})
+
+        while True:
+            new_version = await broadcaster.wait_for_change(version, heartbeat)
+            if new_version is None:
+                chunk = b": ping\n\n"
+            else:
+                version = new_version
+                chunk = _format_event(version)
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    except (asyncio.CancelledError, OSError):
+        pass
+    finally:
+        if subscribed:
+            broadcaster.unsubscribe()
+        watcher.cancel()
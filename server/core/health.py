@@ -0,0 +1,274 @@
+# core/health.py
+"""
+Readiness do processo: banco(s), cache e SMTP.
+
+As dependências são testadas por uma thread em segundo plano a cada
+HEALTH_PROBE_INTERVAL segundos; o endpoint só lê o último resultado já
+serializado, então uma sonda do load balancer não custa nenhuma consulta.
+Cada dependência guarda as latências das últimas HEALTH_PROBE_WINDOW
+rodadas para os percentis.
+
+O SMTP é informativo: fora do ar, o portfólio continua servindo (só o
+e-mail do contato falha), então ele não tira o processo de rotação. Por
+ser um servidor de terceiros, é testado só a cada HEALTH_SMTP_INTERVAL.
+
+Cada teste é limitado a HEALTH_PROBE_TIMEOUT (statement_timeout no
+PostgreSQL, timeouts de socket de um cliente de cache só da sonda, timeout
+do SMTP), para que uma dependência travada não pare o prober. O corpo
+público traz só situação e latência de cada dependência; as mensagens de
+erro (que podem citar host e usuário do banco) e as métricas do pool vão
+para o log e para a versão só de staff (/api/internal/health/).
+"""
+import json
+import logging
+import math
+import os
+import smtplib
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .dbpool import all_pool_metrics
+
+logger = logging.getLogger(__name__)
+
+PROBE_CACHE_KEY = "core:health:probe"
+
+
+def _probe_database(alias: str) -> None:
+    # A conexão em si é limitada pelo connect_timeout (DB_CONNECT_TIMEOUT).
+    conn = connections[alias]
+    conn.close_if_unusable_or_obsolete()
+    try:
+        with transaction.atomic(using=alias), conn.cursor() as cursor:
+            if conn.vendor == "postgresql":
+                timeout_ms = max(1, int(settings.HEALTH_PROBE_TIMEOUT * 1000))
+                cursor.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    finally:
+        if getattr(conn, "pool", None) is not None:
+            # Com pool, devolve a conexão em vez de ocupar uma vaga.
+            conn.close()
+
+
+# Opções de timeout (segundos) por backend de cache com rede.
+_CACHE_TIMEOUT_OPTIONS = {
+    "django.core.cache.backends.redis.RedisCache": ("socket_timeout", "socket_connect_timeout"),
+    "django.core.cache.backends.memcached.PyMemcacheCache": ("timeout", "connect_timeout"),
+}
+
+
+def probe_cache_backend():
+    """
+    Cliente do cache default só para a sonda, com os timeouts de socket em
+    HEALTH_PROBE_TIMEOUT (o cliente das requisições fica como está).
+    """
+    params = dict(settings.CACHES["default"])
+    backend = params.pop("BACKEND")
+    location = params.pop("LOCATION", "")
+    options = dict(params.get("OPTIONS", {}))
+    for option in _CACHE_TIMEOUT_OPTIONS.get(backend, ()):
+        options[option] = settings.HEALTH_PROBE_TIMEOUT
+    params["OPTIONS"] = options
+    return import_string(backend)(location, params)
+
+
+def _probe_cache(cache) -> None:
+    token = f"{os.getpid()}:{time.monotonic_ns()}"
+    cache.set(PROBE_CACHE_KEY, token, 30)
+    if cache.get(PROBE_CACHE_KEY) != token:
+        raise RuntimeError("Valor gravado não foi lido de volta.")
+
+
+def _probe_smtp() -> None:
+    with smtplib.SMTP(
+        settings.EMAIL_HOST, settings.EMAIL_PORT, timeout=settings.HEALTH_PROBE_TIMEOUT
+    ) as smtp:
+        smtp.noop()
+
+
+def percentile(ordered, fraction: float) -> float:
+    # Nearest-rank sobre uma lista já ordenada.
+    rank = math.ceil(fraction * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class Dependency:
+    def __init__(self, name: str, probe, required: bool, window: int, every: float = 0):
+        self.name = name
+        self.probe = probe
+        self.required = required
+        self.every = every
+        self.next_run = 0.0
+        self.latencies = deque(maxlen=window)
+        self.up = None
+        self.error = ""
+        self.failures = 0
+        self.last_ms = None
+        self.checked_at = None
+
+    def run(self) -> None:
+        if time.monotonic() < self.next_run:
+            return
+        self.next_run = time.monotonic() + self.every
+        start = time.perf_counter()
+        try:
+            self.probe()
+        except Exception as exc:
+            if self.failures == 0:
+                logger.warning("Dependência %s fora do ar.", self.name, exc_info=True)
+            self.up = False
+            self.error = f"{type(exc).__name__}: {exc}"
+            self.failures += 1
+        else:
+            if self.failures:
+                logger.info("Dependência %s de volta após %d falha(s).", self.name, self.failures)
+            self.up = True
+            self.error = ""
+            self.failures = 0
+        self.last_ms = round((time.perf_counter() - start) * 1000, 3)
+        if self.up:
+            self.latencies.append(self.last_ms)
+        self.checked_at = timezone.now()
+
+    def to_dict(self, detail: bool = False) -> dict:
+        """
+        Situação e latências; com detail (só staff), também o erro e as
+        falhas seguidas.
+        """
+        ordered = sorted(self.latencies)
+        data = {
+            "status": "up" if self.up else "down",
+            "required": self.required,
+            "latency_ms": self.last_ms,
+            "p50_ms": percentile(ordered, 0.50) if ordered else None,
+            "p95_ms": percentile(ordered, 0.95) if ordered else None,
+            "p99_ms": percentile(ordered, 0.99) if ordered else None,
+            "samples": len(ordered),
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+        }
+        if detail:
+            data["consecutive_failures"] = self.failures
+            data["error"] = self.error or None
+        return data
+
+
+class HealthProber:
+    """
+    Thread que testa as dependências e publica o resultado em `snapshot`:
+    (monotonic da rodada, pronto?, corpo JSON público em bytes, detalhes
+    para staff).
+    """
+
+    def __init__(self, interval: float, window: int):
+        self.interval = interval
+        cache = probe_cache_backend()
+        self.dependencies = [
+            *(
+                Dependency(f"db:{alias}", lambda alias=alias: _probe_database(alias), True, window)
+                for alias in settings.DATABASES
+            ),
+            Dependency("cache", lambda: _probe_cache(cache), True, window),
+        ]
+        if settings.EMAIL_HOST:
+            self.dependencies.append(
+                Dependency("smtp", _probe_smtp, False, window, settings.HEALTH_SMTP_INTERVAL)
+            )
+        self.snapshot = None
+        self.pid = os.getpid()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="health-prober", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def probe_once(self) -> None:
+        for dependency in self.dependencies:
+            dependency.run()
+        ready = all(d.up for d in self.dependencies if d.required)
+        try:
+            pools = all_pool_metrics()
+        except Exception:
+            pools = {}
+        status = "ready" if ready else "unavailable"
+        body = json.dumps(
+            {"status": status, "dependencies": {d.name: d.to_dict() for d in self.dependencies}}
+        ).encode("utf-8")
+        detail = {
+            "status": status,
+            "dependencies": {d.name: d.to_dict(detail=True) for d in self.dependencies},
+            "db_pool": pools,
+        }
+        self.snapshot = (time.monotonic(), ready, body, detail)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.probe_once()
+            except Exception:
+                logger.exception("Falha na rodada de health check.")
+            self._stop.wait(self.interval)
+        connections.close_all()
+
+
+_prober = None
+_prober_lock = threading.Lock()
+
+
+def get_prober() -> HealthProber:
+    """
+    Prober deste processo, iniciado na primeira chamada. Depois de um fork
+    (workers do gunicorn) a thread do pai não existe mais: cria outra.
+    """
+    global _prober
+    if _prober is None or _prober.pid != os.getpid():
+        with _prober_lock:
+            if _prober is None or _prober.pid != os.getpid():
+                _prober = HealthProber(
+                    settings.HEALTH_PROBE_INTERVAL, settings.HEALTH_PROBE_WINDOW
+                )
+                _prober.start()
+    return _prober
+
+
+def _fresh_snapshot():
+    # Sem rodada ainda, ou com o resultado velho demais (prober travado),
+    # o processo não está pronto.
+    snapshot = get_prober().snapshot
+    if snapshot is None:
+        return None, "starting"
+    max_age = settings.HEALTH_PROBE_INTERVAL * 3 + settings.HEALTH_PROBE_TIMEOUT
+    if time.monotonic() - snapshot[0] > max_age:
+        return None, "stale"
+    return snapshot, None
+
+
+def readiness() -> tuple:
+    """
+    (pronto?, corpo JSON público) do último resultado.
+    """
+    snapshot, status = _fresh_snapshot()
+    if snapshot is None:
+        return False, json.dumps({"status": status}).encode("utf-8")
+    _, ready, body, _ = snapshot
+    return ready, body
+
+
+def readiness_detail() -> tuple:
+    """
+    (pronto?, dict com erros e métricas do pool) para a view de staff.
+    """
+    snapshot, status = _fresh_snapshot()
+    if snapshot is None:
+        return False, {"status": status}
+    _, ready, _, detail = snapshot
+    return ready, detail
@@ -0,0 +1,61 @@
+# core/imaging.py
+"""
+Geração das variantes responsivas das imagens de projeto.
+
+Este módulo não importa o Django de propósito: render_variants() roda em
+processos separados (ProcessPoolExecutor) e precisa ser barato de importar
+e de serializar.
+"""
+import os
+
+from PIL import Image, ImageOps
+
+FORMAT_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+
+def variant_filename(content_hash: str, width: int, fmt: str) -> str:
+    # Nome derivado do conteúdo da original + parâmetros: o mesmo arquivo
+    # sempre gera o mesmo nome, o que permite cache imutável e pular
+    # variantes já existentes.
+    return f"{content_hash[:20]}-{width}w.{EXTENSIONS[fmt]}"
+
+
+def render_variants(source_path: str, content_hash: str, dest_dir: str, widths, formats) -> list:
+    """
+    Gera (ou reaproveita, se já existir no disco) cada combinação largura x
+    formato. Nunca amplia a imagem: larguras maiores que a original são
+    limitadas à largura original. Retorna a lista de variantes.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    variants = []
+    with Image.open(source_path) as original:
+        original = ImageOps.exif_transpose(original)
+        src_width, src_height = original.size
+        seen = set()
+        for width in sorted(widths):
+            target = min(width, src_width)
+            if target in seen:
+                continue
+            seen.add(target)
+            height = max(1, round(src_height * target / src_width))
+            resized = None
+            for fmt in formats:
+                name = variant_filename(content_hash, target, fmt)
+                path = os.path.join(dest_dir, name)
+                if not os.path.exists(path):
+                    if resized is None:
+                        resized = original.resize((target, height), Image.LANCZOS)
+                        if resized.mode not in ("RGB", "RGBA"):
+                            resized = resized.convert("RGBA" if "A" in resized.mode else "RGB")
+                    image = resized.convert("RGB") if fmt == "jpeg" else resized
+                    # Grava em arquivo temporário e renomeia: leitores nunca
+                    # veem uma variante pela metade.
+                    tmp_path = f"{path}.{os.getpid()}.tmp"
+                    image.save(tmp_path, **FORMAT_OPTIONS[fmt])
+                    os.replace(tmp_path, path)
+                variants.append({"width": target, "height": height, "format": fmt, "name": name})
+    return variants
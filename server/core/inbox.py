@@ -0,0 +1,113 @@
+# core/inbox.py
+"""
+Operações da caixa de entrada de ContactMessage.
+
+- Contadores (total / não lidas) mantidos incrementalmente em
+  ContactInboxCounter, no mesmo transaction da alteração, junto com as
+  contagens diárias de core.rollups.
+- Ações em massa como um único UPDATE / DELETE.
+- Paginação por cursor (keyset) em (-created_at, -id), coberta pelos
+  índices contact_created_idx / contact_unread_idx.
+
+Quem alterar contact_message por fora destas funções (SQL direto,
+QuerySet.update) deve rodar reconcile_counters() e rollups.reconcile()
+depois.
+"""
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from . import rollups
+from .models import ContactMessage, ContactInboxCounter
+
+COUNTER_ID = 1
+
+
+def adjust_counters(total: int = 0, unread: int = 0) -> None:
+    if not total and not unread:
+        return
+    updated = ContactInboxCounter.objects.filter(pk=COUNTER_ID).update(
+        total_count=F("total_count") + total,
+        unread_count=F("unread_count") + unread,
+    )
+    if not updated:
+        reconcile_counters()
+
+
+def get_counters() -> ContactInboxCounter:
+    counter = ContactInboxCounter.objects.filter(pk=COUNTER_ID).first()
+    return counter or reconcile_counters()
+
+
+def unread_count() -> int:
+    return get_counters().unread_count
+
+
+def reconcile_counters() -> ContactInboxCounter:
+    """
+    Recalcula os contadores a partir da tabela (uma varredura; use com parcimônia).
+    """
+    totals = ContactMessage.objects.aggregate(
+        total=Count("id"), unread=Count("id", filter=Q(is_read=False))
+    )
+    counter, _ = ContactInboxCounter.objects.update_or_create(
+        pk=COUNTER_ID,
+        defaults={"total_count": totals["total"], "unread_count": totals["unread"]},
+    )
+    return counter
+
+
+def set_read(queryset, is_read: bool = True) -> int:
+    """
+    Marca como lidas (ou não lidas) com um único UPDATE.
+    """
+    with transaction.atomic():
+        deltas = rollups.read_state_deltas(queryset, is_read)
+        changed = queryset.filter(is_read=not is_read).update(is_read=is_read)
+        adjust_counters(unread=-changed if is_read else changed)
+        rollups.adjust(deltas)
+    return changed
+
+
+def delete_messages(queryset) -> int:
+    """
+    Apaga com um único DELETE (ContactMessage não tem relações nem
+    receivers de delete, então o Django não carrega as linhas).
+    """
+    with transaction.atomic():
+        deltas = rollups.queryset_deltas(queryset, sign=-1)
+        unread = sum(n for (_, is_read), n in deltas.items() if not is_read)
+        deleted, _ = queryset.delete()
+        adjust_counters(total=-deleted, unread=unread)
+        rollups.adjust(deltas)
+    return deleted
+
+
+def encode_cursor(message: ContactMessage) -> str:
+    return f"{message.created_at.isoformat()}|{message.id}"
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, pk = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_page(cursor: str | None = None, unread_only: bool = False, limit: int = 50):
+    """
+    Retorna (mensagens, próximo cursor ou None), mais recentes primeiro.
+    O custo não depende da profundidade da página.
+    """
+    qs = ContactMessage.objects.order_by("-created_at", "-id")
+    if unread_only:
+        qs = qs.filter(is_read=False)
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, pk = position
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    items = list(qs[: limit + 1])
+    next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+    return items[:limit], next_cursor
@@ -0,0 +1,384 @@
+# core/journal.py
+"""
+Ingestão write-behind de /api/contact/ (CONTACT_INGEST_MODE = "journal").
+
+A view valida a mensagem, acrescenta uma linha JSON ao segmento do
+processo em CONTACT_JOURNAL_DIR, faz fsync e responde 202 na hora. Uma
+thread do mesmo processo grava o que acumulou em contact_message a cada
+CONTACT_JOURNAL_FLUSH_INTERVAL segundos (ou ao juntar
+CONTACT_JOURNAL_BATCH_SIZE mensagens): um bulk_create e um ajuste dos
+contadores da caixa de entrada por lote, e os e-mails de aviso numa
+única conexão SMTP.
+
+Segmentos:
+- cada processo escreve no próprio arquivo e segura um flock exclusivo
+  nele enquanto vive;
+- para gravar, a thread troca o segmento ativo por um novo, grava o
+  antigo inteiro e só então o apaga;
+- segmento com flock livre é de um processo que morreu: é reprocessado
+  por qualquer processo no modo journal (na inicialização do worker, em
+  core.warmup, e a cada rodada) ou pelo comando flush_contact_journal;
+- registro que não entra no banco por causa do conteúdo (sem campo, valor
+  recusado) é isolado dividindo o lote ao meio até sobrar só ele; vai para
+  *.jsonl.bad e o resto do segmento é gravado normalmente. Com o banco
+  fora do ar, o segmento inteiro fica para a próxima rodada;
+- ao encerrar (atexit ou worker_exit do gunicorn), o processo grava o que
+  restou; se não conseguir, o segmento fica para outro processo.
+
+Cada registro leva um journal_id (UUID) que vai para a mensagem; no
+replay, ids já presentes no banco são pulados, então um crash entre o
+commit e a remoção do segmento não duplica nada. Uma última linha
+incompleta (crash no meio da escrita) nunca foi confirmada ao cliente e
+é descartada.
+
+Como em restore_messages, o bulk_create passa pelo auto_now_add: o
+created_at é o momento da gravação; o do aceite fica no journal.
+"""
+import atexit
+import fcntl
+import json
+import logging
+import os
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import DatabaseError, DataError, IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from . import inbox, rollups
+from .models import ContactMessage
+from .notifications import contact_email
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "contact-"
+SEGMENT_SUFFIX = ".jsonl"
+QUARANTINE_SUFFIX = ".bad"
+FIELDS = ("name", "email", "subject", "message")
+
+
+def _fsync_dir(directory) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Segment:
+    """
+    Arquivo de journal de um processo, com flock exclusivo desde a criação:
+    o arquivo é criado com nome temporário, travado e só então renomeado,
+    para que nenhum outro processo o veja destravado.
+    """
+
+    def __init__(self, directory):
+        name = f"{SEGMENT_PREFIX}{os.getpid()}-{uuid.uuid4().hex}"
+        temp = os.path.join(directory, f".{name}.tmp")
+        self.path = os.path.join(directory, f"{name}{SEGMENT_SUFFIX}")
+        self.fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        os.rename(temp, self.path)
+        _fsync_dir(directory)
+        self.records = 0
+
+    def write(self, line: bytes) -> None:
+        view = memoryview(line)
+        while view:
+            view = view[os.write(self.fd, view):]
+        os.fsync(self.fd)
+        self.records += 1
+
+    def remove(self) -> None:
+        # Apaga antes de soltar o flock: ninguém pega o arquivo no meio.
+        os.unlink(self.path)
+        os.close(self.fd)
+
+    def quarantine(self) -> None:
+        quarantine(self.path)
+        os.close(self.fd)
+
+
+def is_transient(exc: Exception) -> bool:
+    # Banco fora do ar: tenta de novo depois. O resto (registro sem campo,
+    # valor que o banco recusa) não se resolve sozinho.
+    return isinstance(exc, DatabaseError) and not isinstance(exc, (DataError, IntegrityError))
+
+
+def quarantine(path) -> None:
+    """
+    Tira um segmento do caminho (sufixo .bad) para inspeção manual; o que
+    já foi gravado dele é pulado pelo journal_id se ele voltar.
+    """
+    logger.exception("Segmento do journal %s não pôde ser gravado; movido para quarentena.", path)
+    os.rename(path, path + QUARANTINE_SUFFIX)
+
+
+def quarantine_records(path, records) -> None:
+    """
+    Acrescenta a <segmento>.bad os registros recusados, com fsync: já
+    foram confirmados ao cliente e o segmento vai ser apagado.
+    """
+    bad = path + QUARANTINE_SUFFIX
+    with open(bad, "ab") as fh:
+        for record in records:
+            fh.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+    _fsync_dir(os.path.dirname(bad) or ".")
+
+
+def read_segment(path) -> list:
+    """
+    Registros completos de um segmento, na ordem de escrita.
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    records = []
+    for line in data.split(b"\n")[:-1]:  # o que vem depois do último \n está incompleto
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            logger.warning("Linha inválida no journal %s ignorada.", path)
+            continue
+        records.append(record)
+    return records
+
+
+def notify(messages) -> None:
+    if not messages:
+        return
+    try:
+        with get_connection() as connection:
+            connection.send_messages(
+                [contact_email(m.name, m.email, m.subject, m.message) for m in messages]
+            )
+    except Exception:
+        # Como no modo direto: a mensagem fica salva mesmo sem o aviso.
+        logger.exception("Falha ao enviar %d avisos de contato.", len(messages))
+
+
+def _insert(batch) -> list:
+    ids = [uuid.UUID(r["journal_id"]) for r in batch]
+    with transaction.atomic():
+        existing = set(
+            ContactMessage.objects.filter(journal_id__in=ids)
+            .values_list("journal_id", flat=True)
+        )
+        new = [
+            ContactMessage(journal_id=journal_id, **{f: r[f] for f in FIELDS})
+            for journal_id, r in zip(ids, batch)
+            if journal_id not in existing
+        ]
+        ContactMessage.objects.bulk_create(new)
+        # bulk_create não dispara o post_save que mantém os contadores.
+        inbox.adjust_counters(total=len(new), unread=len(new))
+        rollups.adjust(rollups.message_deltas(new))
+    return new
+
+
+def _insert_or_split(batch, rejected: list) -> list:
+    # Erro que não é do banco fora do ar: divide o lote até isolar os
+    # registros culpados (log n tentativas por registro ruim).
+    try:
+        return _insert(batch)
+    except Exception as exc:
+        if is_transient(exc):
+            raise
+        if len(batch) == 1:
+            logger.exception("Registro %s do journal recusado.", batch[0].get("journal_id"))
+            rejected.extend(batch)
+            return []
+    middle = len(batch) // 2
+    return _insert_or_split(batch[:middle], rejected) + _insert_or_split(batch[middle:], rejected)
+
+
+def ingest(records, batch_size: int, rejected: list | None = None) -> int:
+    """
+    Grava os registros em contact_message (pulando journal_ids já gravados)
+    e devolve quantos entraram. Registros recusados pelo conteúdo ficam de
+    fora e vão para `rejected`; erros passageiros de banco são propagados.
+    """
+    rejected = [] if rejected is None else rejected
+    inserted = 0
+    for start in range(0, len(records), batch_size):
+        new = _insert_or_split(records[start:start + batch_size], rejected)
+        notify(new)
+        inserted += len(new)
+    return inserted
+
+
+def ingest_segment(path, batch_size: int) -> int:
+    """
+    Grava um segmento; os registros recusados vão para a quarentena.
+    Depois disso o segmento pode ser apagado.
+    """
+    rejected = []
+    inserted = ingest(read_segment(path), batch_size, rejected)
+    if rejected:
+        quarantine_records(path, rejected)
+    return inserted
+
+
+def replay_orphans(directory, batch_size: int) -> int:
+    """
+    Grava e apaga os segmentos sem dono (de processos que morreram).
+    Segmentos de processos vivos, inclusive o atual, estão travados.
+    Erros de banco passageiros interrompem a rodada; registros recusados
+    vão para a quarentena e o resto do segmento é gravado.
+    """
+    inserted = 0
+    for name in sorted(os.listdir(directory)):
+        if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            continue  # outro processo acabou de gravar e apagar
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            if not os.path.exists(path):
+                continue
+            try:
+                inserted += ingest_segment(path, batch_size)
+            except Exception as exc:
+                if is_transient(exc):
+                    raise
+                quarantine(path)
+            else:
+                os.unlink(path)
+        finally:
+            os.close(fd)
+    return inserted
+
+
+class ContactJournal:
+    def __init__(self, directory, flush_interval: float, batch_size: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._segment = Segment(directory)
+        self._sealed = []
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="contact-journal", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def append(self, data: dict) -> str:
+        """
+        Grava a mensagem (já validada) no journal, com fsync, e devolve o
+        journal_id. Retornou: a mensagem sobrevive a um crash do processo.
+        """
+        record = {
+            "journal_id": uuid.uuid4().hex,
+            "accepted_at": timezone.now().isoformat(),
+            **{f: data[f] for f in FIELDS},
+        }
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            self._segment.write(line)
+            pending = self._segment.records
+        if pending >= self.batch_size:
+            self._wake.set()
+        return record["journal_id"]
+
+    def flush(self) -> int:
+        """
+        Grava o segmento ativo (trocando-o por um novo) e os segmentos sem
+        dono. Com o banco fora do ar, os segmentos ficam para a próxima
+        rodada; registros com conteúdo inválido vão para a quarentena.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._segment.records:
+                    self._sealed.append(self._segment)
+                    self._segment = Segment(self.directory)
+
+            inserted = 0
+            while self._sealed:
+                segment = self._sealed[0]
+                try:
+                    inserted += ingest_segment(segment.path, self.batch_size)
+                except Exception as exc:
+                    if is_transient(exc):
+                        raise
+                    segment.quarantine()
+                else:
+                    segment.remove()
+                self._sealed.pop(0)
+            inserted += replay_orphans(self.directory, self.batch_size)
+            return inserted
+
+    def close(self) -> None:
+        """
+        Grava o que restou ao encerrar o processo. Se falhar, os segmentos
+        continuam no diretório e o flock cai com o processo: outro processo
+        (ou flush_contact_journal) os reprocessa.
+        """
+        if self._closed or self.pid != os.getpid():
+            return
+        self._closed = True
+        try:
+            close_old_connections()
+            self.flush()
+        except Exception:
+            logger.exception("Falha ao gravar o journal de contato ao encerrar.")
+            return
+        with self._lock:
+            if not self._segment.records:
+                self._segment.remove()
+
+    def _loop(self) -> None:
+        while not self._closed:
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                logger.exception("Falha ao gravar o journal de contato.")
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal() -> ContactJournal:
+    """
+    Journal deste processo, criado (e com a thread iniciada) na primeira
+    chamada; depois de um fork, cada worker cria o seu.
+    """
+    global _journal
+    if _journal is None or _journal.pid != os.getpid():
+        with _journal_lock:
+            if _journal is None or _journal.pid != os.getpid():
+                _journal = ContactJournal(
+                    settings.CONTACT_JOURNAL_DIR,
+                    settings.CONTACT_JOURNAL_FLUSH_INTERVAL,
+                    settings.CONTACT_JOURNAL_BATCH_SIZE,
+                )
+                _journal.start()
+                atexit.register(_journal.close)
+    return _journal
+
+
+def shutdown() -> None:
+    """
+    Grava o journal deste processo antes de sair (worker_exit do gunicorn).
+    """
+    if _journal is not None:
+        _journal.close()
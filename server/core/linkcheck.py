@@ -0,0 +1,215 @@
+# core/linkcheck.py
+"""
+Verificação das URLs externas cadastradas (GitHub, LinkedIn, repositórios,
+demos, credenciais).
+
+As requisições são assíncronas (httpx) com concorrência limitada no total
+e por host; as conexões de cada host são reaproveitadas (keep-alive) por
+um pool próprio do host. Cada URL recebe um HEAD e, se o HEAD falhar ou responder
+com erro, um GET confirma o resultado (muitos servidores não tratam HEAD
+direito). O resultado fica em LinkHealth e vale por LINK_CHECK_TTL.
+"""
+import asyncio
+import ssl
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import certifi
+import httpx
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Certification, LinkHealth, Project, UserProfile
+
+# model -> campos com URLs externas
+LINK_FIELDS = {
+    UserProfile: ("github_url", "linkedin_url"),
+    Certification: ("credential_url",),
+    Project: ("repo_url", "demo_url"),
+}
+
+USER_AGENT = "PortfolioLinkChecker/1.0"
+ERROR_MAX_LENGTH = LinkHealth._meta.get_field("error").max_length
+GET_BODY_LIMIT = 64 * 1024
+URL_MAX_LENGTH = LinkHealth._meta.get_field("final_url").max_length
+
+
+@dataclass
+class LinkResult:
+    url: str
+    status: str
+    status_code: int | None = None
+    final_url: str = ""
+    error: str = ""
+    response_ms: int | None = None
+
+
+def collect_urls() -> set:
+    urls = set()
+    for model, fields in LINK_FIELDS.items():
+        for row in model.objects.values_list(*fields):
+            urls.update(url for url in row if url)
+    return urls
+
+
+class LinkChecker:
+    def __init__(self, concurrency: int, per_host: int, timeout: float):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+
+    async def check_all(self, urls) -> list:
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._hosts = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self._clients = {}
+        # Um contexto TLS para todos os clientes (carregar os certificados
+        # custa dezenas de ms).
+        self._ssl_context = ssl.create_default_context(cafile=certifi.where())
+        try:
+            return await asyncio.gather(*(self._check(url) for url in urls))
+        finally:
+            await asyncio.gather(*(client.aclose() for client in self._clients.values()))
+
+    def _client(self, host: str) -> httpx.AsyncClient:
+        # Um cliente (pool) por host: as conexões keep-alive de cada host são
+        # reaproveitadas, e cada pool fica pequeno (o pool do httpcore
+        # percorre todas as conexões e a fila a cada requisição).
+        client = self._clients.get(host)
+        if client is None:
+            client = self._clients[host] = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.per_host,
+                    max_keepalive_connections=self.per_host,
+                ),
+                timeout=self.timeout,
+                verify=self._ssl_context,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+            )
+        return client
+
+    async def _check(self, url: str) -> LinkResult:
+        host = urlsplit(url).netloc.lower()
+        # Primeiro a vaga do host, depois a global: URLs esperando por um
+        # host ocupado não seguram vagas que outros hosts poderiam usar.
+        async with self._hosts[host], self._slots:
+            client = self._client(host)
+            start = time.perf_counter()
+            try:
+                try:
+                    response = await client.head(url)
+                except httpx.HTTPError:
+                    response = None
+                if response is None or response.status_code >= 400:
+                    response = await self._get(client, url)
+            except (httpx.HTTPError, httpx.InvalidURL) as exc:
+                return LinkResult(
+                    url,
+                    LinkHealth.STATUS_ERROR,
+                    error=f"{type(exc).__name__}: {exc}"[:ERROR_MAX_LENGTH],
+                    response_ms=round((time.perf_counter() - start) * 1000),
+                )
+        return LinkResult(
+            url,
+            LinkHealth.STATUS_OK if response.status_code < 400 else LinkHealth.STATUS_BROKEN,
+            status_code=response.status_code,
+            final_url=str(response.url)[:URL_MAX_LENGTH],
+            response_ms=round((time.perf_counter() - start) * 1000),
+        )
+
+    @staticmethod
+    async def _get(client, url: str):
+        # Só o status interessa, mas um corpo pequeno é lido até o fim para
+        # a conexão voltar ao pool; corpos grandes são abandonados.
+        async with client.stream("GET", url) as response:
+            received = 0
+            async for chunk in response.aiter_raw():
+                received += len(chunk)
+                if received > GET_BODY_LIMIT:
+                    break
+            return response
+
+
+def check_urls(urls, concurrency=None, per_host=None, timeout=None) -> list:
+    checker = LinkChecker(
+        concurrency or settings.LINK_CHECK_CONCURRENCY,
+        per_host or settings.LINK_CHECK_PER_HOST,
+        timeout or settings.LINK_CHECK_TIMEOUT,
+    )
+    return asyncio.run(checker.check_all(sorted(urls)))
+
+
+def due_urls(urls: set, ttl: int) -> set:
+    fresh = LinkHealth.objects.filter(
+        checked_at__gte=timezone.now() - timedelta(seconds=ttl)
+    ).values_list("url", flat=True)
+    return urls - set(fresh)
+
+
+def save_results(results) -> None:
+    now = timezone.now()
+    failures = dict(LinkHealth.objects.values_list("url", "consecutive_failures"))
+    rows = [
+        LinkHealth(
+            url=r.url,
+            status=r.status,
+            status_code=r.status_code,
+            final_url=r.final_url,
+            error=r.error,
+            response_ms=r.response_ms,
+            consecutive_failures=(
+                0 if r.status == LinkHealth.STATUS_OK else failures.get(r.url, 0) + 1
+            ),
+            checked_at=now,
+        )
+        for r in results
+    ]
+    LinkHealth.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["url"],
+        update_fields=[
+            "status",
+            "status_code",
+            "final_url",
+            "error",
+            "response_ms",
+            "consecutive_failures",
+            "checked_at",
+        ],
+    )
+
+
+def prune_results(urls: set) -> int:
+    stale = [pk for pk, url in LinkHealth.objects.values_list("pk", "url") if url not in urls]
+    deleted = 0
+    for i in range(0, len(stale), 500):
+        deleted += LinkHealth.objects.filter(pk__in=stale[i:i + 500]).delete()[0]
+    return deleted
+
+
+def run_link_check(force: bool = False, concurrency=None, timeout=None) -> dict:
+    """
+    Verifica as URLs cadastradas cujo resultado expirou (todas, com force)
+    e remove resultados de URLs que não estão mais em uso.
+    """
+    start = time.perf_counter()
+    urls = collect_urls()
+    pending = urls if force else due_urls(urls, settings.LINK_CHECK_TTL)
+    results = check_urls(pending, concurrency=concurrency, timeout=timeout) if pending else []
+    save_results(results)
+
+    summary = {
+        "total": len(urls),
+        "checked": len(results),
+        "skipped": len(urls) - len(pending),
+        "pruned": prune_results(urls),
+    }
+    for status, _label in LinkHealth.STATUS_CHOICES:
+        summary[status] = sum(1 for r in results if r.status == status)
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    return summary
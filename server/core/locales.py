@@ -0,0 +1,155 @@
+# core/locales.py
+"""
+Idiomas do conteúdo do portfólio.
+
+As colunas de texto dos models guardam o idioma padrão (CONTENT_LANGUAGE);
+as traduções ficam no campo JSON `translations` de cada registro, no
+formato {"en": {"short_description": "..."}}. A escolha do idioma vem de
+?lang= ou do Accept-Language (ver ContentLocaleMiddleware) e vale para a
+requisição inteira através de um contextvar, que os serializers consultam.
+
+Cadeia de fallback: idioma pedido -> idioma base dele ("en-gb" -> "en")
+-> colunas originais.
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.deconstruct import deconstructible
+from django.utils.translation.trans_real import parse_accept_lang_header
+
+_chain = contextvars.ContextVar("core_content_locale_chain", default=())
+
+
+def default_locale() -> str:
+    return settings.CONTENT_LANGUAGE
+
+
+def supported_locales() -> tuple:
+    return tuple(settings.CONTENT_LOCALES)
+
+
+def fallback_chain(locale: str) -> tuple:
+    """
+    Idiomas a procurar em `translations`, em ordem. Para o idioma padrão (ou
+    o base dele, "pt" com padrão "pt-br") as colunas já servem.
+    """
+    default = default_locale()
+    stop = {default, default.split("-")[0]}
+    chain = []
+    for candidate in (locale, locale.split("-")[0]):
+        if candidate in stop:
+            break
+        if candidate not in chain:
+            chain.append(candidate)
+    return tuple(chain)
+
+
+def _match(tag: str):
+    tag = tag.lower()
+    supported = supported_locales()
+    if tag in supported:
+        return tag
+    primary = tag.split("-")[0]
+    if primary in supported:
+        return primary
+    for locale in supported:
+        if locale.split("-")[0] == primary:
+            return locale
+    return None
+
+
+@lru_cache(maxsize=512)
+def negotiate(lang_param, accept_language) -> str:
+    """
+    Idioma da resposta: ?lang= se suportado, senão o melhor do
+    Accept-Language, senão o padrão. Cacheado: os valores se repetem muito.
+    """
+    if lang_param:
+        locale = _match(lang_param)
+        if locale:
+            return locale
+    if accept_language:
+        for tag, _quality in parse_accept_lang_header(accept_language):
+            if tag == "*":
+                break
+            locale = _match(tag)
+            if locale:
+                return locale
+    return default_locale()
+
+
+def current_chain() -> tuple:
+    return _chain.get()
+
+
+@contextmanager
+def using_locale(locale: str):
+    token = _chain.set(fallback_chain(locale))
+    try:
+        yield
+    finally:
+        _chain.reset(token)
+
+
+def translated(obj, field: str):
+    """
+    Valor de `field` no idioma da requisição atual, seguindo a cadeia de
+    fallback até a coluna original.
+    """
+    chain = _chain.get()
+    if chain:
+        translations = obj.translations
+        if translations:
+            for locale in chain:
+                value = translations.get(locale, {}).get(field)
+                if value:
+                    return value
+    return getattr(obj, field)
+
+
+@deconstructible
+class TranslationsValidator:
+    """
+    Valida o campo `translations`: {"idioma": {"campo traduzível": "texto"}}.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+
+    def __call__(self, value):
+        if not isinstance(value, dict):
+            raise ValidationError("Use um objeto {\"idioma\": {\"campo\": \"texto\"}}.")
+        for locale, values in value.items():
+            if not isinstance(values, dict):
+                raise ValidationError(f"Traduções de '{locale}' devem ser um objeto.")
+            unknown = set(values) - set(self.fields)
+            if unknown:
+                raise ValidationError(
+                    f"Campos não traduzíveis em '{locale}': {', '.join(sorted(unknown))}. "
+                    f"Permitidos: {', '.join(self.fields)}."
+                )
+            if not all(isinstance(text, str) for text in values.values()):
+                raise ValidationError(f"Traduções de '{locale}' devem ser texto.")
+
+    def __eq__(self, other):
+        return isinstance(other, TranslationsValidator) and self.fields == other.fields
+
+
+def translations_field(*fields):
+    """
+    Campo `translations` de um model com os campos de texto traduzíveis.
+    """
+    return models.JSONField(
+        "Traduções",
+        default=dict,
+        blank=True,
+        validators=[TranslationsValidator(fields)],
+        help_text=(
+            f'Ex.: {{"en": {{"{fields[0]}": "..."}}}}. '
+            f"Campos traduzíveis: {', '.join(fields)}."
+        ),
+    )
@@ -0,0 +1,92 @@
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from core import retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Arquiva em NDJSON+gzip as mensagens de contato mais antigas que N dias "
+        "e depois as remove da tabela. No PostgreSQL também garante as "
+        "partições mensais dos próximos meses (rode diariamente, ou "
+        "continuamente com --every)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=180, help="Idade mínima (dias).")
+        parser.add_argument(
+            "--output-dir",
+            default=settings.CONTACT_ARCHIVE_DIR,
+            help="Diretório dos arquivos: caminho absoluto num volume persistente "
+                 "(padrão: CONTACT_ARCHIVE_DIR).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Só mostra o que seria arquivado."
+        )
+        parser.add_argument(
+            "--partitions-only",
+            action="store_true",
+            help="Só cria as partições que faltam; não arquiva nem apaga nada.",
+        )
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            metavar="SEGUNDOS",
+            help="Roda continuamente, repetindo a manutenção a cada N segundos.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 1:
+            raise CommandError("--days precisa ser pelo menos 1.")
+        archiving = not (options["partitions_only"] or options["dry_run"])
+        if archiving and not os.path.isabs(options["output_dir"] or ""):
+            raise CommandError(
+                "Defina CONTACT_ARCHIVE_DIR (ou --output-dir) com um caminho absoluto "
+                "num volume persistente: as mensagens arquivadas são apagadas da tabela."
+            )
+
+        while True:
+            self.archive(options)
+            if not options["every"]:
+                return
+            close_old_connections()
+            time.sleep(options["every"])
+
+    def archive(self, options):
+        created = retention.ensure_partitions()
+        for name in created:
+            self.stdout.write(f"Partição criada: {name}")
+        if options["partitions_only"]:
+            return
+
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        if options["dry_run"]:
+            counts = retention.counts_by_read_state(cutoff)
+            self.stdout.write(
+                f"{counts['total']} mensagem(ns) anteriores a {cutoff:%Y-%m-%d} "
+                f"({counts['unread']} não lidas) seriam arquivadas."
+            )
+            return
+
+        output_dir = Path(options["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / f"contact_message-{cutoff:%Y%m%d}-{timezone.now():%Y%m%d%H%M%S}.ndjson.gz"
+
+        count, max_id = retention.archive_messages(cutoff, path, options["batch_size"])
+        if not count:
+            self.stdout.write("Nenhuma mensagem para arquivar.")
+            return
+        self.stdout.write(f"{count} mensagem(ns) gravada(s) em {path}")
+
+        deleted = retention.delete_archived(cutoff, max_id, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} mensagem(ns) removida(s) da tabela."))
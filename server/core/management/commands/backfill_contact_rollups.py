@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.rollups import day_range, reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Preenche (ou corrige) a contagem diária de mensagens de contato "
+        "(contact_daily_count) a partir de contact_message, em janelas de "
+        "alguns dias para não varrer a tabela inteira numa consulta só."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date.fromisoformat, default=None, help="AAAA-MM-DD")
+        parser.add_argument("--end", type=date.fromisoformat, default=None, help="AAAA-MM-DD")
+        parser.add_argument("--window-days", type=int, default=31)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Só lista as divergências, sem gravar."
+        )
+
+    def handle(self, *args, **options):
+        first, last = day_range()
+        start = options["start"] or first
+        end = options["end"] or last
+        if start is None or end is None:
+            self.stdout.write("Nenhuma mensagem para contar.")
+            return
+        if start > end:
+            raise CommandError("--start deve ser anterior a --end.")
+        if options["window_days"] < 1:
+            raise CommandError("--window-days deve ser positivo.")
+
+        fix = not options["dry_run"]
+        window = timedelta(days=options["window_days"])
+        total = 0
+        while start <= end:
+            window_end = min(start + window - timedelta(days=1), end)
+            differences = reconcile(start, window_end, fix=fix)
+            for d in differences:
+                state = "lidas" if d["is_read"] else "não lidas"
+                self.stdout.write(f"  {d['day']} {state}: {d['stored']} -> {d['expected']}")
+            total += len(differences)
+            start = window_end + timedelta(days=1)
+
+        verb = "corrigida(s)" if fix else "divergente(s)"
+        self.stdout.write(self.style.SUCCESS(f"{total} contagem(ns) {verb}."))
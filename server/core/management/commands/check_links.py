@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.linkcheck import run_link_check
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifica as URLs externas cadastradas (perfil, certificações, "
+        "projetos) e grava o resultado em LinkHealth."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Verifica todas as URLs, mesmo as com resultado dentro do TTL.",
+        )
+        parser.add_argument("--concurrency", type=int, default=None)
+        parser.add_argument("--timeout", type=float, default=None)
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            metavar="SEGUNDOS",
+            help="Roda continuamente, repetindo a verificação a cada N segundos.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            summary = run_link_check(
+                force=options["force"],
+                concurrency=options["concurrency"],
+                timeout=options["timeout"],
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "{checked} verificada(s) em {seconds}s, {skipped} dentro do TTL: "
+                    "{ok} ok, {broken} quebrada(s), {error} com erro; "
+                    "{pruned} resultado(s) antigo(s) removido(s).".format(**summary)
+                )
+            )
+            if not options["every"]:
+                return
+            close_old_connections()
+            time.sleep(options["every"])
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.repometa import run_enrichment
+
+
+class Command(BaseCommand):
+    help = (
+        "Atualiza os metadados (estrelas, linguagens, último push) dos "
+        "repositórios GitHub dos projetos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Revalida todos os repositórios, mesmo os dentro do TTL.",
+        )
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            metavar="SEGUNDOS",
+            help="Roda continuamente, repetindo a atualização a cada N segundos.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            summary = run_enrichment(force=options["force"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "{repositories} repositório(s) consultado(s) em {seconds}s "
+                    "({projects} projeto(s) com GitHub): {updated} atualizado(s), "
+                    "{not_modified} sem mudança, {not_found} não encontrado(s), "
+                    "{failed} com falha; {removed} removido(s).".format(**summary)
+                )
+            )
+            if not options["every"]:
+                return
+            close_old_connections()
+            time.sleep(options["every"])
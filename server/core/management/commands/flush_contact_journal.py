@@ -0,0 +1,27 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.journal import replay_orphans
+
+
+class Command(BaseCommand):
+    help = (
+        "Grava em contact_message os segmentos do journal de contato sem "
+        "processo dono (ex.: depois de desligar CONTACT_INGEST_MODE=journal "
+        "ou de um crash). Segmentos de processos vivos são ignorados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        directory = settings.CONTACT_JOURNAL_DIR
+        if not os.path.isdir(directory):
+            self.stdout.write(f"Sem journal em {directory}.")
+            return
+        inserted = replay_orphans(
+            directory, options["batch_size"] or settings.CONTACT_JOURNAL_BATCH_SIZE
+        )
+        self.stdout.write(self.style.SUCCESS(f"{inserted} mensagem(ns) gravada(s)."))
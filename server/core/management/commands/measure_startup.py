@@ -0,0 +1,72 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Roda em um processo novo para medir a partida a frio de verdade.
+CHILD = r"""
+import io, json, os, sys, time
+from wsgiref.util import setup_testing_defaults
+
+start = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
+from server.wsgi import application
+imported = time.perf_counter()
+
+warm = sys.argv[1] == "warm"
+if warm:
+    from core.warmup import warm_up_master, warm_up_worker
+    warm_up_master()
+    warm_up_worker()
+warmed = time.perf_counter()
+
+def ttfb(path):
+    environ = {"PATH_INFO": path, "HTTP_HOST": "localhost", "wsgi.input": io.BytesIO()}
+    setup_testing_defaults(environ)
+    began = time.perf_counter()
+    body = iter(application(environ, lambda status, headers: None))
+    next(body, b"")
+    return (time.perf_counter() - began) * 1000
+
+first = ttfb(sys.argv[2])
+second = ttfb(sys.argv[2])
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "warmup_ms": (warmed - imported) * 1000,
+    "first_ttfb_ms": first,
+    "second_ttfb_ms": second,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a partida de um processo novo: tempo de importação do app WSGI e "
+        "time-to-first-byte da primeira requisição, com e sem o warm-up do gunicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/portfolio/")
+        parser.add_argument("--runs", type=int, default=3)
+
+    def handle(self, *args, **options):
+        for mode in ("cold", "warm"):
+            results = []
+            for _ in range(options["runs"]):
+                proc = subprocess.run(
+                    [sys.executable, "-c", CHILD, mode, options["path"]],
+                    cwd=settings.BASE_DIR,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+            avg = {key: sum(r[key] for r in results) / len(results) for key in results[0]}
+            self.stdout.write(
+                f"{mode:>4}: import {avg['import_ms']:7.1f} ms | "
+                f"warm-up {avg['warmup_ms']:7.1f} ms | "
+                f"1ª req {avg['first_ttfb_ms']:7.1f} ms | "
+                f"2ª req {avg['second_ttfb_ms']:7.1f} ms"
+            )
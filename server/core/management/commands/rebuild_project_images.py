@@ -0,0 +1,76 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from core.imaging import render_variants
+from core.models import ProjectImage
+from core.thumbnails import render_args, store_variants, variants_are_current, variants_root
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera as variantes responsivas das imagens de projeto usando todos os "
+        "núcleos. Imagens com variantes atualizadas são puladas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Apaga e gera novamente as variantes de todas as imagens.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Remove arquivos de variantes que não pertencem a nenhuma imagem.",
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+
+    def handle(self, *args, **options):
+        root = variants_root()
+        images = list(ProjectImage.objects.exclude(image="").exclude(content_hash=""))
+        pending = []
+        for image in images:
+            if options["force"]:
+                for variant in image.variants:
+                    path = os.path.join(root, variant["name"])
+                    if os.path.exists(path):
+                        os.remove(path)
+            elif variants_are_current(image):
+                continue
+            pending.append(image)
+
+        self.stdout.write(f"{len(pending)} de {len(images)} imagem(ns) para processar.")
+        failed = 0
+        if pending:
+            with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+                futures = {
+                    executor.submit(render_variants, *render_args(image)): image
+                    for image in pending
+                }
+                for future in as_completed(futures):
+                    image = futures[future]
+                    try:
+                        store_variants(image.pk, image.content_hash, future.result())
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"Imagem {image.pk}: {exc}")
+
+        if options["prune"]:
+            keep = {
+                v["name"]
+                for variants in ProjectImage.objects.values_list("variants", flat=True)
+                for v in variants
+            }
+            removed = 0
+            if os.path.isdir(root):
+                for name in os.listdir(root):
+                    if name not in keep:
+                        os.remove(os.path.join(root, name))
+                        removed += 1
+            self.stdout.write(f"{removed} arquivo(s) órfão(s) removido(s).")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(pending) - failed} imagem(ns) processada(s), {failed} falha(s).")
+        )
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Restaura mensagens de contato a partir de arquivos gerados por "
+        "archive_contact_messages. Ids já existentes são ignorados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="Arquivos .ndjson.gz")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for name in options["files"]:
+            path = Path(name)
+            if not path.is_file():
+                raise CommandError(f"Arquivo não encontrado: {path}")
+            inserted, skipped = retention.restore_messages(path, options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(f"{path}: {inserted} restaurada(s), {skipped} já existia(m).")
+            )
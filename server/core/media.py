@@ -0,0 +1,49 @@
+# core/media.py
+import os
+
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.responders import MissingFileError
+from whitenoise.string_utils import ensure_leading_trailing_slash
+
+
+class MediaWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise que também serve MEDIA_ROOT (imagens de projeto).
+
+    Os arquivos de mídia têm nome derivado do hash do conteúdo, então são
+    servidos com cache imutável. Como as variantes são geradas depois da
+    subida do processo, arquivos novos são descobertos sob demanda no
+    primeiro acesso e ficam no índice em memória a partir daí.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        self.media_prefix = ensure_leading_trailing_slash(settings.MEDIA_URL)
+        self.media_root = os.path.abspath(settings.MEDIA_ROOT) + os.sep
+        os.makedirs(self.media_root, exist_ok=True)
+        self.add_files(self.media_root, prefix=self.media_prefix)
+
+    def __call__(self, request):
+        path = request.path_info
+        if not self.autorefresh and path.startswith(self.media_prefix) and path not in self.files:
+            static_file = self._find_media(path)
+            if static_file is not None:
+                self.files[path] = static_file
+        return super().__call__(request)
+
+    def _find_media(self, url):
+        if not self.url_is_canonical(url):
+            return None
+        path = os.path.join(self.media_root, url[len(self.media_prefix):])
+        if os.path.commonprefix((self.media_root, path)) != self.media_root:
+            return None
+        try:
+            return self.find_file_at_path(path, url)
+        except MissingFileError:
+            return None
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.media_prefix):
+            return True
+        return super().immutable_file_test(path, url)
@@ -0,0 +1,86 @@
+# core/middleware.py
+import time
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from . import locales, routers
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "db_primary_until"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Marca a requisição para o core.routers.
+
+    - GET/HEAD fora do admin leem das réplicas.
+    - Depois de uma escrita, grava um cookie para que o mesmo cliente leia
+      do primário por REPLICA_STICKY_SECONDS (read-your-writes).
+    - Se uma réplica falhar durante uma leitura, refaz a requisição no
+      primário (seguro: só métodos sem efeito colateral usam réplicas).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _use_primary(self, request) -> bool:
+        if request.method not in SAFE_METHODS or request.path.startswith("/admin/"):
+            return True
+        try:
+            return float(request.COOKIES.get(STICKY_COOKIE, "0")) > time.time()
+        except ValueError:
+            return False
+
+    def __call__(self, request):
+        if not routers.replica_aliases():
+            return self.get_response(request)
+
+        use_primary = self._use_primary(request)
+        token = routers.begin_request(use_primary)
+        try:
+            response = self.get_response(request)
+            state = routers.current_state()
+            if state.replica_failed and not use_primary:
+                state.use_primary = True
+                state.replica_failed = False
+                response = self.get_response(request)
+        finally:
+            state = routers.end_request(token)
+
+        if state.wrote:
+            sticky = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(time.time() + sticky),
+                max_age=sticky,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ContentLocaleMiddleware:
+    """
+    Escolhe o idioma do conteúdo (core.locales) por ?lang= ou
+    Accept-Language e o aplica à requisição inteira: os serializers e os
+    payloads cacheados leem o idioma do contexto. O admin edita sempre as
+    colunas originais.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path.startswith("/admin/"):
+            return self.get_response(request)
+
+        locale = locales.negotiate(
+            request.GET.get("lang"), request.META.get("HTTP_ACCEPT_LANGUAGE")
+        )
+        request.content_locale = locale
+        with locales.using_locale(locale):
+            response = self.get_response(request)
+        response.setdefault("Content-Language", locale)
+        patch_vary_headers(response, ("Accept-Language",))
+        return response
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:11
+
+from django.db import migrations, models
+
+
+def seed_inbox_counter(apps, schema_editor):
+    ContactMessage = apps.get_model("core", "ContactMessage")
+    ContactInboxCounter = apps.get_model("core", "ContactInboxCounter")
+    ContactInboxCounter.objects.update_or_create(
+        pk=1,
+        defaults={
+            "total_count": ContactMessage.objects.count(),
+            "unread_count": ContactMessage.objects.filter(is_read=False).count(),
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactInboxCounter',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('total_count', models.BigIntegerField(default=0, verbose_name='Total de mensagens')),
+                ('unread_count', models.BigIntegerField(default=0, verbose_name='Mensagens não lidas')),
+            ],
+            options={
+                'verbose_name': 'Contador da caixa de entrada',
+                'verbose_name_plural': 'Contadores da caixa de entrada',
+                'db_table': 'contact_inbox_counter',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at', '-id'], name='contact_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-created_at', '-id'], name='contact_unread_idx'),
+        ),
+        migrations.RunPython(seed_inbox_counter, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+"""
+Particiona contact_message por mês (RANGE em created_at) no PostgreSQL.
+
+Nos outros bancos não faz nada: a tabela continua simples e a retenção
+usa DELETE em lotes (ver core.retention).
+
+O PostgreSQL exige que a chave primária de uma tabela particionada inclua
+a coluna de particionamento, então a PK física passa a ser (id, created_at);
+para o ORM nada muda. O id deixa de ser IDENTITY (não suportado em tabelas
+particionadas antes do PG 17) e passa a usar uma sequence própria.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import migrations
+
+TABLE = "contact_message"
+LEGACY = "contact_message_legacy"
+SEQUENCE = "contact_message_id_seq_part"
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_contact_message(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor != "postgresql":
+        return
+
+    with conn.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY}")
+        cursor.execute("ALTER INDEX contact_created_idx RENAME TO contact_created_idx_legacy")
+        cursor.execute("ALTER INDEX contact_unread_idx RENAME TO contact_unread_idx_legacy")
+
+        cursor.execute(f"CREATE SEQUENCE {SEQUENCE}")
+        cursor.execute(
+            f"SELECT setval('{SEQUENCE}', COALESCE((SELECT max(id) FROM {LEGACY}), 0) + 1, false)"
+        )
+        cursor.execute(
+            f"""
+            CREATE TABLE {TABLE} (
+                id integer NOT NULL DEFAULT nextval('{SEQUENCE}'),
+                name varchar(150) NOT NULL,
+                email varchar(254) NOT NULL,
+                subject varchar(150) NOT NULL,
+                message text NOT NULL,
+                created_at timestamp with time zone NOT NULL,
+                is_read boolean NOT NULL,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+            """
+        )
+        cursor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"CREATE INDEX contact_created_idx ON {TABLE} (created_at DESC, id DESC)"
+        )
+        cursor.execute(
+            f"CREATE INDEX contact_unread_idx ON {TABLE} (created_at DESC, id DESC) "
+            "WHERE NOT is_read"
+        )
+        cursor.execute(f"CREATE TABLE {TABLE}_pdefault PARTITION OF {TABLE} DEFAULT")
+
+        # Uma partição por mês, do mais antigo existente até 3 meses à frente.
+        cursor.execute(f"SELECT min(created_at) FROM {LEGACY}")
+        oldest = cursor.fetchone()[0]
+        now = datetime.now(dt_timezone.utc)
+        month = datetime((oldest or now).year, (oldest or now).month, 1, tzinfo=dt_timezone.utc)
+        last = _add_months(datetime(now.year, now.month, 1, tzinfo=dt_timezone.utc), 3)
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [month.isoformat(), _add_months(month, 1).isoformat()],
+            )
+            month = _add_months(month, 1)
+
+        cursor.execute(
+            f"INSERT INTO {TABLE} (id, name, email, subject, message, created_at, is_read) "
+            f"SELECT id, name, email, subject, message, created_at, is_read FROM {LEGACY}"
+        )
+        cursor.execute(f"DROP TABLE {LEGACY}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_contact_inbox'),
+    ]
+
+    operations = [
+        # Sem reversão automática: para o ORM a tabela particionada é
+        # equivalente à simples.
+        migrations.RunPython(partition_contact_message, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:20
+
+import core.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_partition_contact_message'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectImage',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('image', models.ImageField(height_field='height', upload_to=core.models.project_image_upload_to, verbose_name='Imagem', width_field='width')),
+                ('alt_text', models.CharField(blank=True, max_length=200, verbose_name='Texto alternativo')),
+                ('width', models.PositiveIntegerField(editable=False, null=True, verbose_name='Largura')),
+                ('height', models.PositiveIntegerField(editable=False, null=True, verbose_name='Altura')),
+                ('content_hash', models.CharField(editable=False, max_length=64, verbose_name='Hash do conteúdo')),
+                ('variants', models.JSONField(blank=True, default=list, editable=False, verbose_name='Variantes')),
+                ('order_index', models.IntegerField(default=0, verbose_name='Ordem')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criada em')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='core.project', verbose_name='Projeto')),
+            ],
+            options={
+                'verbose_name': 'Imagem de projeto',
+                'verbose_name_plural': 'Imagens de projeto',
+                'db_table': 'project_image',
+                'ordering': ['order_index', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_project_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkHealth',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('url', models.URLField(max_length=500, unique=True, verbose_name='URL')),
+                ('status', models.CharField(choices=[('ok', 'OK'), ('broken', 'Quebrado'), ('error', 'Erro de conexão')], max_length=10, verbose_name='Situação')),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Código HTTP')),
+                ('final_url', models.URLField(blank=True, max_length=500, verbose_name='URL final')),
+                ('error', models.CharField(blank=True, max_length=255, verbose_name='Erro')),
+                ('response_ms', models.PositiveIntegerField(blank=True, null=True, verbose_name='Tempo de resposta (ms)')),
+                ('consecutive_failures', models.PositiveIntegerField(default=0, verbose_name='Falhas seguidas')),
+                ('checked_at', models.DateTimeField(verbose_name='Verificado em')),
+            ],
+            options={
+                'verbose_name': 'Saúde de link',
+                'verbose_name_plural': 'Saúde dos links',
+                'db_table': 'link_health',
+                'ordering': ['url'],
+            },
+        ),
+    ]
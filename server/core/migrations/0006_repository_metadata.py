@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_link_health'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RepositoryMetadata',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='repo_metadata', serialize=False, to='core.project', verbose_name='Projeto')),
+                ('full_name', models.CharField(max_length=200, verbose_name='Repositório (dono/nome)')),
+                ('found', models.BooleanField(default=True, verbose_name='Encontrado?')),
+                ('description', models.TextField(blank=True, verbose_name='Descrição')),
+                ('html_url', models.URLField(blank=True, max_length=255, verbose_name='URL')),
+                ('stars', models.PositiveIntegerField(default=0, verbose_name='Estrelas')),
+                ('forks', models.PositiveIntegerField(default=0, verbose_name='Forks')),
+                ('language', models.CharField(blank=True, max_length=100, verbose_name='Linguagem principal')),
+                ('languages', models.JSONField(blank=True, default=dict, verbose_name='Linguagens (bytes)')),
+                ('pushed_at', models.DateTimeField(blank=True, null=True, verbose_name='Último push')),
+                ('etag', models.CharField(blank=True, max_length=200)),
+                ('languages_etag', models.CharField(blank=True, max_length=200)),
+                ('fetched_at', models.DateTimeField(verbose_name='Consultado em')),
+            ],
+            options={
+                'verbose_name': 'Metadados de repositório',
+                'verbose_name_plural': 'Metadados de repositórios',
+                'db_table': 'repository_metadata',
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:33
+
+import core.locales
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_repository_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certification',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"name": "..."}}. Campos traduzíveis: name.', validators=[core.locales.TranslationsValidator(('name',))], verbose_name='Traduções'),
+        ),
+        migrations.AddField(
+            model_name='education',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"degree": "..."}}. Campos traduzíveis: degree, field_of_study, description.', validators=[core.locales.TranslationsValidator(('degree', 'field_of_study', 'description'))], verbose_name='Traduções'),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"role": "..."}}. Campos traduzíveis: role, location, description.', validators=[core.locales.TranslationsValidator(('role', 'location', 'description'))], verbose_name='Traduções'),
+        ),
+        migrations.AddField(
+            model_name='language',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"name": "..."}}. Campos traduzíveis: name, level.', validators=[core.locales.TranslationsValidator(('name', 'level'))], verbose_name='Traduções'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"title": "..."}}. Campos traduzíveis: title, short_description, long_description.', validators=[core.locales.TranslationsValidator(('title', 'short_description', 'long_description'))], verbose_name='Traduções'),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"alt_text": "..."}}. Campos traduzíveis: alt_text.', validators=[core.locales.TranslationsValidator(('alt_text',))], verbose_name='Traduções'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"title": "..."}}. Campos traduzíveis: title, short_description, detailed_description.', validators=[core.locales.TranslationsValidator(('title', 'short_description', 'detailed_description'))], verbose_name='Traduções'),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"level": "..."}}. Campos traduzíveis: level.', validators=[core.locales.TranslationsValidator(('level',))], verbose_name='Traduções'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='translations',
+            field=models.JSONField(blank=True, default=dict, help_text='Ex.: {"en": {"job_title": "..."}}. Campos traduzíveis: job_title, short_bio, location.', validators=[core.locales.TranslationsValidator(('job_title', 'short_bio', 'location'))], verbose_name='Traduções'),
+        ),
+    ]
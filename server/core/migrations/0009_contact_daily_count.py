@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:06
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def seed_daily_counts(apps, schema_editor):
+    ContactMessage = apps.get_model("core", "ContactMessage")
+    ContactDailyCount = apps.get_model("core", "ContactDailyCount")
+    rows = (
+        ContactMessage.objects.order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "is_read")
+        .annotate(n=Count("id"))
+    )
+    ContactDailyCount.objects.bulk_create(
+        [ContactDailyCount(day=r["day"], is_read=r["is_read"], count=r["n"]) for r in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_contact_journal_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Dia')),
+                ('is_read', models.BooleanField(verbose_name='Lidas?')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Mensagens')),
+            ],
+            options={
+                'verbose_name': 'Contagem diária de mensagens',
+                'verbose_name_plural': 'Contagens diárias de mensagens',
+                'db_table': 'contact_daily_count',
+                'ordering': ['-day', 'is_read'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'is_read'), name='contact_daily_count_uniq')],
+            },
+        ),
+        migrations.RunPython(seed_daily_counts, migrations.RunPython.noop),
+    ]
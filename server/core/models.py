@@ -1,8 +1,13 @@
+import hashlib
+import os
+
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.utils.text import slugify
 from django.utils import timezone
 
+from .locales import translations_field
+
 # -----------------------------
 # Constantes de seções (módulo)
 # -----------------------------
@@ -49,6 +54,7 @@ class UserProfile(models.Model):
         unique=True,
         help_text="Identificador único usado na URL pública do portfólio.",
     )
+    translations = translations_field("job_title", "short_bio", "location")
     created_at = models.DateTimeField("Criado em", auto_now_add=True)
     updated_at = models.DateTimeField("Atualizado em", auto_now=True)
 
@@ -102,6 +108,7 @@ class Skill(models.Model):
         help_text="Chave usada no front para resolver o ícone (ex.: 'python').",
     )
     order_index = models.IntegerField("Ordem", default=0)
+    translations = translations_field("level")
 
     class Meta:
         db_table = "skill"
@@ -128,6 +135,7 @@ class Experience(models.Model):
     is_current = models.BooleanField("Emprego atual?", default=False)
     description = models.TextField("Descrição", blank=True, null=True)
     order_index = models.IntegerField("Ordem", default=0)
+    translations = translations_field("role", "location", "description")
 
     class Meta:
         db_table = "experience"
@@ -168,6 +176,7 @@ class Certification(models.Model):
         "URL da credencial", max_length=255, blank=True, null=True
     )
     order_index = models.IntegerField("Ordem", default=0)
+    translations = translations_field("name")
 
     class Meta:
         db_table = "certification"
@@ -204,6 +213,7 @@ class Project(models.Model):
     repo_url = models.URLField("Repositório", max_length=255, blank=True, null=True)
     demo_url = models.URLField("Demo / Deploy", max_length=255, blank=True, null=True)
     highlight = models.BooleanField("Destaque na home?", default=False)
+    translations = translations_field("title", "short_description", "long_description")
     created_at = models.DateTimeField("Criado em", auto_now_add=True)
     updated_at = models.DateTimeField("Atualizado em", auto_now=True)
 
@@ -221,6 +231,99 @@ class Project(models.Model):
             self.slug = slugify(self.title)
 
 
+class RepositoryMetadata(models.Model):
+    """
+    Metadados do repositório GitHub de um projeto (core.repometa), guardados
+    à parte para o payload não depender da API do GitHub. Os ETags permitem
+    revalidar com requisições condicionais.
+    Tabela 'repository_metadata'.
+    """
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="repo_metadata",
+        verbose_name="Projeto",
+    )
+    full_name = models.CharField("Repositório (dono/nome)", max_length=200)
+    found = models.BooleanField("Encontrado?", default=True)
+    description = models.TextField("Descrição", blank=True)
+    html_url = models.URLField("URL", max_length=255, blank=True)
+    stars = models.PositiveIntegerField("Estrelas", default=0)
+    forks = models.PositiveIntegerField("Forks", default=0)
+    language = models.CharField("Linguagem principal", max_length=100, blank=True)
+    languages = models.JSONField("Linguagens (bytes)", default=dict, blank=True)
+    pushed_at = models.DateTimeField("Último push", null=True, blank=True)
+    etag = models.CharField(max_length=200, blank=True)
+    languages_etag = models.CharField(max_length=200, blank=True)
+    fetched_at = models.DateTimeField("Consultado em")
+
+    class Meta:
+        db_table = "repository_metadata"
+        verbose_name = "Metadados de repositório"
+        verbose_name_plural = "Metadados de repositórios"
+
+    def __str__(self) -> str:
+        return self.full_name
+
+
+def project_image_upload_to(instance, filename: str) -> str:
+    # ProjectImage.save() já renomeou o arquivo para o hash do conteúdo.
+    return f"projects/originals/{filename}"
+
+
+class ProjectImage(models.Model):
+    """
+    Imagens de um projeto. A original fica em disco com nome igual ao hash
+    do conteúdo; as variantes responsivas (core.thumbnails) são geradas fora
+    do request e listadas em `variants`.
+    Tabela 'project_image'.
+    """
+    id = models.AutoField(primary_key=True)
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name="images",
+        verbose_name="Projeto",
+    )
+    image = models.ImageField(
+        "Imagem",
+        upload_to=project_image_upload_to,
+        width_field="width",
+        height_field="height",
+    )
+    alt_text = models.CharField("Texto alternativo", max_length=200, blank=True)
+    width = models.PositiveIntegerField("Largura", null=True, editable=False)
+    height = models.PositiveIntegerField("Altura", null=True, editable=False)
+    content_hash = models.CharField("Hash do conteúdo", max_length=64, editable=False)
+    variants = models.JSONField("Variantes", default=list, blank=True, editable=False)
+    order_index = models.IntegerField("Ordem", default=0)
+    translations = translations_field("alt_text")
+    created_at = models.DateTimeField("Criada em", auto_now_add=True)
+
+    class Meta:
+        db_table = "project_image"
+        verbose_name = "Imagem de projeto"
+        verbose_name_plural = "Imagens de projeto"
+        ordering = ["order_index", "id"]
+
+    def __str__(self) -> str:
+        return self.alt_text or f"Imagem de {self.project}"
+
+    def save(self, *args, **kwargs):
+        if self.image and not self.image._committed:
+            # Hash calculado em blocos sobre o upload (já em disco, ver
+            # FILE_UPLOAD_HANDLERS), sem carregar o arquivo na memória.
+            digest = hashlib.sha256()
+            for chunk in self.image.chunks():
+                digest.update(chunk)
+            self.content_hash = digest.hexdigest()
+            ext = os.path.splitext(self.image.name)[1].lower() or ".img"
+            self.image.name = f"{self.content_hash}{ext}"
+            self.variants = []
+        super().save(*args, **kwargs)
+
+
 class ContactMessage(models.Model):
     """
     Mensagens enviadas pelo formulário de contato.
@@ -233,17 +336,71 @@ class ContactMessage(models.Model):
     message = models.TextField("Mensagem")
     created_at = models.DateTimeField("Recebida em", auto_now_add=True)
     is_read = models.BooleanField("Lida?", default=False)
+    # Registro de origem no journal (core.journal); evita duplicar no replay.
+    journal_id = models.UUIDField(null=True, blank=True, editable=False, db_index=True)
 
     class Meta:
         db_table = "contact_message"
         verbose_name = "Mensagem de contato"
         verbose_name_plural = "Mensagens de contato"
         ordering = ["-created_at"]
+        indexes = [
+            # Paginação por cursor (keyset) na caixa de entrada do admin.
+            models.Index(fields=["-created_at", "-id"], name="contact_created_idx"),
+            # Só as não lidas: fica pequeno mesmo com milhões de mensagens.
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="contact_unread_idx",
+                condition=models.Q(is_read=False),
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.subject} ({self.email})"
 
 
+class ContactInboxCounter(models.Model):
+    """
+    Contadores da caixa de entrada, mantidos incrementalmente (core.inbox)
+    para evitar COUNT(*) em contact_message. Linha única (id=1).
+    """
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1)
+    total_count = models.BigIntegerField("Total de mensagens", default=0)
+    unread_count = models.BigIntegerField("Mensagens não lidas", default=0)
+
+    class Meta:
+        db_table = "contact_inbox_counter"
+        verbose_name = "Contador da caixa de entrada"
+        verbose_name_plural = "Contadores da caixa de entrada"
+
+    def __str__(self) -> str:
+        return f"{self.unread_count} não lidas / {self.total_count}"
+
+
+class ContactDailyCount(models.Model):
+    """
+    Mensagens de contato por dia e estado de leitura, mantidas
+    incrementalmente (core.rollups) para as séries sem GROUP BY em
+    contact_message.
+    """
+    day = models.DateField("Dia")
+    is_read = models.BooleanField("Lidas?")
+    count = models.BigIntegerField("Mensagens", default=0)
+
+    class Meta:
+        db_table = "contact_daily_count"
+        verbose_name = "Contagem diária de mensagens"
+        verbose_name_plural = "Contagens diárias de mensagens"
+        ordering = ["-day", "is_read"]
+        constraints = [
+            models.UniqueConstraint(fields=["day", "is_read"], name="contact_daily_count_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        state = "lidas" if self.is_read else "não lidas"
+        return f"{self.day}: {self.count} {state}"
+
+
 class Education(models.Model):
     """
     Formações acadêmicas.
@@ -260,6 +417,7 @@ class Education(models.Model):
     is_current = models.BooleanField("Cursando atualmente?", default=False)
     description = models.TextField("Descrição", blank=True, null=True)
     order_index = models.IntegerField("Ordem", default=0)
+    translations = translations_field("degree", "field_of_study", "description")
 
     class Meta:
         db_table = "education"
@@ -297,6 +455,7 @@ class Service(models.Model):
     )
     highlight = models.BooleanField("Destaque?", default=False)
     order_index = models.IntegerField("Ordem", default=0)
+    translations = translations_field("title", "short_description", "detailed_description")
 
     class Meta:
         db_table = "service"
@@ -317,6 +476,7 @@ class Language(models.Model):
     name = models.CharField("Idioma", max_length=50)
     level = models.CharField("Nível", max_length=50)
     order_index = models.IntegerField("Ordem", default=0)
+    translations = translations_field("name", "level")
 
     class Meta:
         db_table = "language"
@@ -352,3 +512,39 @@ class SectionConfig(models.Model):
 
     def __str__(self) -> str:
         return f"{self.section_key} ({'ativa' if self.is_enabled else 'inativa'})"
+
+
+class LinkHealth(models.Model):
+    """
+    Último resultado da verificação de cada URL externa cadastrada
+    (core.linkcheck). Uma linha por URL, mesmo que ela apareça em vários
+    registros.
+    Tabela 'link_health'.
+    """
+    STATUS_OK = "ok"
+    STATUS_BROKEN = "broken"
+    STATUS_ERROR = "error"
+    STATUS_CHOICES = [
+        (STATUS_OK, "OK"),
+        (STATUS_BROKEN, "Quebrado"),
+        (STATUS_ERROR, "Erro de conexão"),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    url = models.URLField("URL", max_length=500, unique=True)
+    status = models.CharField("Situação", max_length=10, choices=STATUS_CHOICES)
+    status_code = models.PositiveSmallIntegerField("Código HTTP", null=True, blank=True)
+    final_url = models.URLField("URL final", max_length=500, blank=True)
+    error = models.CharField("Erro", max_length=255, blank=True)
+    response_ms = models.PositiveIntegerField("Tempo de resposta (ms)", null=True, blank=True)
+    consecutive_failures = models.PositiveIntegerField("Falhas seguidas", default=0)
+    checked_at = models.DateTimeField("Verificado em")
+
+    class Meta:
+        db_table = "link_health"
+        verbose_name = "Saúde de link"
+        verbose_name_plural = "Saúde dos links"
+        ordering = ["url"]
+
+    def __str__(self) -> str:
+        return f"{self.url} ({self.status})"
@@ -0,0 +1,115 @@
+# core/notifications.py
+"""
+E-mail de aviso ao dono do portfólio quando chega uma mensagem de contato.
+"""
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.utils.html import escape
+
+
+def contact_email(name: str, email: str, subject: str, message: str) -> EmailMultiAlternatives:
+    """
+    E-mail (texto + HTML) avisando de uma nova mensagem de contato.
+    """
+    owner_email = settings.DEFAULT_FROM_EMAIL
+    logo_url = getattr(settings, "PORTFOLIO_LOGO_URL", None)
+
+    email_subject = f"[Portfólio] Nova mensagem de {name}: {subject}"
+
+    # Texto puro (fallback)
+    text_content = (
+        "Você recebeu uma nova mensagem pelo portfólio.\n\n"
+        f"Nome: {name}\n"
+        f"E-mail: {email}\n"
+        f"Assunto: {subject}\n\n"
+        "Mensagem:\n"
+        f"{message}\n"
+    )
+
+    # HTML estiloso: os campos vêm do formulário público, então são escapados.
+    safe_name, safe_email, safe_subject, safe_message = map(
+        escape, (name, email, subject, message)
+    )
+    html_content = f"""
+<!DOCTYPE html>
+<html lang="pt-BR">
+  <head>
+    <meta charset="UTF-8" />
+    <title>Nova mensagem de contato</title>
+  </head>
+  <body style="margin:0;padding:0;background-color:#0b1120;font-family:system-ui,-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="padding:24px 0;">
+      <tr>
+        <td align="center">
+          <table width="600" cellpadding="0" cellspacing="0" style="background-color:#020617;border-radius:16px;border:1px solid #1f2937;overflow:hidden;">
+            <tr>
+              <td style="padding:16px 24px;border-bottom:1px solid #1f2937;background:linear-gradient(135deg,#0ea5e9,#6366f1);">
+                <table width="100%">
+                  <tr>
+                    <td align="left" style="color:#f9fafb;font-size:16px;font-weight:600;">
+                      Portfólio · Erik Ingleson
+                    </td>
+                    <td align="right">
+                      {"<img src='" + logo_url + "' alt='Logo' style='max-height:32px;display:block;' />" if logo_url else ""}
+                    </td>
+                  </tr>
+                </table>
+              </td>
+            </tr>
+
+            <tr>
+              <td style="padding:24px;">
+                <h1 style="margin:0 0 12px;font-size:20px;color:#e5e7eb;">
+                  Nova mensagem de contato
+                </h1>
+                <p style="margin:0 0 16px;font-size:14px;color:#9ca3af;line-height:1.6;">
+                  Você recebeu uma nova mensagem pelo formulário de contato do seu portfólio.
+                </p>
+
+                <table cellpadding="0" cellspacing="0" style="width:100%;margin-bottom:16px;font-size:14px;color:#e5e7eb;">
+                  <tr>
+                    <td style="padding:4px 0;width:120px;color:#9ca3af;">Nome:</td>
+                    <td style="padding:4px 0;">{safe_name}</td>
+                  </tr>
+                  <tr>
+                    <td style="padding:4px 0;width:120px;color:#9ca3af;">E-mail:</td>
+                    <td style="padding:4px 0;">
+                      <a href="mailto:{safe_email}" style="color:#38bdf8;text-decoration:none;">{safe_email}</a>
+                    </td>
+                  </tr>
+                  <tr>
+                    <td style="padding:4px 0;width:120px;color:#9ca3af;">Assunto:</td>
+                    <td style="padding:4px 0;">{safe_subject}</td>
+                  </tr>
+                </table>
+
+                <div style="margin-top:16px;">
+                  <p style="margin:0 0 8px;font-size:14px;color:#9ca3af;">Mensagem:</p>
+                  <div style="background-color:#020617;border-radius:8px;border:1px solid #1f2937;padding:16px;color:#e5e7eb;font-size:14px;line-height:1.6;white-space:pre-wrap;">
+                    {safe_message}
+                  </div>
+                </div>
+              </td>
+            </tr>
+
+            <tr>
+              <td style="padding:16px 24px;border-top:1px solid #1f2937;text-align:center;font-size:12px;color:#6b7280;">
+                Enviado automaticamente pelo portfólio de Erik Ingleson.
+              </td>
+            </tr>
+          </table>
+        </td>
+      </tr>
+    </table>
+  </body>
+</html>
+"""
+
+    msg = EmailMultiAlternatives(
+        subject=email_subject,
+        body=text_content,
+        from_email=owner_email,
+        to=[owner_email],
+    )
+    msg.attach_alternative(html_content, "text/html")
+    return msg
@@ -0,0 +1,168 @@
+# core/ordering.py
+"""
+Reordenação dos models com order_index (skills, experiências, ...).
+
+As chaves de ordem ficam espaçadas de ORDER_GAP: mover um item para entre
+dois vizinhos grava só a média das chaves deles, uma linha. Quando não há
+espaço (vizinhos com chaves consecutivas ou iguais, como nos registros
+antigos com order_index 0), a seção inteira é renumerada com o espaçamento
+num único bulk_update, só com as linhas cuja chave mudou.
+
+Tudo passa por QuerySet.update/bulk_update, sem sinais: a versão do bloco
+da seção (core.cache) é incrementada explicitamente, e só a dele.
+"""
+from django.db import transaction
+
+from .cache import bump_versions
+from .models import Certification, Education, Experience, Language, SectionConfig, Service, Skill
+
+ORDER_GAP = 1024
+
+# Bloco do payload (core.cache) -> model ordenado por order_index.
+ORDERED_MODELS = {
+    "sections": SectionConfig,
+    "skills": Skill,
+    "experiences": Experience,
+    "certifications": Certification,
+    "education": Education,
+    "services": Service,
+    "languages": Language,
+}
+
+FIRST = "first"
+LAST = "last"
+
+
+class ReorderError(ValueError):
+    pass
+
+
+def section_for(model) -> str:
+    return next(section for section, m in ORDERED_MODELS.items() if m is model)
+
+
+def current_order(model, lock: bool = False) -> list:
+    """
+    [[pk, order_index]] na ordem exibida (Meta.ordering, desempate por pk).
+
+    Com lock (dentro de transaction.atomic), as linhas da seção ficam
+    travadas até o commit: duas reordenações simultâneas da mesma seção
+    rodam uma depois da outra, e a segunda parte da ordem já gravada pela
+    primeira em vez de sobrescrevê-la.
+    """
+    queryset = model.objects.order_by(*model._meta.ordering, "pk")
+    if lock:
+        queryset = queryset.select_for_update()
+    return [list(row) for row in queryset.values_list("pk", "order_index")]
+
+
+def _renumber(rows) -> None:
+    for index, row in enumerate(rows):
+        row[1] = (index + 1) * ORDER_GAP
+
+
+def _place(rows, pk, position) -> bool:
+    """
+    Move `pk` para `position` (FIRST, LAST, ("after", pk) ou ("before", pk))
+    dentro de `rows`, mudando só a chave dele quando cabe entre os
+    vizinhos. Devolve True se precisou renumerar a lista inteira.
+    """
+    index = next((i for i, row in enumerate(rows) if row[0] == pk), None)
+    if index is None:
+        raise ReorderError(f"Item {pk} não existe nesta seção.")
+    row = rows.pop(index)
+
+    if position == FIRST:
+        target = 0
+    elif position == LAST:
+        target = len(rows)
+    else:
+        side, anchor = position
+        if anchor == pk:
+            raise ReorderError(f"Item {pk} não pode ser movido em relação a ele mesmo.")
+        anchor_index = next((i for i, r in enumerate(rows) if r[0] == anchor), None)
+        if anchor_index is None:
+            raise ReorderError(f"Item {anchor} não existe nesta seção.")
+        target = anchor_index + 1 if side == "after" else anchor_index
+    rows.insert(target, row)
+
+    previous = rows[target - 1][1] if target > 0 else None
+    following = rows[target + 1][1] if target + 1 < len(rows) else None
+    if previous is None and following is None:
+        return False
+    if previous is None:
+        row[1] = following - ORDER_GAP
+    elif following is None:
+        row[1] = previous + ORDER_GAP
+    elif following - previous >= 2:
+        row[1] = (previous + following) // 2
+    else:
+        _renumber(rows)
+        return True
+    return False
+
+
+def _save(model, rows, original: dict) -> int:
+    changed = [
+        model(pk=pk, order_index=key) for pk, key in rows if original[pk] != key
+    ]
+    if not changed:
+        return 0
+    with transaction.atomic():
+        if len(changed) == 1:
+            model.objects.filter(pk=changed[0].pk).update(order_index=changed[0].order_index)
+        else:
+            model.objects.bulk_update(changed, ["order_index"], batch_size=500)
+        section = section_for(model)
+        transaction.on_commit(lambda: bump_versions(section))
+    return len(changed)
+
+
+def _result(model, rows, changed: int, renumbered: bool) -> dict:
+    return {
+        "section": section_for(model),
+        "changed": changed,
+        "renumbered": renumbered,
+        "order": [{"id": pk, "order_index": key} for pk, key in rows],
+    }
+
+
+def move(model, moves) -> dict:
+    """
+    Aplica os movimentos [(pk, posição)] em sequência e grava só as chaves
+    que mudaram (normalmente uma por movimento).
+    """
+    with transaction.atomic():
+        rows = current_order(model, lock=True)
+        original = dict(map(tuple, rows))
+        renumbered = False
+        for pk, position in moves:
+            renumbered = _place(rows, pk, position) or renumbered
+        changed = _save(model, rows, original)
+    return _result(model, rows, changed, renumbered)
+
+
+def set_order(model, pks) -> dict:
+    """
+    Ordem completa da seção (todos os ids), renumerada com o espaçamento.
+    """
+    with transaction.atomic():
+        rows = current_order(model, lock=True)
+        original = dict(map(tuple, rows))
+        if sorted(pks) != sorted(original):
+            raise ReorderError("Informe todos os ids da seção, cada um uma vez.")
+        rows = [[pk, original[pk]] for pk in pks]
+        _renumber(rows)
+        changed = _save(model, rows, original)
+    return _result(model, rows, changed, True)
+
+
+def renumber(model) -> int:
+    """
+    Renumera a seção na ordem atual, com o espaçamento (um bulk_update).
+    """
+    with transaction.atomic():
+        rows = current_order(model, lock=True)
+        original = dict(map(tuple, rows))
+        _renumber(rows)
+        return _save(model, rows, original)
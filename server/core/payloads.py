@@ -0,0 +1,389 @@
+# core/payloads.py
+"""
+Payloads serializados (bytes JSON) prontos para resposta.
+
+O payload de /api/portfolio/ é a junção de blocos (profile, skills,
+projects...), cada um montado uma vez por idioma e pela versão do próprio
+bloco (core.cache) e guardado no cache do Django e em memória no processo.
+Uma alteração em um model muda só a versão do bloco dele; alterações só nas
+traduções de um idioma mudam só a versão daquele idioma. O payload completo,
+ou só os blocos pedidos em ?sections=, sai dos bytes prontos dos blocos e é
+cacheado já comprimido (gzip e brotli).
+O de /api/stats/ segue a mesma ideia, com as versões só dos blocos usados,
+e o de /api/projects/<slug>/ é cacheado por slug; slugs inexistentes são
+recusados pelo conjunto de slugs válidos, sem ir ao banco.
+Com PAYLOAD_STORE_ENABLED, os payloads prontos ficam no arquivo mapeado
+comum aos workers (core.payloadstore) em vez da memória de cada processo.
+
+Numa versão nova, só um chamador monta cada valor (core.singleflight); os
+outros esperam ou, nos payloads prontos, recebem o da versão anterior,
+marcado como stale para não ser guardado pela borda.
+"""
+import gzip
+import hashlib
+import json
+import time
+from dataclasses import dataclass, replace
+
+import brotli
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .cache import get_versions, locale_scope
+from .locales import fallback_chain, using_locale
+from .payloadstore import get_store
+from .routers import reading_from_primary
+from .singleflight import single_flight
+from .models import (
+    UserProfile,
+    Skill,
+    Experience,
+    Certification,
+    Project,
+    Education,
+    Service,
+    Language,
+    SectionConfig,
+    SECTION_SKILLS,
+    SECTION_EXPERIENCE,
+    SECTION_CERTIFICATIONS,
+    SECTION_EDUCATION,
+    SECTION_SERVICES,
+    SECTION_LANGUAGES,
+    SECTION_PROJECTS,
+)
+from .stats import STATS_SCOPES, build_stats
+from .serializers import (
+    user_profile_to_dict,
+    skill_to_dict,
+    experience_to_dict,
+    certification_to_dict,
+    project_to_dict,
+    education_to_dict,
+    service_to_dict,
+    language_to_dict,
+    section_config_to_dict,
+)
+
+PAYLOAD_KEY_PREFIX = "core:payload:"
+PAYLOAD_TIMEOUT = 60 * 60 * 24
+
+# Última versão montada neste processo: {nome: (versão, valor)}.
+_local = {}
+
+# Slugs de projeto válidos neste processo: (versão, expira_em, frozenset).
+_project_slugs = None
+
+
+@dataclass(frozen=True)
+class Payload:
+    # bytes, ou fatias do arquivo compartilhado (core.payloadstore).
+    body: bytes | memoryview
+    gzip: bytes | memoryview | None
+    br: bytes | memoryview | None
+    # Versão anterior, entregue enquanto outro chamador monta a atual.
+    stale: bool = False
+
+    def encoded(self, encoding: str | None) -> bytes | memoryview:
+        return getattr(self, encoding) if encoding else self.body
+
+
+def to_json_bytes(data) -> bytes:
+    return json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+def compress(body: bytes) -> Payload:
+    # Feito uma vez por versão: vale usar o nível máximo. Versões
+    # comprimidas que não ficam menores são descartadas.
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    brotlied = brotli.compress(body, quality=11)
+    return Payload(
+        body=body,
+        gzip=gzipped if len(gzipped) < len(body) else None,
+        br=brotlied if len(brotlied) < len(body) else None,
+    )
+
+
+def _profile():
+    profile = UserProfile.objects.first()
+    return user_profile_to_dict(profile) if profile else None
+
+
+# Blocos do payload de /api/portfolio/, na ordem padrão.
+SECTION_BUILDERS = {
+    "profile": _profile,
+    "sections": lambda: [
+        section_config_to_dict(s)
+        for s in SectionConfig.objects.all().order_by("order_index")
+    ],
+    "skills": lambda: [
+        skill_to_dict(s)
+        for s in Skill.objects.all().order_by("order_index", "name")
+    ],
+    "experiences": lambda: [
+        experience_to_dict(e)
+        for e in Experience.objects.all().order_by("order_index", "-start_date")
+    ],
+    "certifications": lambda: [
+        certification_to_dict(c)
+        for c in Certification.objects.all().order_by("order_index", "-issue_date")
+    ],
+    "education": lambda: [
+        education_to_dict(e)
+        for e in Education.objects.all().order_by("order_index", "-start_date")
+    ],
+    "services": lambda: [
+        service_to_dict(s)
+        for s in Service.objects.all().order_by("order_index", "title")
+    ],
+    "languages": lambda: [
+        language_to_dict(l)
+        for l in Language.objects.all().order_by("order_index", "name")
+    ],
+    "projects": lambda: [
+        project_to_dict(p)
+        for p in Project.objects.select_related("repo_metadata")
+        .prefetch_related("images")
+        .order_by("-created_at")
+    ],
+}
+
+# Bloco do payload -> SectionConfig.section_key que o liga/desliga. O perfil
+# e a própria configuração sempre saem (o front usa o perfil fora do hero).
+SECTION_KEYS = {
+    "skills": SECTION_SKILLS,
+    "experiences": SECTION_EXPERIENCE,
+    "certifications": SECTION_CERTIFICATIONS,
+    "education": SECTION_EDUCATION,
+    "services": SECTION_SERVICES,
+    "languages": SECTION_LANGUAGES,
+    "projects": SECTION_PROJECTS,
+}
+
+
+def _cached(name: str, version, build):
+    """
+    Valor de build() para a versão informada: memória do processo, depois o
+    cache do Django, e só então monta (lendo do primário).
+    """
+    memo = _local.get(name)
+    if memo and memo[0] == version:
+        return memo[1]
+
+    value = _from_cache(name, version, build).value
+    _local[name] = (version, value)
+    return value
+
+
+def _payload_key(name: str, version) -> str:
+    return f"{PAYLOAD_KEY_PREFIX}{name}:{version}"
+
+
+def _latest_key(name: str) -> str:
+    return f"{PAYLOAD_KEY_PREFIX}{name}:latest"
+
+
+def _from_cache(name: str, version, build, stale=None):
+    """
+    Flight com o valor de build() para a versão, do cache do Django ou
+    montado (lendo do primário) por um só chamador entre threads e workers.
+    Com stale, quem chega durante a montagem pode receber o valor anterior.
+    """
+    def rebuild():
+        with reading_from_primary():
+            value = build()
+        if stale is not None:
+            cache.set(_latest_key(name), version, PAYLOAD_TIMEOUT)
+        return value
+
+    return single_flight(_payload_key(name, version), rebuild, PAYLOAD_TIMEOUT, stale)
+
+
+def _previous(name: str, version):
+    # Última versão montada por qualquer worker, se ainda estiver no cache.
+    previous = cache.get(_latest_key(name))
+    if previous is None or previous == version:
+        return None
+    return cache.get(_payload_key(name, previous))
+
+
+def _shared(name: str, version, build) -> Payload:
+    """
+    Como _cached, para payloads prontos: com o arquivo compartilhado ligado,
+    lidos dele (sem cópia na memória do processo) e, na falta, gravados
+    nele pelo primeiro worker que os montar ou ler do cache. Enquanto outro
+    chamador monta a versão nova, devolve a anterior (stale), que não é
+    guardada em lugar nenhum com a versão nova.
+    """
+    store = get_store()
+    if store is None:
+        memo = _local.get(name)
+        if memo and memo[0] == version:
+            return memo[1]
+        previous = memo[1] if memo else None
+    else:
+        parts = store.get(name, version)
+        if parts is not None:
+            return Payload(*parts)
+        parts = store.latest(name)
+        previous = Payload(*parts) if parts else None
+
+    payload, is_stale = _from_cache(
+        name, version, build, lambda: previous or _previous(name, version)
+    )
+    if is_stale:
+        return replace(payload, stale=True)
+    if store is None:
+        _local[name] = (version, payload)
+        return payload
+    parts = store.put(name, version, (payload.body, payload.gzip, payload.br))
+    return Payload(*parts) if parts else payload
+
+
+def cached_payload(name: str, version, build) -> Payload:
+    return _shared(name, version, lambda: compress(to_json_bytes(build())))
+
+
+def section_settings(version) -> dict:
+    """
+    {section_key: (habilitada, ordem)} do SectionConfig, por versão de
+    "sections". Seções sem configuração ficam habilitadas.
+    """
+    return _cached(
+        "section-settings",
+        version,
+        lambda: {
+            key: (enabled, order)
+            for key, enabled, order in SectionConfig.objects.values_list(
+                "section_key", "is_enabled", "order_index"
+            )
+        },
+    )
+
+
+def portfolio_sections(selected, settings_version) -> list:
+    """
+    Blocos a montar: os pedidos (ou todos), sem os desabilitados no
+    SectionConfig, com os de conteúdo na ordem de order_index.
+    """
+    config = section_settings(settings_version)
+    names = [
+        name
+        for name in SECTION_BUILDERS
+        if (selected is None or name in selected)
+        and config.get(SECTION_KEYS.get(name), (True, 0))[0]
+    ]
+    fixed = [name for name in names if name not in SECTION_KEYS]
+    default_order = {name: index for index, name in enumerate(SECTION_BUILDERS)}
+    content = sorted(
+        (name for name in names if name in SECTION_KEYS),
+        key=lambda name: (
+            config[SECTION_KEYS[name]][1] if SECTION_KEYS[name] in config else float("inf"),
+            default_order[name],
+        ),
+    )
+    return fixed + content
+
+
+def _scopes(name: str, chain) -> tuple:
+    # Versões de um bloco em um idioma: a geral e a de cada idioma da cadeia.
+    return (name, *(locale_scope(name, locale) for locale in chain))
+
+
+def portfolio_payload(locale: str, selected=None) -> Payload:
+    """
+    Payload de /api/portfolio/ no idioma informado, só com os blocos em
+    `selected` (todos, se None). Cada bloco é cacheado à parte pela própria
+    versão (core.cache), então qualquer combinação é montada juntando bytes
+    prontos; só o bloco alterado é consultado de novo.
+    """
+    chain = fallback_chain(locale)
+    versions = get_versions(
+        [scope for name in SECTION_BUILDERS for scope in _scopes(name, chain)]
+    )
+
+    def version_of(name):
+        return ".".join(str(versions[scope]) for scope in _scopes(name, chain))
+
+    names = portfolio_sections(selected, versions["sections"])
+    # Resumo das versões de todos os blocos: a lista completa passaria do
+    # limite de tamanho de chave de alguns backends (memcached: 250).
+    composite = hashlib.sha1(
+        ",".join(
+            [str(versions["sections"])] + [f"{name}={version_of(name)}" for name in names]
+        ).encode()
+    ).hexdigest()
+
+    def build_fragment(name):
+        with using_locale(locale):
+            return to_json_bytes(SECTION_BUILDERS[name]())
+
+    def build():
+        parts = [
+            b'"' + name.encode() + b'": '
+            + _cached(f"section:{name}:{locale}", version_of(name), lambda n=name: build_fragment(n))
+            for name in names
+        ]
+        return compress(b"{" + b", ".join(parts) + b"}")
+
+    subset = "all" if selected is None else "+".join(names)
+    return _shared(f"portfolio:{locale}:{subset}", composite, build)
+
+
+def project_slugs(version) -> frozenset:
+    """
+    Slugs de todos os projetos, por versão de "projects" (qualquer alteração
+    em projeto, inclusive troca de slug, muda a versão). Vale no máximo
+    PROJECT_SLUGS_TTL segundos, para que escritas que não passam pelos
+    sinais (SQL direto, update em massa) também apareçam.
+    """
+    global _project_slugs
+    now = time.monotonic()
+    if _project_slugs and _project_slugs[0] == version and _project_slugs[1] > now:
+        return _project_slugs[2]
+
+    ttl = settings.PROJECT_SLUGS_TTL
+    key = f"{PAYLOAD_KEY_PREFIX}project-slugs:{version}"
+    slugs = cache.get(key)
+    if slugs is None:
+        with reading_from_primary():
+            slugs = frozenset(Project.objects.values_list("slug", flat=True))
+        cache.set(key, slugs, ttl)
+    _project_slugs = (version, now + ttl, slugs)
+    return slugs
+
+
+def project_payload(slug: str, locale: str) -> Payload | None:
+    """
+    Payload de /api/projects/<slug>/ no idioma informado, ou None se não há
+    projeto com esse slug (decidido pelo conjunto de slugs, sem consulta).
+    """
+    chain = fallback_chain(locale)
+    scopes = _scopes("projects", chain)
+    versions = get_versions(scopes)
+    if slug not in project_slugs(versions["projects"]):
+        return None
+
+    def build():
+        project = (
+            Project.objects.select_related("repo_metadata")
+            .prefetch_related("images")
+            .get(slug=slug)
+        )
+        with using_locale(locale):
+            return project_to_dict(project)
+
+    version = ".".join(str(versions[scope]) for scope in scopes)
+    return cached_payload(f"project:{slug}:{locale}", version, build)
+
+
+def stats_payload() -> Payload:
+    # A data entra na versão: cargos atuais e certificados vencidos mudam
+    # com o passar dos dias, sem alteração no banco.
+    today = timezone.localdate()
+    versions = get_versions(STATS_SCOPES)
+    version = ".".join(str(versions[scope]) for scope in STATS_SCOPES)
+    return cached_payload("stats", f"{version}:{today.isoformat()}", lambda: build_stats(today))
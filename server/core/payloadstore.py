@@ -0,0 +1,299 @@
+# core/payloadstore.py
+"""
+Payloads prontos compartilhados entre os workers da máquina
+(PAYLOAD_STORE_ENABLED).
+
+Sem isto, cada worker guarda na própria memória (core.payloads) uma cópia
+de cada payload comprimido, montada ou lida do cache uma vez por worker.
+Aqui os payloads ficam num arquivo de tamanho fixo (PAYLOAD_STORE_SIZE,
+esparso) mapeado com mmap por todos os processos: uma cópia só, no page
+cache, lida sem desserializar (fatias memoryview do mapa), e um worker
+novo já encontra prontos os payloads que outro montou.
+
+Formato do arquivo:
+- cabeçalho (HEADER): seq, posição e tamanho do índice, fim dos dados e a
+  marca de arquivo aposentado;
+- a partir de DATA_START, dados só acrescentados: os bytes de cada payload
+  (corpo, gzip, brotli) e, a cada gravação, o índice completo em JSON
+  ({nome: [versão, [início, tamanho] do corpo, do gzip, do brotli]}).
+
+O que foi escrito nunca é sobrescrito, então as fatias entregues aos
+leitores continuam válidas. Só o cabeçalho muda, sob um seqlock: o
+gravador deixa seq ímpar, troca os campos e deixa seq par; o leitor relê
+se seq estava ímpar ou mudou no meio da leitura.
+
+Um gravador por vez (flock em <arquivo>.lock). Quando o espaço acaba, o
+gravador compacta: cria um arquivo novo só com a versão atual de cada
+payload, renomeia por cima e marca o antigo como aposentado; os leitores
+veem a marca e mapeiam o novo. É um cache: sem fsync, e um arquivo
+inválido (inclusive com seq ímpar deixado por um gravador que morreu) é
+recriado na próxima gravação.
+"""
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PFPS"
+FORMAT_VERSION = 1
+# magic, formato, seq, início do índice, tamanho do índice, fim dos dados, aposentado
+HEADER = struct.Struct("<4sIQQQQQ")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 8
+RETIRED_OFFSET = 40
+DATA_START = 64
+SEQLOCK_RETRIES = 1000
+
+Header = namedtuple("Header", "magic format seq index_offset index_length end retired")
+
+# Mapa lido por um processo: o memoryview do arquivo, o seq e o índice dele.
+_State = namedtuple("_State", "view seq index")
+
+
+def _header(buffer) -> Header | None:
+    if len(buffer) < HEADER.size:
+        return None
+    header = Header(*HEADER.unpack_from(buffer))
+    if header.magic != MAGIC or header.format != FORMAT_VERSION:
+        return None
+    return header
+
+
+def _pwrite_all(fd, data, offset: int) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+class PayloadStore:
+    def __init__(self, path, size: int):
+        self.path = str(path)
+        self.lock_path = f"{self.path}.lock"
+        self.size = size
+        self._state = None
+        self._lock = threading.Lock()
+
+    # ---------- leitura ----------
+
+    def get(self, name: str, version):
+        """
+        (corpo, gzip, brotli) do payload `name` na versão informada, como
+        fatias do mapa (None nas compressões ausentes), ou None.
+        """
+        state = self._snapshot()
+        if state is None:
+            return None
+        entry = state.index.get(name)
+        if entry is None or entry[0] != str(version):
+            return None
+        return self._slices(state.view, entry)
+
+    def latest(self, name: str):
+        """
+        Como get(), para a versão de `name` que estiver no arquivo.
+        """
+        state = self._snapshot()
+        if state is None or name not in state.index:
+            return None
+        return self._slices(state.view, state.index[name])
+
+    @staticmethod
+    def _slices(view, entry) -> tuple:
+        return tuple(
+            view[span[0]:span[0] + span[1]] if span else None for span in entry[1:]
+        )
+
+    def _snapshot(self) -> _State | None:
+        state = self._state
+        if state is not None:
+            header = _header(state.view)
+            if header and not header.retired and header.seq == state.seq:
+                return state
+        with self._lock:
+            self._state = self._load(self._state)
+            return self._state
+
+    def _map(self):
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            if os.fstat(fd).st_size < DATA_START:
+                return None
+            return memoryview(mmap.mmap(fd, 0, access=mmap.ACCESS_READ))
+        finally:
+            os.close(fd)
+
+    def _load(self, state: _State | None) -> _State | None:
+        view = state.view if state else self._map()
+        fresh = state is None
+        for _ in range(SEQLOCK_RETRIES):
+            if view is None:
+                return None
+            header = _header(view)
+            if header is None and fresh:
+                return None
+            if header is None or header.retired:
+                # Trocado por um arquivo novo (compactado ou recriado). O
+                # mapa antigo é liberado quando as fatias entregues deixarem
+                # de existir.
+                view = self._map()
+                fresh = True
+                continue
+            if header.seq % 2:
+                os.sched_yield()
+                continue
+            if header.index_offset + header.index_length > len(view):
+                return None
+            raw = bytes(view[header.index_offset:header.index_offset + header.index_length])
+            if SEQ.unpack_from(view, SEQ_OFFSET)[0] != header.seq:
+                continue
+            if state is not None and state.view is view and state.seq == header.seq:
+                return state
+            return _State(view, header.seq, json.loads(raw) if raw else {})
+        logger.warning("Cabeçalho de %s instável; payloads compartilhados ignorados.", self.path)
+        return None
+
+    # ---------- gravação ----------
+
+    def put(self, name: str, version, parts):
+        """
+        Grava os bytes (corpo, gzip, brotli) do payload e devolve as fatias
+        do mapa, como get(); None se o payload não cabe no arquivo.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lock = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._put_locked(name, str(version), parts)
+        except OSError:
+            logger.exception("Falha ao gravar o payload %s compartilhado.", name)
+            return None
+        finally:
+            os.close(lock)
+        return self.get(name, version)
+
+    def _put_locked(self, name: str, version: str, parts) -> None:
+        try:
+            fd = os.open(self.path, os.O_RDWR)
+        except FileNotFoundError:
+            self._rewrite(None, {}, name, version, parts)
+            return
+        try:
+            header = _header(os.pread(fd, HEADER.size, 0))
+            if header is None or os.fstat(fd).st_size != self.size:
+                self._rewrite(fd, {}, name, version, parts)
+                return
+            if header.seq % 2:
+                # Com o flock na mão, seq ímpar é um gravador que morreu no
+                # meio (SIGKILL do gunicorn): os campos podem estar pela
+                # metade e a paridade ficaria invertida para sempre.
+                logger.warning("Gravação interrompida em %s; arquivo recriado.", self.path)
+                self._rewrite(fd, {}, name, version, parts)
+                return
+            index = json.loads(os.pread(fd, header.index_length, header.index_offset) or b"{}")
+            if index.get(name, [None])[0] == version:
+                return  # outro worker acabou de gravar
+
+            position = header.end
+            spans = []
+            for part in parts:
+                if part is None:
+                    spans.append(None)
+                    continue
+                spans.append([position, len(part)])
+                position += len(part)
+            # O índice fica em ordem de gravação: a compactação descarta os
+            # mais antigos primeiro.
+            index.pop(name, None)
+            new_index = json.dumps({**index, name: [version, *spans]}).encode()
+            if position + len(new_index) > self.size:
+                self._rewrite(fd, index, name, version, parts)
+                return
+
+            for part, span in zip(parts, spans):
+                if part is not None:
+                    _pwrite_all(fd, part, span[0])
+            _pwrite_all(fd, new_index, position)
+            _pwrite_all(fd, SEQ.pack(header.seq + 1), SEQ_OFFSET)
+            _pwrite_all(
+                fd, struct.pack("<QQQ", position, len(new_index), position + len(new_index)),
+                SEQ_OFFSET + SEQ.size,
+            )
+            _pwrite_all(fd, SEQ.pack(header.seq + 2), SEQ_OFFSET)
+        finally:
+            os.close(fd)
+
+    def _rewrite(self, old_fd, index: dict, name: str, version: str, parts) -> None:
+        """
+        Arquivo novo com a versão atual de cada payload de `index` (lidos de
+        old_fd) mais o novo, renomeado por cima do atual, que é aposentado.
+        Payloads que não cabem ficam de fora, os mais antigos primeiro.
+        """
+        entries = [(name, version, list(parts))]
+        for other, (other_version, *spans) in reversed(index.items()):
+            if other != name:
+                entries.append((
+                    other,
+                    other_version,
+                    [os.pread(old_fd, span[1], span[0]) if span else None for span in spans],
+                ))
+
+        temp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(temp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, self.size)
+            position = DATA_START
+            new_index = {}
+            dropped = []
+            for entry_name, entry_version, entry_parts in entries:
+                needed = sum(len(part) for part in entry_parts if part is not None)
+                if position + needed + len(json.dumps(new_index)) + 1024 > self.size:
+                    dropped.append(entry_name)
+                    continue
+                spans = []
+                for part in entry_parts:
+                    if part is None:
+                        spans.append(None)
+                        continue
+                    _pwrite_all(fd, part, position)
+                    spans.append([position, len(part)])
+                    position += len(part)
+                new_index[entry_name] = [entry_version, *spans]
+            raw = json.dumps(new_index).encode()
+            _pwrite_all(fd, raw, position)
+            _pwrite_all(
+                fd,
+                HEADER.pack(MAGIC, FORMAT_VERSION, 2, position, len(raw), position + len(raw), 0),
+                0,
+            )
+        finally:
+            os.close(fd)
+        os.rename(temp, self.path)
+        if old_fd is not None:
+            _pwrite_all(old_fd, SEQ.pack(1), RETIRED_OFFSET)
+        if dropped:
+            logger.warning(
+                "%d payloads não couberam em PAYLOAD_STORE_SIZE na compactação "
+                "(voltam para a memória dos workers): %s",
+                len(dropped), ", ".join(dropped[:10]),
+            )
+
+
+@lru_cache(maxsize=1)
+def get_store() -> PayloadStore | None:
+    if not settings.PAYLOAD_STORE_ENABLED:
+        return None
+    return PayloadStore(settings.PAYLOAD_STORE_PATH, settings.PAYLOAD_STORE_SIZE)
@@ -0,0 +1,143 @@
+# core/profiling.py
+"""
+Perfis (cProfile) de requisições reais, sob demanda.
+
+Com PROFILING_ENABLED, o RequestProfilerMiddleware perfila:
+- a requisição de um usuário staff que mande o cabeçalho X-Profile: 1 ou
+  ?__profile=1;
+- uma em cada PROFILING_SAMPLE_RATE requisições (0 desliga a amostragem).
+
+Cada perfil vai para um buffer circular de PROFILING_BUFFER_SIZE posições
+no cache do Django (compartilhado entre os workers se o cache for) e pode
+ser listado e baixado em /api/internal/profiles/. Desligado, o middleware
+sai da cadeia na inicialização (MiddlewareNotUsed) e não custa nada.
+"""
+import cProfile
+import io
+import itertools
+import marshal
+import pstats
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_PARAM = "__profile"
+COUNTER_KEY = "core:profiles:counter"
+SLOT_KEY_PREFIX = "core:profiles:slot:"
+PROFILE_TIMEOUT = 60 * 60 * 24
+SUMMARY_LINES = 40
+
+
+def _slot_key(profile_id: int) -> str:
+    return f"{SLOT_KEY_PREFIX}{profile_id % settings.PROFILING_BUFFER_SIZE}"
+
+
+def _next_id() -> int:
+    try:
+        return cache.incr(COUNTER_KEY)
+    except ValueError:
+        cache.add(COUNTER_KEY, 0, timeout=None)
+        return cache.incr(COUNTER_KEY)
+
+
+def store_profile(profiler, request, response, duration: float, reason: str) -> int:
+    """
+    Grava o perfil no buffer circular e devolve o id dele. O id mais antigo
+    é sobrescrito quando o buffer enche.
+    """
+    profiler.create_stats()
+    # Mesmo formato de cProfile.Profile.dump_stats (pstats, snakeviz). Antes
+    # do pstats.Stats, que esvazia profiler.stats.
+    raw_stats = marshal.dumps(profiler.stats)
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(SUMMARY_LINES)
+
+    profile_id = _next_id()
+    cache.set(
+        _slot_key(profile_id),
+        {
+            "id": profile_id,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "reason": reason,
+            "created_at": timezone.now().isoformat(),
+            "summary": stream.getvalue(),
+            "stats": raw_stats,
+        },
+        PROFILE_TIMEOUT,
+    )
+    return profile_id
+
+
+def list_profiles() -> list:
+    """
+    Perfis guardados, do mais recente para o mais antigo (sem os dados
+    brutos).
+    """
+    slots = [f"{SLOT_KEY_PREFIX}{i}" for i in range(settings.PROFILING_BUFFER_SIZE)]
+    found = cache.get_many(slots).values()
+    return sorted(
+        ({k: v for k, v in p.items() if k not in ("summary", "stats")} for p in found),
+        key=lambda p: p["id"],
+        reverse=True,
+    )
+
+
+def get_profile(profile_id: int) -> dict | None:
+    profile = cache.get(_slot_key(profile_id))
+    if profile is None or profile["id"] != profile_id:
+        return None
+    return profile
+
+
+class RequestProfilerMiddleware:
+    """
+    Roda a requisição sob o cProfile quando pedido por um staff ou quando
+    sorteada pela amostragem; o id do perfil volta em X-Profile-Id. Fica no
+    fim da lista para ter request.user.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.counter = itertools.count(1)
+
+    def _reason(self, request):
+        if PROFILE_HEADER in request.META or PROFILE_PARAM in request.GET:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_active and user.is_staff:
+                return "requested"
+        if self.sample_rate and next(self.counter) % self.sample_rate == 0:
+            return "sampled"
+        return None
+
+    def __call__(self, request):
+        reason = self._reason(request)
+        if reason is None:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Outro perfil já ativo nesta thread.
+            return self.get_response(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - start
+
+        response["X-Profile-Id"] = str(
+            store_profile(profiler, request, response, duration, reason)
+        )
+        return response
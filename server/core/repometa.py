@@ -0,0 +1,271 @@
+# core/repometa.py
+"""
+Metadados dos repositórios GitHub dos projetos (estrelas, forks,
+linguagens, último push).
+
+A consulta roda fora do request (comando enrich_repositories): os
+repositórios são deduplicados, consultados em paralelo com concorrência
+limitada e revalidados com If-None-Match (respostas 304 não contam no
+limite da API). O resultado fica em RepositoryMetadata, que o payload de
+projetos lê com select_related.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .cache import bump_versions
+from .models import Project, RepositoryMetadata
+
+GITHUB_HOSTS = {"github.com", "www.github.com"}
+USER_AGENT = "PortfolioRepoMetadata/1.0"
+
+UPDATED = "updated"
+NOT_MODIFIED = "not_modified"
+NOT_FOUND = "not_found"
+FAILED = "failed"
+
+# Campos que vão para o payload: mudança em qualquer um invalida o cache.
+PUBLIC_FIELDS = (
+    "full_name",
+    "found",
+    "description",
+    "html_url",
+    "stars",
+    "forks",
+    "language",
+    "languages",
+    "pushed_at",
+)
+
+
+def parse_repo(url) -> str | None:
+    """
+    "https://github.com/Dono/Repo(.git)/..." -> "dono/repo"; None para URLs
+    que não são de repositório GitHub.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url)
+    if (parts.hostname or "").lower() not in GITHUB_HOSTS:
+        return None
+    segments = [s for s in parts.path.split("/") if s]
+    if len(segments) < 2:
+        return None
+    owner, name = segments[0], segments[1]
+    if name.endswith(".git"):
+        name = name[:-4]
+    return f"{owner}/{name}".lower() if name else None
+
+
+@dataclass
+class RepoFetch:
+    full_name: str
+    status: str
+    data: dict | None = None
+    etag: str = ""
+    languages: dict | None = None
+    languages_etag: str = ""
+    error: str = ""
+
+
+class RateLimited(Exception):
+    pass
+
+
+def repo_fields(data: dict) -> dict:
+    pushed_at = data.get("pushed_at")
+    return {
+        "description": data.get("description") or "",
+        "html_url": data.get("html_url") or "",
+        "stars": data.get("stargazers_count") or 0,
+        "forks": data.get("forks_count") or 0,
+        "language": data.get("language") or "",
+        "pushed_at": parse_datetime(pushed_at) if pushed_at else None,
+    }
+
+
+class RepositoryFetcher:
+    def __init__(self, base_url: str, token: str | None, concurrency: int, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    async def fetch_all(self, jobs: dict) -> dict:
+        """
+        jobs: {"dono/repo": (etag, languages_etag)} -> {"dono/repo": RepoFetch}
+        """
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._exhausted = False
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": USER_AGENT,
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+        ) as client:
+            results = await asyncio.gather(
+                *(self._fetch(client, name, *etags) for name, etags in jobs.items())
+            )
+        return {r.full_name: r for r in results}
+
+    async def _fetch(self, client, full_name: str, etag: str, languages_etag: str) -> RepoFetch:
+        async with self._slots:
+            if self._exhausted:
+                return RepoFetch(full_name, FAILED, error="Limite da API atingido.")
+            try:
+                repo = await self._get(client, f"/repos/{full_name}", etag)
+                if repo.status_code == 404:
+                    return RepoFetch(full_name, NOT_FOUND)
+                if repo.status_code not in (200, 304):
+                    return RepoFetch(full_name, FAILED, error=f"HTTP {repo.status_code}")
+                languages = await self._get(client, f"/repos/{full_name}/languages", languages_etag)
+            except RateLimited:
+                return RepoFetch(full_name, FAILED, error="Limite da API atingido.")
+            except httpx.HTTPError as exc:
+                return RepoFetch(full_name, FAILED, error=f"{type(exc).__name__}: {exc}")
+
+        result = RepoFetch(full_name, NOT_MODIFIED)
+        if repo.status_code == 200:
+            result.status = UPDATED
+            result.data = repo_fields(repo.json())
+            result.etag = repo.headers.get("ETag", "")
+        if languages.status_code == 200:
+            result.status = UPDATED
+            result.languages = languages.json()
+            result.languages_etag = languages.headers.get("ETag", "")
+        return result
+
+    async def _get(self, client, path: str, etag: str):
+        headers = {"If-None-Match": etag} if etag else {}
+        response = await client.get(path, headers=headers)
+        if response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+            # Sem cota: o resto do lote fica para a próxima execução.
+            self._exhausted = True
+            raise RateLimited()
+        return response
+
+
+def fetch_repositories(jobs: dict) -> dict:
+    fetcher = RepositoryFetcher(
+        settings.REPO_METADATA_API_URL,
+        settings.REPO_METADATA_TOKEN,
+        settings.REPO_METADATA_CONCURRENCY,
+        settings.REPO_METADATA_TIMEOUT,
+    )
+    return asyncio.run(fetcher.fetch_all(jobs))
+
+
+def _public(row) -> tuple:
+    return tuple(getattr(row, name) for name in PUBLIC_FIELDS)
+
+
+def _merge(project_id: int, full_name: str, current, result: RepoFetch, now):
+    """
+    Linha atualizada com o resultado da consulta, ou None se não há o que
+    gravar (falha: mantém os dados antigos e tenta de novo na próxima).
+    """
+    if result.status == FAILED:
+        return None
+    row = RepositoryMetadata(project_id=project_id, full_name=full_name, fetched_at=now)
+    if result.status == NOT_FOUND:
+        row.found = False
+        return row
+    if current is not None:
+        for name in PUBLIC_FIELDS + ("etag", "languages_etag"):
+            setattr(row, name, getattr(current, name))
+    row.found = True
+    if result.data is not None:
+        for name, value in result.data.items():
+            setattr(row, name, value)
+        row.etag = result.etag
+    if result.languages is not None:
+        row.languages = result.languages
+        row.languages_etag = result.languages_etag
+    return row
+
+
+def run_enrichment(force: bool = False) -> dict:
+    """
+    Consulta os repositórios dos projetos com metadados ausentes ou mais
+    velhos que REPO_METADATA_TTL (todos, com force) e grava o resultado.
+    """
+    start = time.perf_counter()
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.REPO_METADATA_TTL)
+
+    repos = {}
+    for project_id, repo_url in Project.objects.values_list("id", "repo_url"):
+        full_name = parse_repo(repo_url)
+        if full_name:
+            repos[project_id] = full_name
+
+    existing = {row.project_id: row for row in RepositoryMetadata.objects.all()}
+    # Metadados de projetos sem repositório (ou que trocaram de repositório)
+    # não valem mais; os do repositório novo são consultados do zero.
+    current = {
+        pid: row for pid, row in existing.items() if repos.get(pid) == row.full_name
+    }
+    removed = [pid for pid in existing if pid not in current]
+
+    jobs = {}
+    for project_id, full_name in repos.items():
+        row = current.get(project_id)
+        if row is not None and not force and row.fetched_at >= stale_before:
+            continue
+        etags = (row.etag, row.languages_etag) if row is not None and row.found else ("", "")
+        if jobs.get(full_name, etags) != etags:
+            # Projetos do mesmo repositório em estados diferentes: consulta
+            # completa, para que todos recebam os dados (e não um 304).
+            etags = ("", "")
+        jobs[full_name] = etags
+
+    results = fetch_repositories(jobs) if jobs else {}
+
+    rows = []
+    changed = bool(removed)
+    for project_id, full_name in repos.items():
+        if full_name not in results:
+            continue
+        row = _merge(project_id, full_name, current.get(project_id), results[full_name], now)
+        if row is None:
+            continue
+        rows.append(row)
+        old = current.get(project_id)
+        if old is None or _public(old) != _public(row):
+            changed = True
+
+    if removed:
+        RepositoryMetadata.objects.filter(project_id__in=removed).delete()
+    RepositoryMetadata.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["project"],
+        update_fields=list(PUBLIC_FIELDS) + ["etag", "languages_etag", "fetched_at"],
+    )
+    if changed:
+        # bulk_create/delete em massa não disparam os sinais de conteúdo.
+        bump_versions("projects")
+
+    summary = {"projects": len(repos), "repositories": len(jobs), "removed": len(removed)}
+    for status in (UPDATED, NOT_MODIFIED, NOT_FOUND, FAILED):
+        summary[status] = sum(1 for r in results.values() if r.status == status)
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    return summary
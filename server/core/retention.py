@@ -0,0 +1,302 @@
+# core/retention.py
+"""
+Retenção e arquivamento de contact_message.
+
+No PostgreSQL a tabela é particionada por mês em created_at (migration
+0003): cada mês vira uma partição contact_message_pAAAAMM, mais uma
+partição default que deve ficar vazia: ensure_partitions() (comando
+archive_contact_messages; o processo "retention" do procfile roda só
+essa parte, com --partitions-only) cria os meses seguintes e move para
+partições próprias o que tiver caído na default. Partições antigas inteiras são removidas com DROP TABLE depois
+de arquivadas, sem inchar a tabela. Nos outros bancos a tabela continua
+simples e tudo é feito com DELETE em lotes.
+
+O arquivo gerado é NDJSON comprimido com gzip, uma mensagem por linha,
+escrito em streaming (memória limitada ao tamanho do lote). Ele é gravado
+com nome temporário e só ganha o nome final depois do fsync (arquivo e
+diretório): nada é apagado com base num arquivo que uma queda perderia.
+"""
+import gzip
+import io
+import json
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import inbox, rollups
+from .models import ContactMessage
+
+TABLE = ContactMessage._meta.db_table
+PARTITION_PREFIX = f"{TABLE}_p"
+DEFAULT_PARTITION = f"{TABLE}_pdefault"
+ARCHIVE_FIELDS = (
+    "id", "name", "email", "subject", "message", "created_at", "is_read", "journal_id",
+)
+
+_PARTITION_RE = re.compile(rf"^{re.escape(PARTITION_PREFIX)}(\d{{4}})(\d{{2}})$")
+
+
+# ---------- Partições (PostgreSQL) ----------
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def is_partitioned(conn=connection) -> bool:
+    if conn.vendor != "postgresql":
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(conn=connection) -> dict:
+    """
+    {início do mês: nome da partição} das partições mensais existentes.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            partitions[datetime(year, month, 1, tzinfo=dt_timezone.utc)] = name
+    return partitions
+
+
+def create_partition(month: datetime, conn=connection) -> None:
+    """
+    Cria a partição do mês. Se a partição default já tiver linhas desse
+    mês (a partição não existia quando foram inseridas), o CREATE ...
+    PARTITION OF falharia: a partição é criada solta, recebe as linhas
+    movidas da default e só então é anexada.
+    """
+    qn = conn.ops.quote_name
+    name = partition_name(month)
+    bounds = [month.isoformat(), add_months(month, 1).isoformat()]
+    with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+        # Nada entra na default enquanto as linhas do mês são movidas.
+        cursor.execute(f"LOCK TABLE {qn(DEFAULT_PARTITION)} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(
+            f"SELECT 1 FROM {qn(DEFAULT_PARTITION)} "
+            f"WHERE created_at >= %s AND created_at < %s LIMIT 1",
+            bounds,
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {qn(name)} "
+                f"PARTITION OF {qn(TABLE)} FOR VALUES FROM (%s) TO (%s)",
+                bounds,
+            )
+            return
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} "
+            f"WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved",
+            bounds,
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+
+
+def ensure_partitions(start: datetime | None = None, months_ahead: int = 3, conn=connection) -> list:
+    """
+    Cria as partições mensais de `start` até `months_ahead` meses à
+    frente. Sem `start`, começa no mês atual ou no da linha mais antiga
+    da partição default, se houver. Retorna os nomes criados.
+    """
+    if not is_partitioned(conn):
+        return []
+    now = month_start(datetime.now(dt_timezone.utc))
+    if start is None:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT min(created_at) FROM {conn.ops.quote_name(DEFAULT_PARTITION)}")
+            start = min(filter(None, (cursor.fetchone()[0], now)))
+    month = month_start(start)
+    existing = list_partitions(conn)
+    created = []
+    while month <= add_months(now, months_ahead):
+        if month not in existing:
+            create_partition(month, conn)
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def drop_partitions_before(cutoff: datetime, conn=connection) -> int:
+    """
+    Remove (DROP TABLE) partições cujo mês termina até `cutoff`, ajustando
+    os contadores da caixa de entrada e as contagens diárias. Retorna
+    quantas mensagens saíram.
+    """
+    if not is_partitioned(conn):
+        return 0
+    qn = conn.ops.quote_name
+    removed = 0
+    for month, name in sorted(list_partitions(conn).items()):
+        if add_months(month, 1) > cutoff:
+            break
+        with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+            cursor.execute(
+                f"SELECT (created_at AT TIME ZONE %s)::date, is_read, count(*) "
+                f"FROM {qn(name)} GROUP BY 1, 2",
+                [timezone.get_current_timezone_name()],
+            )
+            deltas = {(day, is_read): -n for day, is_read, n in cursor.fetchall()}
+            total = -sum(deltas.values())
+            unread = -sum(n for (_, is_read), n in deltas.items() if not is_read)
+            cursor.execute(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(name)}")
+            cursor.execute(f"DROP TABLE {qn(name)}")
+            inbox.adjust_counters(total=-total, unread=-unread)
+            rollups.adjust(deltas)
+        removed += total
+    return removed
+
+
+# ---------- Arquivamento ----------
+
+def _row_to_json(row: dict) -> str:
+    row = dict(row)
+    row["created_at"] = row["created_at"].isoformat()
+    if row["journal_id"] is not None:
+        row["journal_id"] = str(row["journal_id"])
+    return json.dumps(row, ensure_ascii=False)
+
+
+def _fsync_dir(directory) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def archive_messages(cutoff: datetime, path, batch_size: int = 1000) -> tuple:
+    """
+    Grava em `path` (NDJSON + gzip) as mensagens anteriores a `cutoff`.
+    Retorna (quantidade, maior id arquivado); o arquivo só existe, já
+    em disco, se houver mensagens.
+    """
+    qs = (
+        ContactMessage.objects.filter(created_at__lt=cutoff)
+        .order_by("created_at", "id")
+        .values(*ARCHIVE_FIELDS)
+    )
+    path = os.fspath(path)
+    temp = f"{path}.part"
+    count, max_id = 0, 0
+    try:
+        with open(temp, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as gz, \
+                    io.TextIOWrapper(gz, encoding="utf-8") as fh:
+                for row in qs.iterator(chunk_size=batch_size):
+                    fh.write(_row_to_json(row))
+                    fh.write("\n")
+                    count += 1
+                    max_id = max(max_id, row["id"])
+            raw.flush()
+            os.fsync(raw.fileno())
+        if count:
+            os.rename(temp, path)
+            _fsync_dir(os.path.dirname(os.path.abspath(path)))
+    finally:
+        if os.path.exists(temp):
+            os.unlink(temp)
+    return count, max_id
+
+
+def delete_archived(cutoff: datetime, max_id: int, batch_size: int = 1000) -> int:
+    """
+    Apaga em lotes o que foi arquivado: primeiro partições inteiras (se
+    houver), depois o restante com DELETEs de até `batch_size` linhas.
+    """
+    deleted = drop_partitions_before(cutoff)
+    archived = Q(created_at__lt=cutoff, id__lte=max_id)
+    while True:
+        ids = list(
+            ContactMessage.objects.filter(archived)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += inbox.delete_messages(ContactMessage.objects.filter(pk__in=ids))
+
+
+# ---------- Restauração ----------
+
+def _read_batches(path, batch_size: int):
+    batch = []
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            row["created_at"] = datetime.fromisoformat(row["created_at"])
+            # Arquivos antigos não têm journal_id.
+            batch.append(ContactMessage(**{f: row.get(f) for f in ARCHIVE_FIELDS}))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def restore_messages(path, batch_size: int = 1000) -> tuple:
+    """
+    Reinsere mensagens de um arquivo gerado por archive_messages(),
+    preservando os ids. Linhas cujo id já existe são ignoradas.
+    Retorna (inseridas, ignoradas).
+    """
+    inserted = skipped = 0
+    for batch in _read_batches(path, batch_size):
+        if is_partitioned():
+            ensure_partitions(start=min(m.created_at for m in batch), months_ahead=0)
+        existing = set(
+            ContactMessage.objects.filter(pk__in=[m.id for m in batch])
+            .values_list("id", flat=True)
+        )
+        new = [m for m in batch if m.id not in existing]
+        with transaction.atomic():
+            ContactMessage.objects.bulk_create(new)
+            inbox.adjust_counters(
+                total=len(new), unread=sum(1 for m in new if not m.is_read)
+            )
+            rollups.adjust(rollups.message_deltas(new))
+        inserted += len(new)
+        skipped += len(batch) - len(new)
+    return inserted, skipped
+
+
+def counts_by_read_state(cutoff: datetime) -> dict:
+    return ContactMessage.objects.filter(created_at__lt=cutoff).aggregate(
+        total=Count("id"), unread=Count("id", filter=Q(is_read=False))
+    )
@@ -0,0 +1,227 @@
+# core/rollups.py
+"""
+Contagem diária de ContactMessage para as séries de estatística
+(/api/internal/contact-stats/).
+
+contact_daily_count tem uma linha por (dia, lida?) com o número de
+mensagens, ajustada na mesma transação de cada alteração feita pelos
+caminhos de core.inbox: inserção (post_save, journal, restauração),
+marcar como lida / não lida e exclusão. Uma série de N dias lê no máximo
+2N linhas, qualquer que seja o tamanho de contact_message.
+
+O dia é a data de created_at no fuso atual (TIME_ZONE), como no
+TruncDate do banco.
+
+Quem alterar contact_message por fora desses caminhos (SQL direto,
+QuerySet.update) deve rodar reconcile() depois, ou o comando
+backfill_contact_rollups.
+"""
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ContactDailyCount, ContactMessage
+
+DAY = "day"
+WEEK = "week"
+BUCKETS = (DAY, WEEK)
+
+
+def day_of(created_at: datetime) -> date:
+    return timezone.localdate(created_at)
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def day_start(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+# ---------- Deltas: {(dia, lida?): quantidade} ----------
+
+def message_deltas(messages, sign: int = 1) -> Counter:
+    """
+    Deltas de mensagens já carregadas (ex.: antes de um bulk_create).
+    """
+    deltas = Counter()
+    for message in messages:
+        deltas[(day_of(message.created_at), message.is_read)] += sign
+    return deltas
+
+
+def queryset_deltas(queryset, sign: int = 1) -> dict:
+    """
+    Deltas agrupados no banco, sem carregar as linhas.
+    """
+    rows = (
+        queryset.order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "is_read")
+        .annotate(n=Count("id"))
+    )
+    return {(row["day"], row["is_read"]): sign * row["n"] for row in rows}
+
+
+def read_state_deltas(queryset, is_read: bool) -> dict:
+    """
+    Deltas de passar para `is_read` as mensagens do queryset que estão no
+    outro estado. Calcular antes do UPDATE.
+    """
+    deltas = {}
+    for (day, _), n in queryset_deltas(queryset.filter(is_read=not is_read)).items():
+        deltas[(day, not is_read)] = -n
+        deltas[(day, is_read)] = n
+    return deltas
+
+
+def adjust(deltas) -> None:
+    """
+    Soma os deltas nas linhas, criando as que faltam. Chamar dentro da
+    transação que altera contact_message.
+    """
+    # Ordem fixa: duas transações nunca travam as mesmas linhas em ordens opostas.
+    for (day, is_read), n in sorted(deltas.items()):
+        if not n:
+            continue
+        rows = ContactDailyCount.objects.filter(day=day, is_read=is_read)
+        if rows.update(count=F("count") + n):
+            continue
+        try:
+            with transaction.atomic():
+                ContactDailyCount.objects.create(day=day, is_read=is_read, count=n)
+        except IntegrityError:
+            # Outra transação criou a linha entre o UPDATE e o INSERT.
+            rows.update(count=F("count") + n)
+
+
+# ---------- Séries ----------
+
+def bucket_range(start: date, end: date, bucket: str = DAY) -> tuple:
+    """
+    Intervalo estendido até semanas completas (segunda a domingo) no
+    agrupamento semanal.
+    """
+    if bucket == WEEK:
+        return week_start(start), week_start(end) + timedelta(days=6)
+    return start, end
+
+
+def series(start: date, end: date, bucket: str = DAY) -> list:
+    """
+    [{"period", "total", "unread", "read"}] de `start` a `end` (inclusive),
+    um item por dia ou por semana (ver bucket_range), com zeros onde não
+    houve mensagens. Lê só contact_daily_count.
+    """
+    start, end = bucket_range(start, end, bucket)
+    step = timedelta(days=7 if bucket == WEEK else 1)
+
+    periods = {}
+    period = start
+    while period <= end:
+        periods[period] = {"unread": 0, "read": 0}
+        period += step
+
+    rows = ContactDailyCount.objects.filter(day__range=(start, end)).values_list(
+        "day", "is_read", "count"
+    )
+    for day, is_read, count in rows:
+        period = week_start(day) if bucket == WEEK else day
+        periods[period]["read" if is_read else "unread"] += count
+
+    return [
+        {
+            "period": period.isoformat(),
+            "total": counts["unread"] + counts["read"],
+            "unread": counts["unread"],
+            "read": counts["read"],
+        }
+        for period, counts in periods.items()
+    ]
+
+
+# ---------- Reconciliação ----------
+
+def recount(start: date | None = None, end: date | None = None) -> dict:
+    """
+    Contagem direto de contact_message (GROUP BY no intervalo de
+    created_at, coberto por contact_created_idx).
+    """
+    qs = ContactMessage.objects.all()
+    if start:
+        qs = qs.filter(created_at__gte=day_start(start))
+    if end:
+        qs = qs.filter(created_at__lt=day_start(end + timedelta(days=1)))
+    return queryset_deltas(qs)
+
+
+def reconcile(start: date | None = None, end: date | None = None, fix: bool = True) -> list:
+    """
+    Compara contact_daily_count com recount() no intervalo (padrão: tudo)
+    e, com fix=True, corrige as linhas divergentes. Retorna as divergências
+    [{"day", "is_read", "stored", "expected"}].
+    """
+    if fix:
+        first, last = day_range()
+        start = start or first
+        end = end or max(filter(None, (last, timezone.localdate())))
+    with transaction.atomic():
+        rows = ContactDailyCount.objects.all()
+        if start:
+            rows = rows.filter(day__gte=start)
+        if end:
+            rows = rows.filter(day__lte=end)
+        if fix and start and start <= end:
+            # Trava todas as linhas do intervalo antes de contar, criando com
+            # zero as que faltam: um incremento concorrente ou já está na
+            # contagem, ou espera e soma depois da correção. No SQLite o
+            # INSERT já toma a trava de escrita do banco até o commit.
+            ContactDailyCount.objects.bulk_create(
+                [
+                    ContactDailyCount(day=start + timedelta(days=i), is_read=is_read)
+                    for i in range((end - start).days + 1)
+                    for is_read in (False, True)
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
+            )
+            rows = rows.select_for_update()
+        stored = {(day, is_read): count for day, is_read, count in rows.values_list(
+            "day", "is_read", "count"
+        )}
+        expected = recount(start, end)
+
+        differences = []
+        for key in sorted(stored.keys() | expected.keys()):
+            have, want = stored.get(key, 0), expected.get(key, 0)
+            if have == want:
+                continue
+            day, is_read = key
+            differences.append(
+                {"day": day.isoformat(), "is_read": is_read, "stored": have, "expected": want}
+            )
+            if fix:
+                ContactDailyCount.objects.filter(day=day, is_read=is_read).update(count=want)
+        if fix:
+            # Linhas criadas acima (ou zeradas) que continuam sem mensagens.
+            rows.filter(count=0).delete()
+    return differences
+
+
+def day_range() -> tuple:
+    """
+    (primeiro, último) dia com mensagens ou contagens; (None, None) se não
+    houver nenhum.
+    """
+    messages = ContactMessage.objects.aggregate(first=Min("created_at"), last=Max("created_at"))
+    counts = ContactDailyCount.objects.aggregate(first=Min("day"), last=Max("day"))
+    days = [day_of(messages[k]) for k in ("first", "last") if messages[k]]
+    days += [counts[k] for k in ("first", "last") if counts[k]]
+    if not days:
+        return None, None
+    return min(days), max(days)
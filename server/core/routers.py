@@ -0,0 +1,168 @@
+# core/routers.py
+"""
+Roteamento primário / réplicas de leitura.
+
+- Escritas sempre no "default"; as de models do app core grudam o
+  cliente no primário por REPLICA_STICKY_SECONDS (ReplicaRoutingMiddleware).
+- Leituras de models do app core vão para uma réplica saudável apenas
+  dentro de requisições marcadas pelo ReplicaRoutingMiddleware (GET/HEAD
+  fora do admin e sem escrita recente do mesmo cliente). Fora de
+  requisições (shell, commands) tudo vai para o primário.
+- Réplica que falha ao conectar ou no meio de uma query sai da rotação
+  por REPLICA_RETRY_SECONDS; a requisição é refeita no primário.
+"""
+import contextvars
+import itertools
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    DatabaseError,
+    InterfaceError,
+    OperationalError,
+    connections,
+)
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+REPLICA_PREFIX = "replica_"
+
+
+@dataclass
+class RoutingState:
+    use_primary: bool = False
+    wrote: bool = False
+    replica_failed: bool = False
+
+
+_state = contextvars.ContextVar("core_db_routing", default=None)
+_down_until = {}
+_round_robin = itertools.count()
+
+
+def replica_aliases() -> list:
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+def begin_request(use_primary: bool):
+    return _state.set(RoutingState(use_primary=use_primary))
+
+
+def end_request(token) -> RoutingState:
+    state = _state.get()
+    _state.reset(token)
+    return state
+
+
+def current_state():
+    return _state.get()
+
+
+@contextmanager
+def reading_from_primary():
+    """
+    Força leituras no primário dentro do bloco. Usado ao montar dados que
+    vão para o cache, para não congelar o atraso de uma réplica.
+    """
+    state = _state.get()
+    if state is None or state.use_primary:
+        yield
+        return
+    state.use_primary = True
+    try:
+        yield
+    finally:
+        state.use_primary = False
+
+
+def mark_down(alias: str) -> None:
+    _down_until[alias] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+    state = _state.get()
+    if state is not None:
+        state.replica_failed = True
+
+
+def is_up(alias: str) -> bool:
+    until = _down_until.get(alias)
+    if until is None:
+        return True
+    if time.monotonic() >= until:
+        # Volta à rotação; a próxima conexão confirma se está viva.
+        _down_until.pop(alias, None)
+        return True
+    return False
+
+
+def _connect(alias: str) -> bool:
+    conn = connections[alias]
+    if conn.connection is not None:
+        return True
+    try:
+        conn.ensure_connection()
+    except DatabaseError:
+        mark_down(alias)
+        return False
+    return True
+
+
+def choose_replica():
+    aliases = replica_aliases()
+    if not aliases:
+        return None
+    start = next(_round_robin)
+    for offset in range(len(aliases)):
+        alias = aliases[(start + offset) % len(aliases)]
+        if is_up(alias) and _connect(alias):
+            return alias
+    return None
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.use_primary or state.wrote:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label != "core":
+            return DEFAULT_DB_ALIAS
+        return choose_replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Só escritas em dados do app marcam a requisição: as do cache em
+        # banco (django_cache), da sessão etc. não afetam o que as réplicas
+        # servem, e o cookie resultante tiraria a resposta do cache de borda.
+        state = _state.get()
+        if state is not None and model._meta.app_label == "core":
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Todos os bancos têm os mesmos dados (réplicas do primário).
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+def _replica_execute_wrapper(alias):
+    def wrapper(execute, sql, params, many, context):
+        try:
+            return execute(sql, params, many, context)
+        except (OperationalError, InterfaceError):
+            # Conexão caiu (ou réplica sem o schema): sai da rotação.
+            mark_down(alias)
+            raise
+
+    return wrapper
+
+
+@receiver(connection_created, dispatch_uid="core-replica-execute-wrapper")
+def install_replica_wrapper(sender, connection, **kwargs):
+    if not connection.alias.startswith(REPLICA_PREFIX):
+        return
+    if getattr(connection, "_core_replica_wrapper", False):
+        return
+    connection.execute_wrappers.append(_replica_execute_wrapper(connection.alias))
+    connection._core_replica_wrapper = True
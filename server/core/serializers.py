@@ -6,21 +6,27 @@ from .models import (
     Experience,
     Certification,
     Project,
+    ProjectImage,
     ContactMessage,
     Education,
     Service,
     Language,
     SectionConfig,
+    LinkHealth,
+    RepositoryMetadata,
 )
+from .locales import translated
+from .repometa import parse_repo
+from .thumbnails import variant_url
 
 
 def user_profile_to_dict(profile: UserProfile) -> Dict:
     return {
         "id": profile.id,
         "full_name": profile.full_name,
-        "job_title": profile.job_title,
-        "short_bio": profile.short_bio,
-        "location": profile.location,
+        "job_title": translated(profile, "job_title"),
+        "short_bio": translated(profile, "short_bio"),
+        "location": translated(profile, "location"),
         "email": profile.email,
         "phone": profile.phone,
         "github_url": profile.github_url,
@@ -34,7 +40,7 @@ def skill_to_dict(skill: Skill) -> Dict:
         "id": skill.id,
         "name": skill.name,
         "category": skill.category,
-        "level": skill.level,
+        "level": translated(skill, "level"),
         "icon_key": skill.icon_key,
         "order_index": skill.order_index,
     }
@@ -44,12 +50,12 @@ def experience_to_dict(exp: Experience) -> Dict:
     return {
         "id": exp.id,
         "company_name": exp.company_name,
-        "role": exp.role,
-        "location": exp.location,
+        "role": translated(exp, "role"),
+        "location": translated(exp, "location"),
         "start_date": exp.start_date.isoformat(),
         "end_date": exp.end_date.isoformat() if exp.end_date else None,
         "is_current": exp.is_current,
-        "description": exp.description,
+        "description": translated(exp, "description"),
         "order_index": exp.order_index,
     }
 
@@ -57,7 +63,7 @@ def experience_to_dict(exp: Experience) -> Dict:
 def certification_to_dict(cert: Certification) -> Dict:
     return {
         "id": cert.id,
-        "name": cert.name,
+        "name": translated(cert, "name"),
         "institution": cert.institution,
         "issue_date": cert.issue_date.isoformat(),
         "expiration_date": cert.expiration_date.isoformat()
@@ -72,28 +78,71 @@ def certification_to_dict(cert: Certification) -> Dict:
 def project_to_dict(project: Project) -> Dict:
     return {
         "id": project.id,
-        "title": project.title,
+        "title": translated(project, "title"),
         "slug": project.slug,
-        "short_description": project.short_description,
-        "long_description": project.long_description,
+        "short_description": translated(project, "short_description"),
+        "long_description": translated(project, "long_description"),
         "repo_url": project.repo_url,
         "demo_url": project.demo_url,
         "highlight": project.highlight,
+        "images": [project_image_to_dict(i) for i in project.images.all()],
+        "repository": project_repository(project),
         "created_at": project.created_at.isoformat() if project.created_at else None,
         "updated_at": project.updated_at.isoformat() if project.updated_at else None,
     }
 
 
+def repository_metadata_to_dict(meta: RepositoryMetadata) -> Dict:
+    return {
+        "full_name": meta.full_name,
+        "description": meta.description,
+        "url": meta.html_url,
+        "stars": meta.stars,
+        "forks": meta.forks,
+        "language": meta.language or None,
+        # Ordenadas pela quantidade de código (bytes) no repositório.
+        "languages": sorted(meta.languages, key=meta.languages.get, reverse=True),
+        "pushed_at": meta.pushed_at.isoformat() if meta.pushed_at else None,
+    }
+
+
+def project_repository(project: Project):
+    # Sem consulta extra quando a queryset usa select_related("repo_metadata").
+    meta = getattr(project, "repo_metadata", None)
+    if meta is None or not meta.found or meta.full_name != parse_repo(project.repo_url):
+        return None
+    return repository_metadata_to_dict(meta)
+
+
+def project_image_to_dict(image: ProjectImage) -> Dict:
+    return {
+        "id": image.id,
+        "url": image.image.url if image.image else None,
+        "alt_text": translated(image, "alt_text"),
+        "width": image.width,
+        "height": image.height,
+        "variants": [
+            {
+                "url": variant_url(v["name"]),
+                "width": v["width"],
+                "height": v["height"],
+                "format": v["format"],
+            }
+            for v in image.variants
+        ],
+    }
+
+
 def education_to_dict(edu: Education) -> Dict:
     return {
         "id": edu.id,
         "institution": edu.institution,
-        "degree": edu.degree,
-        "field_of_study": edu.field_of_study,
+        "degree": translated(edu, "degree"),
+        "field_of_study": translated(edu, "field_of_study"),
         "start_date": edu.start_date.isoformat(),
         "end_date": edu.end_date.isoformat() if edu.end_date else None,
         "is_current": edu.is_current,
-        "description": edu.description,
+        "description": translated(edu, "description"),
         "order_index": edu.order_index,
     }
 
@@ -101,9 +150,9 @@ def education_to_dict(edu: Education) -> Dict:
 def service_to_dict(svc: Service) -> Dict:
     return {
         "id": svc.id,
-        "title": svc.title,
-        "short_description": svc.short_description,
-        "detailed_description": svc.detailed_description,
+        "title": translated(svc, "title"),
+        "short_description": translated(svc, "short_description"),
+        "detailed_description": translated(svc, "detailed_description"),
         "icon_key": svc.icon_key,
         "highlight": svc.highlight,
         "order_index": svc.order_index,
@@ -113,8 +162,8 @@ def service_to_dict(svc: Service) -> Dict:
 def language_to_dict(lang: Language) -> Dict:
     return {
         "id": lang.id,
-        "name": lang.name,
-        "level": lang.level,
+        "name": translated(lang, "name"),
+        "level": translated(lang, "level"),
         "order_index": lang.order_index,
     }
 
@@ -138,3 +187,16 @@ def contact_message_to_dict(msg: ContactMessage) -> Dict:
         "created_at": msg.created_at.isoformat() if msg.created_at else None,
         "is_read": msg.is_read,
     }
+
+
+def link_health_to_dict(link: LinkHealth) -> Dict:
+    return {
+        "url": link.url,
+        "status": link.status,
+        "status_code": link.status_code,
+        "final_url": link.final_url or None,
+        "error": link.error or None,
+        "response_ms": link.response_ms,
+        "consecutive_failures": link.consecutive_failures,
+        "checked_at": link.checked_at.isoformat(),
+    }
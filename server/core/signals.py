@@ -0,0 +1,171 @@
+# core/signals.py
+"""
+Receivers que mantêm as versões de conteúdo (core.cache) em dia.
+
+Só os models exibidos no portfólio entram aqui; ContactMessage é privado e
+não faz parte de nenhum payload público (para ele, só os contadores da
+caixa de entrada são mantidos).
+Atualizações em massa (QuerySet.update / bulk_*) não disparam sinais: quem
+usá-las deve chamar bump_versions() explicitamente.
+"""
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .cache import bump_versions, versions_bumped
+from .edgecache import purge_scopes
+from . import rollups
+from .inbox import adjust_counters
+from .suggest import SOURCES as SUGGEST_SOURCES, document_deleted, document_saved
+from .thumbnails import schedule_variants
+from .models import (
+    ContactMessage,
+    UserProfile,
+    Skill,
+    Experience,
+    Certification,
+    Project,
+    ProjectImage,
+    Education,
+    Service,
+    Language,
+    SectionConfig,
+)
+
+# model -> chave do bloco correspondente no payload de /api/portfolio/
+SECTION_BY_MODEL = {
+    UserProfile: "profile",
+    SectionConfig: "sections",
+    Skill: "skills",
+    Experience: "experiences",
+    Certification: "certifications",
+    Education: "education",
+    Service: "services",
+    Language: "languages",
+    Project: "projects",
+    ProjectImage: "projects",
+}
+
+
+def _compared_fields(model) -> list:
+    # updated_at (auto_now) muda em todo save e não indica mudança de conteúdo.
+    return [
+        f.attname
+        for f in model._meta.concrete_fields
+        if f.name != "translations" and not getattr(f, "auto_now", False)
+    ]
+
+
+def content_before_save(sender, instance, raw=False, **kwargs):
+    # Estado anterior, para o post_save saber se só as traduções mudaram.
+    instance._previous_content = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous_content = (
+        sender._base_manager.filter(pk=instance.pk)
+        .values("translations", *_compared_fields(sender))
+        .first()
+    )
+
+
+def changed_locales(sender, instance):
+    """
+    Idiomas cujas traduções mudaram, ou None se mudou algo que aparece em
+    todos os idiomas (ou se o estado anterior é desconhecido).
+    """
+    previous = getattr(instance, "_previous_content", None)
+    if previous is None:
+        return None
+    for name in _compared_fields(sender):
+        if getattr(instance, name) != previous[name]:
+            return None
+    old, new = previous["translations"] or {}, instance.translations or {}
+    return {locale for locale in old.keys() | new.keys() if old.get(locale) != new.get(locale)}
+
+
+def content_saved(sender, instance, **kwargs):
+    section = SECTION_BY_MODEL[sender]
+    locales = changed_locales(sender, instance)
+    # Só publica a nova versão depois do commit, para que quem revalidar
+    # já enxergue os dados novos.
+    if locales is None:
+        transaction.on_commit(lambda: bump_versions(section))
+        return
+    for locale in locales:
+        # Só traduções mudaram: os payloads dos outros idiomas continuam válidos.
+        transaction.on_commit(lambda locale=locale: bump_versions(section, locale=locale))
+
+
+def content_deleted(sender, **kwargs):
+    section = SECTION_BY_MODEL[sender]
+    transaction.on_commit(lambda: bump_versions(section))
+
+
+for _model in SECTION_BY_MODEL:
+    if any(f.name == "translations" for f in _model._meta.fields):
+        pre_save.connect(
+            content_before_save,
+            sender=_model,
+            dispatch_uid=f"core-content-before-save-{_model.__name__}",
+        )
+    post_save.connect(
+        content_saved, sender=_model, dispatch_uid=f"core-content-save-{_model.__name__}"
+    )
+    post_delete.connect(
+        content_deleted, sender=_model, dispatch_uid=f"core-content-delete-{_model.__name__}"
+    )
+
+
+def contact_message_created(sender, instance, created, **kwargs):
+    # Sem receiver de post_delete de propósito: ele impediria o "fast delete"
+    # do Django. Exclusões passam por core.inbox.delete_messages().
+    # Quem cria a mensagem deve fazê-lo dentro de transaction.atomic(): em
+    # autocommit o INSERT e os ajustes seriam transações separadas.
+    if created:
+        adjust_counters(total=1, unread=0 if instance.is_read else 1)
+        rollups.adjust(rollups.message_deltas([instance]))
+
+
+post_save.connect(
+    contact_message_created, sender=ContactMessage, dispatch_uid="core-inbox-created"
+)
+
+
+def project_image_saved(sender, instance, **kwargs):
+    # As variantes são geradas fora do request; schedule_variants() não faz
+    # nada se as existentes já estão atualizadas.
+    schedule_variants(instance)
+
+
+post_save.connect(
+    project_image_saved, sender=ProjectImage, dispatch_uid="core-project-image-variants"
+)
+
+
+def suggest_document_saved(sender, instance, **kwargs):
+    # O índice de sugestões deste processo (core.suggest) muda na hora; os
+    # outros workers veem a versão nova.
+    transaction.on_commit(lambda: document_saved(sender, instance))
+
+
+def suggest_document_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: document_deleted(sender, pk))
+
+
+for _model in SUGGEST_SOURCES:
+    post_save.connect(
+        suggest_document_saved, sender=_model, dispatch_uid=f"core-suggest-save-{_model.__name__}"
+    )
+    post_delete.connect(
+        suggest_document_deleted,
+        sender=_model,
+        dispatch_uid=f"core-suggest-delete-{_model.__name__}",
+    )
+
+
+def content_versions_bumped(sender, scopes, **kwargs):
+    # Versão nova = respostas com essas chaves na borda estão velhas.
+    purge_scopes(scopes)
+
+
+versions_bumped.connect(content_versions_bumped, dispatch_uid="core-edge-purge")
@@ -0,0 +1,82 @@
+# core/singleflight.py
+"""
+Single-flight sobre o cache do Django: quando falta uma chave, só um
+chamador (entre threads e entre processos) monta o valor; os outros
+esperam ele aparecer no cache ou, se houver, recebem o valor anterior
+(stale-while-revalidate).
+
+A trava é uma chave no próprio cache criada com cache.add, atômico nos
+backends compartilhados (redis, memcached, banco) e no locmem; o
+FileBasedCache não garante. Ela expira em SINGLE_FLIGHT_LOCK_TIMEOUT,
+para que um processo que morra montando não a prenda. Quem espera só lê
+o cache (valor e trava, a cada SINGLE_FLIGHT_POLL segundos); passados
+SINGLE_FLIGHT_WAIT segundos sem valor, monta por conta própria.
+"""
+import logging
+import time
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY_PREFIX = "core:flight:"
+
+# value: o valor; stale: True se é o anterior, entregue enquanto outro monta.
+Flight = namedtuple("Flight", "value stale")
+
+
+def _build_and_set(key, build, timeout):
+    value = build()
+    cache.set(key, value, timeout)
+    return value
+
+
+def single_flight(key: str, build, timeout, stale=None) -> Flight:
+    """
+    Valor de `key` no cache ou, se faltar, montado por build() e gravado
+    por `timeout` segundos. stale(), se informado, devolve um valor
+    anterior (ou None) para quem encontra outro chamador montando.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return Flight(value, False)
+
+    lock_key = f"{LOCK_KEY_PREFIX}{key}"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT
+    while True:
+        if cache.add(lock_key, token, settings.SINGLE_FLIGHT_LOCK_TIMEOUT):
+            try:
+                # Pode ter sido gravado entre a leitura e a trava.
+                value = cache.get(key)
+                if value is None:
+                    value = _build_and_set(key, build, timeout)
+                return Flight(value, False)
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        if stale is not None:
+            value = stale()
+            if value is not None:
+                return Flight(value, True)
+            stale = None  # sem valor anterior agora, também não haverá depois
+
+        # Só leituras enquanto a trava existir; sem ela (quem montava falhou
+        # ou morreu), tenta travar de novo.
+        while True:
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    "%s não ficou pronto em %s s; montando sem a trava.",
+                    key, settings.SINGLE_FLIGHT_WAIT,
+                )
+                return Flight(_build_and_set(key, build, timeout), False)
+            time.sleep(settings.SINGLE_FLIGHT_POLL)
+            found = cache.get_many([key, lock_key])
+            if key in found:
+                return Flight(found[key], False)
+            if lock_key not in found:
+                break
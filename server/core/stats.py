@@ -0,0 +1,106 @@
+# core/stats.py
+"""
+Estatísticas do portfólio para /api/stats/.
+
+Contagens saem de agregações no banco; o tempo de experiência e de estudo
+é a união dos períodos (sobreposições contam uma vez só). O resultado é
+cacheado em core.payloads pela versão dos blocos usados e pela data.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Certification, Education, Experience, Skill
+
+DAYS_PER_YEAR = 365.25
+DAYS_PER_MONTH = DAYS_PER_YEAR / 12
+
+# Blocos de core.cache dos quais as estatísticas dependem.
+STATS_SCOPES = ("experiences", "education", "skills", "certifications")
+
+
+def merge_intervals(intervals) -> list:
+    """
+    União de períodos fechados [início, fim] em dias. Períodos que se
+    sobrepõem ou são contíguos (um termina na véspera do outro) viram um só.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def _duration(rows, today) -> dict:
+    intervals = []
+    for start, end, is_current in rows:
+        end = today if is_current or end is None else end
+        if start <= end:
+            intervals.append((start, end))
+    merged = merge_intervals(intervals)
+    days = sum((end - start).days + 1 for start, end in merged)
+    return {
+        "days": days,
+        "months": round(days / DAYS_PER_MONTH),
+        "years": round(days / DAYS_PER_YEAR, 1),
+        "periods": len(merged),
+        "since": merged[0][0].isoformat() if merged else None,
+    }
+
+
+def build_stats(today=None) -> dict:
+    today = today or timezone.localdate()
+
+    experience = Experience.objects.aggregate(
+        total=Count("id"),
+        current=Count("id", filter=Q(is_current=True)),
+        companies=Count("company_name", distinct=True),
+    )
+    experience_rows = Experience.objects.values_list("start_date", "end_date", "is_current")
+
+    education = Education.objects.aggregate(
+        total=Count("id"),
+        current=Count("id", filter=Q(is_current=True)),
+    )
+    education_rows = Education.objects.values_list("start_date", "end_date", "is_current")
+
+    skills = dict.fromkeys((key for key, _label in Skill.CATEGORY_CHOICES), 0)
+    for row in Skill.objects.order_by().values("category").annotate(count=Count("id")):
+        skills[row["category"]] = row["count"]
+
+    certifications = Certification.objects.aggregate(
+        total=Count("id"),
+        valid=Count("id", filter=Q(expiration_date__isnull=True) | Q(expiration_date__gte=today)),
+        no_expiration=Count("id", filter=Q(expiration_date__isnull=True)),
+    )
+
+    return {
+        "as_of": today.isoformat(),
+        "experience": {
+            **_duration(experience_rows, today),
+            "roles": experience["total"],
+            "current_roles": experience["current"],
+            "past_roles": experience["total"] - experience["current"],
+            "companies": experience["companies"],
+        },
+        "education": {
+            **_duration(education_rows, today),
+            "total": education["total"],
+            "in_progress": education["current"],
+            "completed": education["total"] - education["current"],
+        },
+        "skills": {
+            "total": sum(skills.values()),
+            "by_category": skills,
+        },
+        "certifications": {
+            "total": certifications["total"],
+            "valid": certifications["valid"],
+            "expired": certifications["total"] - certifications["valid"],
+            "no_expiration": certifications["no_expiration"],
+        },
+    }
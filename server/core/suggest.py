@@ -0,0 +1,294 @@
+# core/suggest.py
+"""
+Sugestões para a busca (/api/suggest/?prefix=): nomes de habilidades,
+títulos de projetos (também os traduzidos) e empresas das experiências.
+
+O índice fica em memória no processo: uma lista ordenada de
+(chave normalizada, item), consultada com bisect. Cada texto entra com
+uma chave por início de palavra ("sistema de notas" -> "sistema de
+notas", "de notas", "notas"), então o prefixo casa com qualquer palavra.
+A normalização tira acentos e caixa ("Informação" ~ "informacao").
+
+- montado no warm-up do worker (ou no primeiro uso);
+- atualizado na hora, item a item, pelos sinais dos models neste
+  processo (core.signals), depois do commit;
+- as alterações feitas em outros workers (ou por SQL direto) aparecem
+  pelas versões de conteúdo (core.cache): conferidas no máximo a cada
+  SUGGEST_CHECK_INTERVAL segundos e, se mudaram, o índice é remontado
+  numa thread, servindo o atual enquanto isso.
+
+Consultas não travam: as escritas (sinais) trocam elementos da lista
+sob um lock, e uma leitura concorrente no máximo perde ou repete um item.
+"""
+import logging
+import os
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .cache import get_versions, locale_scope
+from .locales import supported_locales
+from .models import Experience, Project, Skill
+
+logger = logging.getLogger(__name__)
+
+SKILL = "skill"
+PROJECT = "project"
+COMPANY = "company"
+
+# Blocos de conteúdo (core.cache) cujas versões valem para o índice.
+SUGGEST_SCOPES = ("skills", "projects", "experiences")
+
+# label: texto original; labels: {idioma: texto}; extra: campos da resposta.
+Suggestion = namedtuple("Suggestion", "kind label labels extra")
+
+
+def fold(text: str) -> str:
+    """
+    Forma de comparação: sem acentos, sem caixa, espaços simples.
+    """
+    if not text.isascii():
+        text = "".join(
+            c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)
+        )
+    return " ".join(text.casefold().split())
+
+
+def _word_keys(text: str) -> set:
+    words = fold(text).split()
+    return {" ".join(words[i:]) for i in range(len(words))}
+
+
+# ---------- Documentos (linhas dos models) -> itens ----------
+# Uma empresa com várias experiências é um item só, mantido enquanto
+# alguma experiência a citar.
+
+def _skill_items(pk, name):
+    return [((SKILL, pk), Suggestion(SKILL, name, {}, {"id": pk}))]
+
+
+def _project_items(pk, title, slug, translations):
+    labels = {
+        locale: values["title"]
+        for locale, values in (translations or {}).items()
+        if isinstance(values, dict) and values.get("title")
+    }
+    return [((PROJECT, pk), Suggestion(PROJECT, title, labels, {"slug": slug}))]
+
+
+def _company_items(pk, company_name):
+    name = " ".join(company_name.split())
+    if not name:
+        return []
+    return [((COMPANY, fold(name)), Suggestion(COMPANY, name, {}, {}))]
+
+
+# model -> (campos lidos do banco, função campos -> itens)
+SOURCES = {
+    Skill: (("pk", "name"), _skill_items),
+    Project: (("pk", "title", "slug", "translations"), _project_items),
+    Experience: (("pk", "company_name"), _company_items),
+}
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._keys = []        # [(chave, item)] ordenada
+        self._items = {}       # item -> Suggestion
+        self._owners = {}      # item -> {documento}
+        self._documents = {}   # documento (model, pk) -> [item]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @classmethod
+    def build(cls) -> "SuggestIndex":
+        """
+        Índice com todos os documentos do banco (uma consulta por model),
+        ordenado de uma vez.
+        """
+        index = cls()
+        keys = []
+        for model, (fields, to_items) in SOURCES.items():
+            for row in model.objects.values_list(*fields):
+                document = (model, row[0])
+                index._documents[document] = []
+                for item, suggestion in to_items(*row):
+                    index._documents[document].append(item)
+                    owners = index._owners.setdefault(item, set())
+                    if not owners:
+                        index._items[item] = suggestion
+                        keys.extend((key, item) for key in _suggestion_keys(suggestion))
+                    owners.add(document)
+        keys.sort()
+        index._keys = keys
+        return index
+
+    # ---------- atualização incremental ----------
+
+    def update(self, model, instance) -> None:
+        fields, to_items = SOURCES[model]
+        values = [instance.pk if f == "pk" else getattr(instance, f) for f in fields]
+        with self._lock:
+            self._remove_document((model, instance.pk))
+            document = (model, instance.pk)
+            self._documents[document] = []
+            for item, suggestion in to_items(*values):
+                self._documents[document].append(item)
+                owners = self._owners.setdefault(item, set())
+                if not owners:
+                    self._add_item(item, suggestion)
+                owners.add(document)
+
+    def remove(self, model, pk) -> None:
+        with self._lock:
+            self._remove_document((model, pk))
+
+    def _remove_document(self, document) -> None:
+        for item in self._documents.pop(document, ()):
+            owners = self._owners.get(item)
+            owners.discard(document)
+            if not owners:
+                del self._owners[item]
+                self._remove_item(item)
+
+    def _add_item(self, item, suggestion) -> None:
+        self._items[item] = suggestion
+        for key in _suggestion_keys(suggestion):
+            insort(self._keys, (key, item))
+
+    def _remove_item(self, item) -> None:
+        suggestion = self._items.pop(item)
+        for key in _suggestion_keys(suggestion):
+            position = bisect_left(self._keys, (key, item))
+            if position < len(self._keys) and self._keys[position] == (key, item):
+                del self._keys[position]
+
+    # ---------- consulta ----------
+
+    def search(self, prefix: str, chain, limit: int) -> list:
+        """
+        Até `limit` itens com alguma palavra começando por `prefix`, em
+        ordem alfabética da palavra casada; rótulos no idioma de `chain`.
+        """
+        prefix = fold(prefix)
+        keys = self._keys
+        position = bisect_left(keys, (prefix,))
+        seen = set()
+        results = []
+        while position < len(keys) and len(results) < limit:
+            key, item = keys[position]
+            if not key.startswith(prefix):
+                break
+            position += 1
+            if item in seen:
+                continue
+            seen.add(item)
+            suggestion = self._items.get(item)
+            if suggestion is not None:
+                results.append(_to_dict(suggestion, chain))
+        return results
+
+
+def _suggestion_keys(suggestion) -> set:
+    keys = _word_keys(suggestion.label)
+    for label in suggestion.labels.values():
+        keys |= _word_keys(label)
+    return keys
+
+
+def _to_dict(suggestion, chain) -> dict:
+    label = next(
+        (suggestion.labels[locale] for locale in chain if locale in suggestion.labels),
+        suggestion.label,
+    )
+    return {"type": suggestion.kind, "label": label, **suggestion.extra}
+
+
+# ---------- índice do processo ----------
+
+_index = None
+_index_lock = threading.Lock()
+# Versões usadas na última montagem, quando foram conferidas e o pid da
+# thread de remontagem em curso (None: nenhuma).
+_versions = None
+_checked_at = 0.0
+_rebuilding = None
+
+
+def _scopes() -> list:
+    return [
+        scope
+        for section in SUGGEST_SCOPES
+        for scope in (section, *(locale_scope(section, l) for l in supported_locales()))
+    ]
+
+
+def _rebuild() -> None:
+    global _index, _versions
+    versions = get_versions(_scopes())
+    index = SuggestIndex.build()
+    _index, _versions = index, versions
+
+
+def get_index() -> SuggestIndex:
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _rebuild()
+    return _index
+
+
+def _rebuild_in_background() -> None:
+    global _rebuilding
+    try:
+        close_old_connections()
+        _rebuild()
+    except Exception:
+        logger.exception("Falha ao remontar o índice de sugestões.")
+    finally:
+        close_old_connections()
+        _rebuilding = None
+
+
+def _check_versions() -> None:
+    """
+    Remonta o índice em segundo plano se as versões mudaram desde a última
+    montagem (conferidas no máximo a cada SUGGEST_CHECK_INTERVAL segundos).
+    """
+    global _checked_at, _rebuilding
+    now = time.monotonic()
+    if now - _checked_at < settings.SUGGEST_CHECK_INTERVAL:
+        return
+    _checked_at = now
+    if _rebuilding == os.getpid() or get_versions(_scopes()) == _versions:
+        return
+    with _index_lock:
+        if _rebuilding != os.getpid():
+            _rebuilding = os.getpid()
+            threading.Thread(
+                target=_rebuild_in_background, name="suggest-rebuild", daemon=True
+            ).start()
+
+
+def suggestions(prefix: str, chain, limit: int) -> list:
+    index = get_index()
+    _check_versions()
+    return index.search(prefix, chain, limit)
+
+
+def document_saved(model, instance) -> None:
+    # Só mantém um índice que já existe; quem não o usa não paga a montagem.
+    if _index is not None:
+        _index.update(model, instance)
+
+
+def document_deleted(model, pk) -> None:
+    if _index is not None:
+        _index.remove(model, pk)
@@ -1,3 +1,1623 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import marshal
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.http import JsonResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from core import (
+    edgecache,
+    events,
+    health,
+    inbox,
+    journal,
+    linkcheck,
+    locales,
+    ordering,
+    payloads,
+    payloadstore,
+    profiling,
+    repometa,
+    retention,
+    rollups,
+    routers,
+    stats,
+    suggest,
+    warmup,
+)
+from core.cache import bump_versions
+from core.checks import shared_cache_check
+from core.middleware import STICKY_COOKIE, ReplicaRoutingMiddleware
+from core.models import (
+    ContactDailyCount,
+    ContactMessage,
+    Experience,
+    LinkHealth,
+    Project,
+    SectionConfig,
+    RepositoryMetadata,
+    Skill,
+)
+from core.notifications import contact_email
+from core.singleflight import LOCK_KEY_PREFIX, single_flight
+from core.spamfilter import (
+    ACCEPT,
+    DUPLICATE,
+    SPAM,
+    ContactPrefilter,
+    RotatingBloomFilter,
+    fingerprint,
+)
+from core.validators import clean_contact_payload
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ContactJournalReplayTests(TestCase):
+    """
+    Crash e replay do journal de contato (core.journal).
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _record(self, **overrides) -> dict:
+        return {
+            "journal_id": uuid.uuid4().hex,
+            "accepted_at": "2026-10-19T10:00:00+00:00",
+            "name": "Ana",
+            "email": "ana@example.com",
+            "subject": "Orçamento",
+            "message": "Olá!",
+            **overrides,
+        }
+
+    def _write_orphan(self, records, tail: bytes = b"") -> str:
+        # Segmento de um processo que morreu: arquivo sem flock.
+        name = f"{journal.SEGMENT_PREFIX}999-{uuid.uuid4().hex}{journal.SEGMENT_SUFFIX}"
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as fh:
+            for record in records:
+                fh.write(json.dumps(record).encode("utf-8") + b"\n")
+            fh.write(tail)
+        return path
+
+    def _journal_ids(self) -> set:
+        return {str(pk) for pk in ContactMessage.objects.values_list("journal_id", flat=True)}
+
+    def test_partial_last_line_is_discarded(self):
+        complete = self._record()
+        path = self._write_orphan([complete], tail=b'{"journal_id": "abc", "name": "Tru')
+
+        self.assertEqual(journal.read_segment(path), [complete])
+        self.assertEqual(journal.replay_orphans(self.directory, 100), 1)
+        self.assertEqual(self._journal_ids(), {str(uuid.UUID(complete["journal_id"]))})
+
+    def test_orphan_segment_is_replayed_and_removed(self):
+        records = [self._record() for _ in range(3)]
+        path = self._write_orphan(records)
+
+        self.assertEqual(journal.replay_orphans(self.directory, 2), 3)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self._journal_ids(), {str(uuid.UUID(r["journal_id"])) for r in records})
+        self.assertEqual(inbox.get_counters().unread_count, 3)
+
+    def test_locked_segment_is_left_alone(self):
+        segment = journal.Segment(self.directory)
+        self.addCleanup(segment.remove)
+        segment.write(json.dumps(self._record()).encode("utf-8") + b"\n")
+
+        self.assertEqual(journal.replay_orphans(self.directory, 100), 0)
+        self.assertTrue(os.path.exists(segment.path))
+        self.assertFalse(ContactMessage.objects.exists())
+
+    def test_replay_after_commit_skips_recorded_journal_ids(self):
+        # Crash entre o commit do lote e a remoção do segmento.
+        records = [self._record() for _ in range(3)]
+        journal.ingest(records[:2], 100)
+        self._write_orphan(records)
+
+        self.assertEqual(journal.replay_orphans(self.directory, 100), 1)
+        self.assertEqual(ContactMessage.objects.count(), 3)
+        self.assertEqual(inbox.get_counters().total_count, 3)
+
+    def test_invalid_segment_is_quarantined_without_blocking_others(self):
+        bad = self._write_orphan([{"journal_id": uuid.uuid4().hex, "name": "sem campos"}])
+        good = self._write_orphan([self._record()])
+
+        with self.assertLogs("core.journal", "ERROR"):
+            self.assertEqual(journal.replay_orphans(self.directory, 100), 1)
+        self.assertTrue(os.path.exists(bad + journal.QUARANTINE_SUFFIX))
+        self.assertFalse(os.path.exists(bad))
+        self.assertFalse(os.path.exists(good))
+
+    def test_only_rejected_records_are_quarantined(self):
+        good = [self._record() for _ in range(5)]
+        bad = [self._record(email=None), self._record(journal_id="não-é-uuid")]
+        path = self._write_orphan([good[0], bad[0], *good[1:4], bad[1], good[4]])
+
+        with self.assertLogs("core.journal", "ERROR") as logs:
+            self.assertEqual(journal.replay_orphans(self.directory, 100), 5)
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(self._journal_ids(), {str(uuid.UUID(r["journal_id"])) for r in good})
+        self.assertEqual(inbox.get_counters().total_count, 5)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(journal.read_segment(path + journal.QUARANTINE_SUFFIX), bad)
+
+    def test_close_flushes_pending_records(self):
+        contact = journal.ContactJournal(self.directory, flush_interval=60, batch_size=100)
+        contact.append(self._record())
+
+        contact.close()
+
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+class ContactRollupReconcileTests(TestCase):
+    """
+    Reconciliação da contagem diária (core.rollups.reconcile).
+    """
+
+    def setUp(self):
+        for is_read in (False, False, True):
+            ContactMessage.objects.create(
+                name="Ana", email="ana@example.com", subject="Oi", message="Olá!", is_read=is_read
+            )
+        self.today = timezone.localdate()
+
+    def _counts(self) -> dict:
+        return {
+            (day, is_read): count
+            for day, is_read, count in ContactDailyCount.objects.values_list("day", "is_read", "count")
+        }
+
+    def test_missing_and_wrong_rows_are_fixed(self):
+        ContactDailyCount.objects.filter(is_read=True).delete()
+        ContactDailyCount.objects.filter(is_read=False).update(count=7)
+
+        differences = rollups.reconcile(self.today - timedelta(days=10), self.today)
+
+        self.assertEqual(
+            [(d["is_read"], d["stored"], d["expected"]) for d in differences],
+            [(False, 7, 2), (True, 0, 1)],
+        )
+        # As linhas criadas para travar os dias sem mensagens não ficam.
+        self.assertEqual(self._counts(), {(self.today, False): 2, (self.today, True): 1})
+        self.assertEqual(rollups.reconcile(), [])
+
+    def test_dry_run_does_not_write(self):
+        ContactDailyCount.objects.all().delete()
+
+        self.assertEqual(len(rollups.reconcile(fix=False)), 2)
+        self.assertFalse(ContactDailyCount.objects.exists())
+
+
+@override_settings(CONTACT_INGEST_MODE="direct")
+class ContactCreateTests(TestCase):
+    """
+    POST /api/contact/ no modo direto.
+    """
+
+    payload = {
+        "name": "Ana",
+        "email": "ana@example.com",
+        "subject": "Orçamento",
+        "message": f"Mensagem {uuid.uuid4().hex}",
+    }
+
+    def _post(self):
+        return self.client.post("/api/contact/", self.payload, content_type="application/json")
+
+    def test_failed_adjustment_rolls_back_message(self):
+        with mock.patch.object(rollups, "adjust", side_effect=DatabaseError("fora do ar")):
+            self.assertEqual(self._post().status_code, 500)
+
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertEqual(inbox.get_counters().total_count, 0)
+
+        # O reenvio grava uma mensagem só, com contadores e contagem diária.
+        self.assertEqual(self._post().status_code, 201)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(inbox.get_counters().unread_count, 1)
+        self.assertEqual(rollups.reconcile(fix=False), [])
+
+
+class ContactValidationTests(SimpleTestCase):
+    """
+    E-mail do contato: validado como no EmailField e escapado no aviso HTML.
+    """
+
+    def _errors(self, email: str) -> dict:
+        payload = {"name": "Ana", "email": email, "subject": "Oi", "message": "Olá"}
+        return clean_contact_payload(payload)[1]
+
+    def test_email_is_checked_like_the_model_field(self):
+        self.assertEqual(self._errors("ana.souza+site@mail.example.com.br"), {})
+        for email in ("a<b>@example.com", "ana <ana@example.com>", "ana@example", "ana@@example.com"):
+            self.assertIn("email", self._errors(email), email)
+
+    def test_notification_html_escapes_the_submitted_fields(self):
+        # Parte local entre aspas é válida no RFC (e no EmailField); só o
+        # escape impede que vire HTML.
+        msg = contact_email("<b>Ana</b>", '"<i>"@example.com', "Oi & tchau", "<script>x</script>")
+        html = msg.alternatives[0][0]
+
+        self.assertNotIn("<script>", html)
+        self.assertIn("&lt;b&gt;Ana&lt;/b&gt;", html)
+        self.assertIn("Oi &amp; tchau", html)
+        self.assertIn('mailto:&quot;&lt;i&gt;&quot;@example.com', html)
+        self.assertIn("<script>x</script>", msg.body)  # texto puro fica como veio
+
+
+class ContactInboxAdminTests(TestCase):
+    """
+    Ações em lote da caixa de entrada do admin.
+    """
+
+    def setUp(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "senha")
+        self.client.force_login(user)
+        self.url = reverse("admin:core_contactmessage_inbox")
+        self.message = ContactMessage.objects.create(
+            name="Ana", email="ana@example.com", subject="Oi", message="Olá!"
+        )
+
+    def test_mark_read(self):
+        response = self.client.post(self.url, {"action": "mark_read", "ids": [self.message.pk]})
+
+        self.assertEqual(response.status_code, 302)
+        self.message.refresh_from_db()
+        self.assertTrue(self.message.is_read)
+
+    def test_invalid_ids_are_rejected(self):
+        response = self.client.post(self.url, {"action": "mark_read", "ids": [self.message.pk, "abc"]})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            [str(m) for m in get_messages(response.wsgi_request)], ["Seleção inválida."]
+        )
+        self.message.refresh_from_db()
+        self.assertFalse(self.message.is_read)
+
+
+class ContactRetentionTests(TestCase):
+    """
+    Arquivamento e restauração de contact_message (core.retention).
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.message = ContactMessage.objects.create(
+            name="Ana", email="ana@example.com", subject="Oi", message="Olá!",
+            journal_id=uuid.uuid4(),
+        )
+        self.cutoff = timezone.now() + timedelta(seconds=1)
+
+    def test_archive_and_restore_keep_journal_id(self):
+        path = os.path.join(self.directory, "contact.ndjson.gz")
+        count, max_id = retention.archive_messages(self.cutoff, path)
+        retention.delete_archived(self.cutoff, max_id)
+
+        self.assertEqual((count, os.listdir(self.directory)), (1, ["contact.ndjson.gz"]))
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertEqual(retention.restore_messages(path), (1, 0))
+        self.assertEqual(ContactMessage.objects.get().journal_id, self.message.journal_id)
+
+    def test_nothing_to_archive_leaves_no_file(self):
+        path = os.path.join(self.directory, "empty.ndjson.gz")
+
+        self.assertEqual(retention.archive_messages(timezone.now() - timedelta(days=1), path), (0, 0))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_command_requires_durable_output_dir(self):
+        for output_dir in ("", "archive"):
+            with self.assertRaises(CommandError):
+                call_command("archive_contact_messages", output_dir=output_dir, stdout=io.StringIO())
+        self.assertTrue(ContactMessage.objects.exists())
+
+        call_command(
+            "archive_contact_messages", "--partitions-only", output_dir="", stdout=io.StringIO()
+        )
+        self.assertTrue(ContactMessage.objects.exists())
+
+
+class RotatingBloomFilterTests(SimpleTestCase):
+    """
+    Bloom filter rotativo de core.spamfilter, com relógio controlado.
+    """
+
+    def _positions(self, bloom, i):
+        return bloom.positions(fingerprint("ana@example.com", "assunto", f"mensagem {i}"))
+
+    def test_item_stays_visible_between_one_and_two_windows(self):
+        clock = FakeClock()
+        bloom = RotatingBloomFilter(1000, 0.001, window=60, clock=clock)
+        positions = self._positions(bloom, 1)
+        bloom.add(positions)
+
+        for now in (0, 59, 60, 119):  # geração atual, depois a anterior
+            clock.now = now
+            self.assertTrue(bloom.contains(positions), now)
+        clock.now = 120  # segunda rotação descarta a geração do item
+        self.assertFalse(bloom.contains(positions))
+
+    def test_long_idle_discards_both_generations(self):
+        clock = FakeClock()
+        bloom = RotatingBloomFilter(1000, 0.001, window=60, clock=clock)
+        positions = self._positions(bloom, 1)
+        bloom.add(positions)
+
+        clock.now = 200
+        self.assertFalse(bloom.contains(positions))
+
+    def test_false_positive_rate_within_bounds(self):
+        capacity, error_rate = 10_000, 0.01
+        bloom = RotatingBloomFilter(capacity, error_rate, window=60, clock=FakeClock())
+        for i in range(capacity):
+            bloom.add(self._positions(bloom, i))
+
+        probes = 20_000
+        false_positives = sum(
+            bloom.contains(self._positions(bloom, i))
+            for i in range(capacity, capacity + probes)
+        )
+        self.assertLessEqual(false_positives / probes, 2 * error_rate)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ContactPrefilterTests(SimpleTestCase):
+    """
+    Duplicatas e spam em core.spamfilter.ContactPrefilter.
+    """
+
+    message = ("Ana", "ana@example.com", "Orçamento", "Gostaria de um orçamento para o site.")
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+        self.prefilter = ContactPrefilter(
+            window=3600, capacity=1000, error_rate=0.001, spam_threshold=4, clock=self.clock
+        )
+
+    def test_recorded_message_is_duplicate(self):
+        self.prefilter.record(self.prefilter.check(*self.message))
+
+        self.assertEqual(self.prefilter.check(*self.message).verdict, DUPLICATE)
+        name, email, subject, message = self.message
+        variant = (name, email.upper(), f"  {subject} ", message.replace(" ", "  "))
+        self.assertEqual(self.prefilter.check(*variant).verdict, DUPLICATE)
+
+    def test_duplicate_seen_by_another_process(self):
+        other = ContactPrefilter(
+            window=3600, capacity=1000, error_rate=0.001, spam_threshold=4, clock=self.clock
+        )
+        other.record(other.check(*self.message))
+
+        self.assertEqual(self.prefilter.check(*self.message).verdict, DUPLICATE)
+
+    def test_pending_claim_rejects_concurrent_resubmission(self):
+        self.assertEqual(self.prefilter.check(*self.message).verdict, ACCEPT)
+
+        self.assertEqual(self.prefilter.check(*self.message).verdict, DUPLICATE)
+
+    def test_released_message_can_be_retried(self):
+        # A gravação falhou depois do pré-filtro: o reenvio tem que passar.
+        self.prefilter.release(self.prefilter.check(*self.message))
+
+        self.assertEqual(self.prefilter.check(*self.message).verdict, ACCEPT)
+
+    def test_bloom_hit_is_confirmed_in_cache(self):
+        # Simula um falso positivo: o Bloom diz "visto", o cache não.
+        digest = fingerprint("ana@example.com", "orçamento", "gostaria de um orçamento para o site.")
+        self.prefilter.bloom.add(self.prefilter.bloom.positions(digest))
+
+        self.assertEqual(self.prefilter.check(*self.message).verdict, ACCEPT)
+
+    def test_duplicate_window_without_shared_cache(self):
+        prefilter = ContactPrefilter(
+            window=60, capacity=1000, error_rate=0.001, spam_threshold=4,
+            use_shared_cache=False, clock=self.clock,
+        )
+        prefilter.record(prefilter.check(*self.message))
+
+        self.clock.now = 60  # rotação: o item passa para a geração anterior
+        self.assertEqual(prefilter.check(*self.message).verdict, DUPLICATE)
+        self.clock.now = 120
+        self.assertEqual(prefilter.check(*self.message).verdict, ACCEPT)
+
+    def test_spam_is_rejected(self):
+        links = " ".join(f"http://promo{i}.example.com" for i in range(5))
+        result = self.prefilter.check("Promo", "promo@example.com", "Oferta", links)
+
+        self.assertEqual(result.verdict, SPAM)
+        self.assertGreaterEqual(result.score, 4)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    SINGLE_FLIGHT_LOCK_TIMEOUT=30,
+    SINGLE_FLIGHT_WAIT=5.0,
+    SINGLE_FLIGHT_POLL=0.005,
+)
+class SingleFlightTests(SimpleTestCase):
+    """
+    Uma montagem por chave em core.singleflight, com chamadores concorrentes.
+    """
+
+    callers = 16
+
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+        self._lock = threading.Lock()
+
+    def _build(self, delay: float = 0.2, value: str = "novo"):
+        def build():
+            with self._lock:
+                self.builds += 1
+            time.sleep(delay)
+            return value
+        return build
+
+    def _concurrent(self, call) -> list:
+        barrier = threading.Barrier(self.callers)
+        results = [None] * self.callers
+
+        def run(i):
+            barrier.wait()
+            results[i] = call()
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(self.callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_misses_build_once(self):
+        build = self._build()
+        results = self._concurrent(lambda: single_flight("payload", build, 60))
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual({r.value for r in results}, {"novo"})
+        self.assertFalse(any(r.stale for r in results))
+
+    def test_waiters_get_stale_value_while_one_builds(self):
+        build = self._build()
+        results = self._concurrent(
+            lambda: single_flight("payload", build, 60, stale=lambda: "anterior")
+        )
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(sum(not r.stale for r in results), 1)
+        self.assertEqual({r.value for r in results if r.stale}, {"anterior"})
+
+    def test_waiter_rebuilds_when_lock_holder_dies(self):
+        # Um processo travou a chave e morreu: a trava só some ao expirar.
+        cache.add(f"{LOCK_KEY_PREFIX}payload", "morto", timeout=1)
+        start = time.monotonic()
+        results = self._concurrent(lambda: single_flight("payload", self._build(0.05), 60))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual({r.value for r in results}, {"novo"})
+        # Esperou a trava expirar, não o prazo de espera (SINGLE_FLIGHT_WAIT).
+        self.assertGreaterEqual(elapsed, 0.9)
+        self.assertLess(elapsed, 4)
+
+    @override_settings(SINGLE_FLIGHT_WAIT=0.2)
+    def test_waiter_builds_after_wait_deadline(self):
+        cache.add(f"{LOCK_KEY_PREFIX}payload", "travado", timeout=30)
+
+        with self.assertLogs("core.singleflight", "WARNING"):
+            flight = single_flight("payload", self._build(0), 60)
+
+        self.assertEqual((flight.value, self.builds), ("novo", 1))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # /nohead: HEAD responde 405, GET 200. /slow: demora mais que o timeout.
+    slow_delay = 1.0
+
+    def do_HEAD(self):
+        self._respond(head=True)
+
+    def do_GET(self):
+        self._respond(head=False)
+
+    def _respond(self, head: bool):
+        self.server.requests.append((self.command, self.path))
+        if self.path == "/slow":
+            time.sleep(self.slow_delay)
+        status = 405 if self.path == "/nohead" and head else 200
+        body = b"" if head else b"stub"
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # o cliente desistiu (timeout)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LinkCheckTests(TestCase):
+    """
+    core.linkcheck contra um servidor HTTP local (stub).
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def test_head_not_allowed_falls_back_to_get(self):
+        url = f"{self.base}/nohead"
+        [result] = linkcheck.check_urls({url}, concurrency=2, per_host=2, timeout=5)
+
+        self.assertEqual(result.status, LinkHealth.STATUS_OK)
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(self.server.requests, [("HEAD", "/nohead"), ("GET", "/nohead")])
+
+    def test_timeout_is_reported_as_error(self):
+        url = f"{self.base}/slow"
+        [result] = linkcheck.check_urls({url}, concurrency=2, per_host=2, timeout=0.2)
+
+        self.assertEqual(result.status, LinkHealth.STATUS_ERROR)
+        self.assertIsNone(result.status_code)
+        self.assertIn("Timeout", result.error)
+
+    def test_due_urls_skips_results_within_ttl(self):
+        fresh, stale, new = (f"{self.base}/{name}" for name in ("fresh", "stale", "new"))
+        linkcheck.save_results([
+            linkcheck.LinkResult(fresh, LinkHealth.STATUS_OK, status_code=200),
+            linkcheck.LinkResult(stale, LinkHealth.STATUS_OK, status_code=200),
+        ])
+        LinkHealth.objects.filter(url=stale).update(
+            checked_at=timezone.now() - timedelta(hours=2)
+        )
+
+        self.assertEqual(linkcheck.due_urls({fresh, stale, new}, ttl=3600), {stale, new})
+
+
+class ContentEventsTests(SimpleTestCase):
+    """
+    Ciclo de vida de uma conexão do SSE (core.events.content_events_app).
+    """
+
+    scope = {"type": "http", "method": "GET", "path": "/api/events/", "headers": []}
+
+    def setUp(self):
+        self.broadcaster = events.ContentVersionBroadcaster(poll_interval=0.01)
+        patcher = mock.patch.object(events, "broadcaster", self.broadcaster)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _pending_tasks(self) -> set:
+        await asyncio.sleep(0)
+        return {t for t in asyncio.all_tasks() if t is not asyncio.current_task()}
+
+    async def test_disconnect_unsubscribes(self):
+        disconnect = asyncio.Event()
+        sent = []
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body", b"").count(b"content-version"):
+                disconnect.set()
+
+        with mock.patch.object(events, "get_content_version", return_value=7):
+            await asyncio.wait_for(events.content_events_app(self.scope, receive, send), 5)
+
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertIn(b"id: 7", sent[1]["body"])
+        self.assertEqual(self.broadcaster.subscribers, 0)
+
+    async def test_failed_subscribe_does_not_leak(self):
+        async def receive():
+            await asyncio.Event().wait()
+
+        async def send(message):
+            self.fail("nada deve ser enviado")
+
+        before = await self._pending_tasks()
+        with mock.patch.object(events, "get_content_version", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                await events.content_events_app(self.scope, receive, send)
+
+        self.assertEqual(self.broadcaster.subscribers, 0)
+        self.assertEqual(await self._pending_tasks(), before)
+
+
+@override_settings(
+    CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "test_replica_cache",
+    }},
+    REPLICA_STICKY_SECONDS=5,
+)
+class ReplicaRoutingTests(TestCase):
+    """
+    core.routers + ReplicaRoutingMiddleware com uma réplica SQLite local
+    (outro arquivo, com dados diferentes do primário).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # O alias só existe durante a classe: o runner não pode conhecê-lo.
+        cls.databases = {"default", "replica_1"}
+        cls.directory = tempfile.mkdtemp()
+        replica = {
+            **connections["default"].settings_dict,
+            "NAME": os.path.join(cls.directory, "replica.sqlite3"),
+        }
+        connections.settings["replica_1"] = replica
+        with connections["replica_1"].schema_editor() as editor:
+            editor.create_model(Skill)
+        cls.replicas = mock.patch.object(routers, "replica_aliases", return_value=["replica_1"])
+        cls.replicas.start()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.replicas.stop()
+        connections["replica_1"].close()
+        del connections["replica_1"]
+        del connections.settings["replica_1"]
+        shutil.rmtree(cls.directory)
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("createcachetable", database="default", verbosity=0)
+        Skill.objects.using("replica_1").bulk_create([Skill(name="na réplica")])
+        Skill.objects.bulk_create([Skill(name="no primário")])
+
+    def setUp(self):
+        self.middleware = ReplicaRoutingMiddleware(self._view)
+        self.factory = RequestFactory()
+
+    @staticmethod
+    def _view(request):
+        if request.method == "POST":
+            Skill.objects.create(name="nova")
+        # Escrita no cache em banco (django_cache) não conta como escrita.
+        cache.set("replica-routing-test", 1)
+        return JsonResponse({"names": sorted(Skill.objects.values_list("name", flat=True))})
+
+    def _names(self, response) -> list:
+        return json.loads(response.content)["names"]
+
+    def test_read_goes_to_replica(self):
+        response = self.middleware(self.factory.get("/api/portfolio/"))
+
+        self.assertEqual(self._names(response), ["na réplica"])
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_write_pins_client_to_primary(self):
+        response = self.middleware(self.factory.post("/api/contact/"))
+
+        self.assertIn("nova", self._names(response))
+        cookie = response.cookies[STICKY_COOKIE]
+        self.assertEqual(cookie["max-age"], 5)
+
+        request = self.factory.get("/api/portfolio/")
+        request.COOKIES[STICKY_COOKIE] = cookie.value
+        self.assertEqual(self._names(self.middleware(request)), ["no primário", "nova"])
+
+    def test_expired_cookie_reads_from_replica(self):
+        request = self.factory.get("/api/portfolio/")
+        request.COOKIES[STICKY_COOKIE] = str(time.time() - 1)
+
+        self.assertEqual(self._names(self.middleware(request)), ["na réplica"])
+
+    def test_cache_fill_reads_from_primary(self):
+        def view(request):
+            with routers.reading_from_primary():
+                filled = list(Skill.objects.values_list("name", flat=True))
+            served = list(Skill.objects.values_list("name", flat=True))
+            return JsonResponse({"names": [filled, served]})
+
+        response = ReplicaRoutingMiddleware(view)(self.factory.get("/api/portfolio/"))
+
+        self.assertEqual(self._names(response), [["no primário"], ["na réplica"]])
+
+    def test_failing_replica_is_retried_on_primary_and_left_out(self):
+        def view(request):
+            # A réplica local não tem a tabela project: a query falha nela.
+            Project.objects.exists()
+            return self._view(request)
+
+        middleware = ReplicaRoutingMiddleware(convert_exception_to_response(view))
+        with mock.patch.dict(routers._down_until, clear=True):
+            response = middleware(self.factory.get("/api/portfolio/"))
+            self.assertEqual(self._names(response), ["no primário"])
+            self.assertIn("replica_1", routers._down_until)
+
+            # Fora da rotação: o próximo pedido nem tenta a réplica.
+            with self.assertNumQueries(0, using="replica_1"):
+                response = self.middleware(self.factory.get("/api/portfolio/"))
+            self.assertEqual(self._names(response), ["no primário"])
+
+
+class PayloadStoreTests(SimpleTestCase):
+    """
+    Arquivo de payloads compartilhado (core.payloadstore); cada
+    PayloadStore faz o papel de um worker.
+    """
+
+    size = 8192
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "payloads.bin")
+
+    def _store(self) -> payloadstore.PayloadStore:
+        return payloadstore.PayloadStore(self.path, self.size)
+
+    @staticmethod
+    def _parts(tag: str, size: int = 100) -> tuple:
+        return (tag.encode() * size, b"gz-" + tag.encode(), None)
+
+    def _bytes(self, slices) -> tuple | None:
+        return None if slices is None else tuple(
+            None if part is None else bytes(part) for part in slices
+        )
+
+    def _seq(self) -> int:
+        with open(self.path, "rb") as fh:
+            return payloadstore._header(fh.read(payloadstore.HEADER.size)).seq
+
+    def test_put_is_visible_to_other_workers(self):
+        writer, reader = self._store(), self._store()
+
+        self.assertEqual(self._bytes(writer.put("portfolio", 1, self._parts("a"))), self._parts("a"))
+        self.assertEqual(self._bytes(reader.get("portfolio", 1)), self._parts("a"))
+        self.assertIsNone(reader.get("portfolio", 2))
+        self.assertIsNone(reader.get("stats", 1))
+
+        writer.put("portfolio", 2, self._parts("b"))
+        self.assertEqual(self._bytes(reader.get("portfolio", 2)), self._parts("b"))
+        self.assertEqual(self._bytes(reader.latest("portfolio")), self._parts("b"))
+        self.assertEqual(self._seq() % 2, 0)
+
+    def test_compaction_keeps_current_versions_and_retires_old_file(self):
+        writer, reader = self._store(), self._store()
+        writer.put("stats", 1, self._parts("s", 200))
+        old = reader.get("stats", 1)
+
+        for version in range(1, 40):  # bem mais que cabe em 8 KiB sem compactar
+            writer.put("portfolio", version, self._parts(str(version % 10), 300))
+
+        self.assertEqual(self._bytes(reader.get("portfolio", 39)), self._parts("9", 300))
+        self.assertEqual(self._bytes(reader.get("stats", 1)), self._parts("s", 200))
+        self.assertLessEqual(os.path.getsize(self.path), self.size)
+        # Fatias entregues antes da compactação continuam válidas.
+        self.assertEqual(self._bytes(old), self._parts("s", 200))
+
+    def test_crashed_writer_odd_seq_is_recreated(self):
+        store = self._store()
+        store.put("portfolio", 1, self._parts("a"))
+        # Gravador morto entre "seq + 1" e "seq + 2".
+        with open(self.path, "r+b") as fh:
+            fh.seek(payloadstore.SEQ_OFFSET)
+            fh.write(payloadstore.SEQ.pack(self._seq() + 1))
+
+        reader = self._store()
+        with self.assertLogs("core.payloadstore", "WARNING"):
+            self.assertIsNone(reader.get("portfolio", 1))
+        with self.assertLogs("core.payloadstore", "WARNING"):
+            store.put("portfolio", 2, self._parts("b"))
+
+        self.assertEqual(self._seq() % 2, 0)
+        self.assertEqual(self._bytes(reader.get("portfolio", 2)), self._parts("b"))
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """
+    core.checks: cache de produção compartilhado e atômico (check --deploy).
+    """
+
+    def _ids(self, backend: str, debug: bool = False) -> list:
+        caches = {"default": {"BACKEND": backend, "LOCATION": "localhost:6379"}}
+        with override_settings(DEBUG=debug, CACHES=caches):
+            return [error.id for error in shared_cache_check(None)]
+
+    def test_process_local_cache_fails(self):
+        self.assertEqual(self._ids("django.core.cache.backends.locmem.LocMemCache"), ["core.E001"])
+        self.assertEqual(self._ids("django.core.cache.backends.locmem.LocMemCache", debug=True), [])
+
+    def test_database_cache_fails(self):
+        self.assertEqual(self._ids("django.core.cache.backends.db.DatabaseCache"), ["core.E002"])
+
+    def test_redis_and_memcached_pass(self):
+        for backend in (
+            "django.core.cache.backends.redis.RedisCache",
+            "django.core.cache.backends.memcached.PyMemcacheCache",
+        ):
+            self.assertEqual(self._ids(backend), [], backend)
+
+
+@override_settings(EMAIL_HOST="", HEALTH_PROBE_TIMEOUT=1.5)
+class HealthReadinessTests(TestCase):
+    """
+    /health/ready/ (público) e /api/internal/health/ (staff), com uma
+    rodada do prober feita no próprio teste.
+    """
+
+    secret = "connection to host=db.internal user=portfolio failed"
+
+    def setUp(self):
+        self.prober = health.HealthProber(interval=5, window=10)
+        patcher = mock.patch.object(health, "get_prober", return_value=self.prober)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fail_database(self):
+        dependency = next(d for d in self.prober.dependencies if d.name == "db:default")
+        dependency.probe = mock.Mock(side_effect=DatabaseError(self.secret))
+        with self.assertLogs("core.health", "WARNING") as logs:
+            self.prober.probe_once()
+        self.assertIn(self.secret, "\n".join(logs.output))
+
+    def test_ready_when_dependencies_are_up(self):
+        self.prober.probe_once()
+        response = self.client.get("/health/ready/")
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["dependencies"]["db:default"]["status"], "up")
+        self.assertEqual(body["dependencies"]["cache"]["status"], "up")
+
+    def test_public_body_hides_error_details(self):
+        self._fail_database()
+        response = self.client.get("/health/ready/")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertNotContains(response, "db.internal", status_code=503)
+        self.assertEqual(
+            set(response.json()),
+            {"status", "dependencies"},
+        )
+        self.assertNotIn("error", response.json()["dependencies"]["db:default"])
+
+    def test_staff_detail_has_error(self):
+        self._fail_database()
+        staff = get_user_model().objects.create_user("staff", password="senha", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get("/api/internal/health/")
+
+        self.assertEqual(response.status_code, 503)
+        database = response.json()["dependencies"]["db:default"]
+        self.assertIn(self.secret, database["error"])
+        self.assertEqual(database["consecutive_failures"], 1)
+
+    def test_probe_cache_client_uses_probe_timeout(self):
+        caches = {"default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:1/0",
+        }}
+        with override_settings(CACHES=caches):
+            client = health.probe_cache_backend()
+
+        self.assertEqual(client._options, {"socket_timeout": 1.5, "socket_connect_timeout": 1.5})
+
+
+class PurgeStubHandler(BaseHTTPRequestHandler):
+    # Registra cada purge; segura a resposta enquanto server.gate estiver fechado.
+    def do_POST(self):
+        self.server.purges.append(self.headers.get(edgecache.SURROGATE_KEY_HEADER))
+        self.server.tokens.append(self.headers.get("Fastly-Key"))
+        self.server.gate.wait(5)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EdgeCacheTests(TestCase):
+    """
+    Cabeçalhos de edge_cached e purges enviados a um servidor local (stub)
+    no lugar do CDN.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PurgeStubHandler)
+        self.server.daemon_threads = True
+        self.server.purges, self.server.tokens = [], []
+        self.server.gate = threading.Event()
+        self.server.gate.set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(self.server.gate.set)
+
+        settings = override_settings(
+            EDGE_CACHE_ENABLED=True,
+            EDGE_CACHE_KEY_PREFIX="pf-",
+            EDGE_PURGER="core.edgecache.HTTPPurger",
+            EDGE_PURGE_URL=f"http://127.0.0.1:{self.server.server_address[1]}/purge",
+            EDGE_PURGE_TOKEN="segredo",
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        edgecache.get_purger.cache_clear()
+        self.addCleanup(edgecache.get_purger.cache_clear)
+
+    def _wait_for_purges(self, count: int) -> list:
+        deadline = time.monotonic() + 5
+        while len(self.server.purges) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)  # nada além do esperado
+        return self.server.purges
+
+    def test_bumped_scopes_are_purged_by_surrogate_key(self):
+        bump_versions("skills", "projects")
+
+        self.assertEqual(self._wait_for_purges(1), ["pf-projects pf-skills"])
+        self.assertEqual(self.server.tokens, ["segredo"])
+
+    def test_keys_arriving_during_a_purge_are_batched(self):
+        self.server.gate.clear()
+        edgecache.purge_scopes(["skills"])
+        self._wait_for_purges(1)
+        for scopes in (["projects"], ["education", "projects"], ["profile"]):
+            edgecache.purge_scopes(scopes)
+        self.server.gate.set()
+
+        self.assertEqual(
+            self._wait_for_purges(2), ["pf-skills", "pf-education pf-profile pf-projects"]
+        )
+
+    def test_no_purge_when_disabled(self):
+        for overrides in ({"EDGE_CACHE_ENABLED": False}, {"EDGE_PURGER": "core.edgecache.NullPurger"}):
+            edgecache.get_purger.cache_clear()
+            with override_settings(**overrides):
+                bump_versions("skills")
+        time.sleep(0.2)
+        self.assertEqual(self.server.purges, [])
+
+    def test_cacheable_responses_carry_policy_and_keys(self):
+        response = self.client.get("/api/skills/")
+        self.assertEqual(response["Surrogate-Key"], "pf-skills")
+        for directive in ("public", "max-age=0", "s-maxage=86400", "stale-while-revalidate=60"):
+            self.assertIn(directive, response["Cache-Control"])
+
+        response = self.client.get("/api/portfolio/?sections=skills")
+        self.assertEqual(response["Surrogate-Key"], "pf-sections pf-skills")
+
+        with override_settings(EDGE_CACHE_ENABLED=False):
+            response = self.client.get("/api/skills/")
+        self.assertFalse(response.has_header("Surrogate-Key"))
+
+    def test_private_or_unsafe_responses_are_not_marked(self):
+        def view(request):
+            response = JsonResponse({})
+            if request.GET.get("cookie"):
+                response.set_cookie("sessao", "x")
+            return response
+
+        cached = edgecache.edge_cached("content", ["skills"])(view)
+        factory = RequestFactory()
+        for request in (factory.get("/", {"cookie": "1"}), factory.post("/")):
+            response = cached(request)
+            self.assertFalse(response.has_header("Cache-Control"))
+            self.assertFalse(response.has_header("Surrogate-Key"))
+
+
+class GitHubStubHandler(BaseHTTPRequestHandler):
+    # /repos/dono/<nome>[/languages]: "ok" responde com ETag (e 304 quando o
+    # If-None-Match bate), "missing" 404, "broken" 500, "limited" sem cota.
+    def do_GET(self):
+        etag = self.headers.get("If-None-Match", "")
+        self.server.requests.append((self.path, etag))
+        name = self.path.split("/")[3]
+        languages = self.path.endswith("/languages")
+        headers = {}
+        if name == "ok":
+            current = '"l1"' if languages else '"r1"'
+            status = 304 if etag == current else 200
+            headers["ETag"] = current
+            body = {"Python": 10} if languages else {
+                "html_url": "https://github.com/dono/ok",
+                "stargazers_count": 5,
+                "forks_count": 2,
+                "language": "Python",
+            }
+        elif name == "limited":
+            status, body = 403, {"message": "API rate limit exceeded"}
+            headers["X-RateLimit-Remaining"] = "0"
+        else:
+            status, body = (404 if name == "missing" else 500), {"message": "erro"}
+        payload = b"" if status == 304 else json.dumps(body).encode()
+        self.send_response(status)
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RepositoryMetadataTests(TestCase):
+    """
+    core.repometa contra um servidor local (stub) no lugar da API do GitHub.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), GitHubStubHandler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        settings = override_settings(REPO_METADATA_API_URL=self.base_url, REPO_METADATA_TOKEN=None)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def _project(self, repo: str) -> Project:
+        return Project.objects.create(
+            title=repo, slug=repo, short_description="-", repo_url=f"https://github.com/Dono/{repo}.git"
+        )
+
+    def test_etags_are_revalidated_and_304_keeps_the_data(self):
+        project = self._project("ok")
+
+        with mock.patch.object(repometa, "bump_versions") as bump:
+            first = repometa.run_enrichment()
+            self.server.requests.clear()
+            second = repometa.run_enrichment(force=True)
+
+        self.assertEqual((first["updated"], second["not_modified"]), (1, 1))
+        self.assertEqual(
+            sorted(self.server.requests),
+            [("/repos/dono/ok", '"r1"'), ("/repos/dono/ok/languages", '"l1"')],
+        )
+        row = RepositoryMetadata.objects.get(project=project)
+        self.assertEqual((row.stars, row.forks, row.languages), (5, 2, {"Python": 10}))
+        # Só a primeira execução mudou o payload de projetos.
+        bump.assert_called_once_with("projects")
+
+    def test_fresh_rows_are_not_fetched_again(self):
+        self._project("ok")
+        repometa.run_enrichment()
+        self.server.requests.clear()
+
+        summary = repometa.run_enrichment()
+
+        self.assertEqual((summary["repositories"], self.server.requests), (0, []))
+
+    def test_rate_limit_stops_the_rest_of_the_batch(self):
+        fetcher = repometa.RepositoryFetcher(self.base_url, None, concurrency=1, timeout=5)
+
+        results = asyncio.run(fetcher.fetch_all({"dono/limited": ("", ""), "dono/ok": ("", "")}))
+
+        self.assertEqual({r.status for r in results.values()}, {repometa.FAILED})
+        self.assertEqual(results["dono/ok"].error, "Limite da API atingido.")
+        self.assertEqual(self.server.requests, [("/repos/dono/limited", "")])
+
+    def test_failures_keep_previous_data_and_missing_repos_are_marked(self):
+        broken, missing = self._project("broken"), self._project("missing")
+        stale = timezone.now() - timedelta(days=1)
+        RepositoryMetadata.objects.create(
+            project=broken, full_name="dono/broken", stars=3, etag='"antigo"', fetched_at=stale
+        )
+
+        summary = repometa.run_enrichment()
+
+        self.assertEqual((summary["failed"], summary["not_found"]), (1, 1))
+        kept = RepositoryMetadata.objects.get(project=broken)
+        self.assertEqual((kept.stars, kept.etag, kept.fetched_at), (3, '"antigo"', stale))
+        self.assertFalse(RepositoryMetadata.objects.get(project=missing).found)
+
+    def test_unreachable_api_is_reported_per_repository(self):
+        self.server.shutdown()
+        self.server.server_close()
+        fetcher = repometa.RepositoryFetcher(self.base_url, None, concurrency=2, timeout=1)
+
+        results = asyncio.run(fetcher.fetch_all({"dono/ok": ("", "")}))
+
+        self.assertEqual(results["dono/ok"].status, repometa.FAILED)
+        self.assertTrue(results["dono/ok"].error.startswith("ConnectError"))
+
+
+class ExperienceDurationTests(SimpleTestCase):
+    """
+    União dos períodos em core.stats: sobreposições contam uma vez só.
+    """
+    today = date(2024, 12, 31)
+
+    def test_overlapping_roles_count_once(self):
+        merged = stats.merge_intervals(
+            [(date(2021, 1, 1), date(2022, 6, 30)), (date(2020, 1, 1), date(2021, 6, 30))]
+        )
+        self.assertEqual(merged, [(date(2020, 1, 1), date(2022, 6, 30))])
+
+    def test_contiguous_roles_merge_and_gaps_do_not(self):
+        merged = stats.merge_intervals([
+            (date(2020, 1, 1), date(2020, 12, 31)),
+            (date(2021, 1, 1), date(2021, 6, 30)),
+            (date(2021, 7, 2), date(2021, 12, 31)),
+        ])
+        self.assertEqual(merged, [
+            (date(2020, 1, 1), date(2021, 6, 30)),
+            (date(2021, 7, 2), date(2021, 12, 31)),
+        ])
+
+    def test_nested_role_does_not_shrink_the_outer_one(self):
+        merged = stats.merge_intervals(
+            [(date(2020, 1, 1), date(2022, 12, 31)), (date(2021, 1, 1), date(2021, 3, 31))]
+        )
+        self.assertEqual(merged, [(date(2020, 1, 1), date(2022, 12, 31))])
+
+    def test_current_roles_run_until_today(self):
+        rows = [
+            (date(2024, 1, 1), None, True),
+            (date(2024, 12, 1), date(2020, 1, 1), True),  # fim antigo ignorado
+            (date(2024, 6, 1), None, False),  # sem fim e não atual: até hoje
+        ]
+        duration = stats._duration(rows, self.today)
+        self.assertEqual((duration["days"], duration["periods"]), (366, 1))
+        self.assertEqual((duration["since"], duration["years"]), ("2024-01-01", 1.0))
+
+    def test_inverted_periods_are_ignored(self):
+        duration = stats._duration([(date(2023, 5, 1), date(2023, 4, 1), False)], self.today)
+        self.assertEqual(duration["days"], 0)
+
+    def test_empty_input(self):
+        self.assertEqual(stats.merge_intervals([]), [])
+        self.assertEqual(
+            stats._duration([], self.today),
+            {"days": 0, "months": 0, "years": 0.0, "periods": 0, "since": None},
+        )
+
+
+class SectionOrderingTests(TestCase):
+    """
+    core.ordering e /api/internal/reorder/<seção>/: chaves espaçadas, ponto
+    médio, renumeração e trava das linhas da seção.
+    """
+
+    def _skills(self, *keys) -> list:
+        return [
+            Skill.objects.create(name=f"skill-{i}", order_index=key).pk
+            for i, key in enumerate(keys)
+        ]
+
+    def _keys(self) -> list:
+        return list(Skill.objects.values_list("pk", "order_index"))
+
+    def test_move_between_neighbours_writes_only_the_midpoint(self):
+        a, b, c = self._skills(1024, 2048, 3072)
+
+        result = ordering.move(Skill, [(c, ("after", a))])
+
+        self.assertEqual((result["changed"], result["renumbered"]), (1, False))
+        self.assertEqual(self._keys(), [(a, 1024), (c, 1536), (b, 2048)])
+
+    def test_first_and_last_step_past_the_ends(self):
+        a, b, c = self._skills(1024, 2048, 3072)
+
+        ordering.move(Skill, [(a, ordering.LAST), (c, ordering.FIRST)])
+
+        self.assertEqual(self._keys(), [(c, 1024), (b, 2048), (a, 4096)])
+
+    def test_move_without_gap_renumbers_the_section(self):
+        a, b, c = self._skills(1, 2, 3)
+
+        result = ordering.move(Skill, [(c, ("before", b))])
+
+        self.assertTrue(result["renumbered"])
+        self.assertEqual(self._keys(), [(a, 1024), (c, 2048), (b, 3072)])
+
+    def test_renumber_spaces_legacy_zero_keys(self):
+        a, b = self._skills(0, 0)
+
+        self.assertEqual(ordering.renumber(Skill), 2)
+        self.assertEqual(self._keys(), [(a, 1024), (b, 2048)])
+        self.assertEqual(ordering.renumber(Skill), 0)
+
+    def test_set_order_requires_every_id_once(self):
+        a, b, c = self._skills(1024, 2048, 3072)
+
+        with self.assertRaises(ordering.ReorderError):
+            ordering.set_order(Skill, [c, a])
+        result = ordering.set_order(Skill, [c, a, b])
+
+        self.assertEqual(result["changed"], 3)
+        self.assertEqual(self._keys(), [(c, 1024), (a, 2048), (b, 3072)])
+
+    def test_section_rows_are_locked_while_reordering(self):
+        a, b = self._skills(1024, 2048)
+
+        with mock.patch.object(
+            QuerySet, "select_for_update", autospec=True, side_effect=QuerySet.select_for_update
+        ) as lock:
+            ordering.move(Skill, [(a, ordering.LAST)])
+            ordering.set_order(Skill, [a, b])
+            ordering.renumber(Skill)
+
+        self.assertEqual(lock.call_count, 3)
+
+    def test_reorder_api_moves_and_bumps_only_the_section(self):
+        a, b, c = self._skills(1024, 2048, 3072)
+        staff = get_user_model().objects.create_user("staff", password="senha", is_staff=True)
+        self.client.force_login(staff)
+
+        with mock.patch.object(ordering, "bump_versions") as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    "/api/internal/reorder/skills/",
+                    {"moves": [{"id": a, "after": c}]},
+                    content_type="application/json",
+                )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.json()["order"]], [b, c, a]
+        )
+        bump.assert_called_once_with("skills")
+
+    def test_reorder_api_rejects_bad_requests(self):
+        a, _b = self._skills(1024, 2048)
+        url = "/api/internal/reorder/skills/"
+        body = {"moves": [{"id": a, "to": "last"}]}
+
+        response = self.client.post(url, body, content_type="application/json")
+        self.assertEqual(response.status_code, 302)  # login do admin
+
+        staff = get_user_model().objects.create_user("staff", password="senha", is_staff=True)
+        self.client.force_login(staff)
+        for path, payload, status in (
+            ("/api/internal/reorder/nada/", body, 404),
+            (url, {"moves": [{"id": a, "after": a}]}, 400),
+            (url, {"moves": [{"id": 999, "to": "first"}]}, 400),
+            (url, {"order": [a]}, 400),
+        ):
+            response = self.client.post(path, payload, content_type="application/json")
+            self.assertEqual(response.status_code, status, payload)
+        self.assertEqual(self._keys()[0], (a, 1024))
+
+
+class PayloadCacheMixin:
+    # Cada teste começa sem versões nem payloads cacheados (Django e processo).
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        for patcher in (
+            mock.patch.dict(payloads._local, clear=True),
+            mock.patch.object(payloads, "_project_slugs", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _save(self, obj):
+        # Os sinais só publicam a versão nova no commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+        return obj
+
+
+class ContentLocaleTests(PayloadCacheMixin, TestCase):
+    """
+    Idioma do conteúdo (core.locales) e payloads cacheados por idioma.
+    """
+
+    url = "/api/portfolio/?sections=skills"
+
+    def _level(self, query: str = "", **extra) -> tuple:
+        response = self.client.get(self.url + query, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response, response.json()["skills"][0]["level"]
+
+    def test_negotiation(self):
+        cases = [
+            ((None, None), "pt-br"),
+            (("en", "pt-BR"), "en"),
+            (("EN-GB", None), "en"),
+            (("fr", "pt"), "pt-br"),
+            ((None, "fr-CA, en-US;q=0.8"), "en"),
+            ((None, "fr, *;q=0.5"), "pt-br"),
+        ]
+        for args, locale in cases:
+            self.assertEqual(locales.negotiate(*args), locale, args)
+
+    def test_translation_edit_invalidates_only_that_locale(self):
+        skill = self._save(
+            Skill(name="Python", level="Avançado", translations={"en": {"level": "Advanced"}})
+        )
+        response, level = self._level(HTTP_ACCEPT_LANGUAGE="en-US,en;q=0.9")
+        self.assertEqual((response["Content-Language"], level), ("en", "Advanced"))
+        self.assertIn("Accept-Language", response["Vary"])
+        self.assertEqual(self._level()[1], "Avançado")
+
+        # Acerto no cache: nenhum dos idiomas vai ao banco.
+        with self.assertNumQueries(0):
+            self.assertEqual(self._level("&lang=en")[1], "Advanced")
+            self.assertEqual(self._level()[1], "Avançado")
+
+        skill.translations = {"en": {"level": "Expert"}}
+        self._save(skill)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._level()[1], "Avançado")
+        self.assertEqual(self._level("&lang=en")[1], "Expert")
+
+    def test_column_edit_invalidates_every_locale(self):
+        skill = self._save(Skill(name="Python", level="Avançado", translations={}))
+        self.assertEqual(self._level("&lang=en")[1], "Avançado")
+
+        skill.level = "Sênior"
+        self._save(skill)
+
+        # Sem tradução, o inglês cai na coluna original.
+        self.assertEqual(self._level("&lang=en")[1], "Sênior")
+        self.assertEqual(self._level()[1], "Sênior")
+
+
+class PortfolioSectionsTests(PayloadCacheMixin, TestCase):
+    """
+    /api/portfolio/: blocos cacheados um a um, ?sections= e SectionConfig.
+    """
+
+    def _keys(self, url: str = "/api/portfolio/") -> list:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return list(response.json())
+
+    def test_disabled_sections_are_left_out_until_reenabled(self):
+        config = self._save(SectionConfig(section_key="skills", is_enabled=False, order_index=1))
+        self._save(SectionConfig(section_key="projects", is_enabled=True, order_index=0))
+
+        keys = self._keys()
+        self.assertNotIn("skills", keys)
+        self.assertLess(keys.index("projects"), keys.index("experiences"))
+
+        config.is_enabled = True
+        self._save(config)
+        keys = self._keys()
+        self.assertEqual(keys[:4], ["profile", "sections", "projects", "skills"])
+
+    def test_requested_sections_only(self):
+        keys = self._keys("/api/portfolio/?sections=skills,projects")
+        self.assertEqual(keys, ["skills", "projects"])
+
+        response = self.client.get("/api/portfolio/?sections=skills,nada")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["unknown"], ["nada"])
+
+    def test_change_rebuilds_only_its_section(self):
+        self._save(Skill(name="Python"))
+        self._keys()
+        with self.assertNumQueries(0):
+            self._keys()
+
+        self._save(Project(title="Site", slug="site", short_description="-"))
+
+        # Projeto (com as imagens em prefetch); os outros blocos saem do cache.
+        with self.assertNumQueries(2):
+            self.assertIn("projects", self._keys())
+        # O subconjunto reaproveita os blocos já montados para o completo.
+        with self.assertNumQueries(0):
+            self._keys("/api/portfolio/?sections=projects")
+
+
+class ProjectDetailCacheTests(PayloadCacheMixin, TestCase):
+    """
+    /api/projects/<slug>/: payload por slug e 404 pelo conjunto de slugs.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.project = self._save(Project(title="Site", slug="site", short_description="-"))
+
+    def test_known_slug_is_served_from_cache(self):
+        self.assertEqual(self.client.get("/api/projects/site/").json()["title"], "Site")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/projects/site/")
+        self.assertEqual(response.json()["slug"], "site")
+
+    def test_unknown_slug_is_rejected_without_queries(self):
+        self.client.get("/api/projects/site/")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/projects/nao-existe/")
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("Surrogate-Key"))
+
+    def test_renamed_slug_invalidates_both(self):
+        self.client.get("/api/projects/site/")
+
+        self.project.slug = "site-novo"
+        self._save(self.project)
+
+        self.assertEqual(self.client.get("/api/projects/site/").status_code, 404)
+        self.assertEqual(self.client.get("/api/projects/site-novo/").json()["slug"], "site-novo")
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0, PROFILING_BUFFER_SIZE=2)
+class RequestProfilingTests(TestCase):
+    """
+    Perfis sob demanda e por amostragem (core.profiling), guardados num
+    buffer circular no cache.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.staff = get_user_model().objects.create_user("staff", password="senha", is_staff=True)
+
+    def _profiled(self, client=None, **extra):
+        response = (client or self.client).get("/api/skills/", **extra)
+        self.assertEqual(response.status_code, 200)
+        return response.get("X-Profile-Id")
+
+    def test_staff_request_is_profiled_and_downloadable(self):
+        self.client.force_login(self.staff)
+        profile_id = self._profiled(HTTP_X_PROFILE="1")
+        self.assertIsNotNone(profile_id)
+
+        raw = self.client.get(f"/api/internal/profiles/{profile_id}/")
+        self.assertIn(f"profile-{profile_id}.prof", raw["Content-Disposition"])
+        self.assertTrue(marshal.loads(raw.content))  # formato do pstats
+        text = self.client.get(f"/api/internal/profiles/{profile_id}/?format=text")
+        self.assertTrue(text.content.decode().startswith("GET /api/skills/ -> 200"))
+
+    def test_only_staff_can_request_and_sampling_picks_every_nth(self):
+        self.assertIsNone(self._profiled(HTTP_X_PROFILE="1"))
+        self.assertIsNone(self._profiled(data={"__profile": "1"}))
+
+        with override_settings(PROFILING_SAMPLE_RATE=2):
+            client = self.client_class()
+            self.assertEqual([self._profiled(client) for _ in range(4)], [None, "1", None, "2"])
+        self.assertEqual(
+            [p["reason"] for p in profiling.list_profiles()], ["sampled", "sampled"]
+        )
+
+    def test_ring_buffer_overwrites_the_oldest(self):
+        self.client.force_login(self.staff)
+        ids = [self._profiled(HTTP_X_PROFILE="1") for _ in range(3)]
+
+        listed = self.client.get("/api/internal/profiles/").json()
+        self.assertEqual([p["id"] for p in listed], [3, 2])
+        self.assertNotIn("stats", listed[0])
+        self.assertEqual(self.client.get(f"/api/internal/profiles/{ids[0]}/").status_code, 404)
+
+    def test_disabled_profiler_leaves_the_chain(self):
+        with override_settings(PROFILING_ENABLED=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                profiling.RequestProfilerMiddleware(lambda request: None)
+            client = self.client_class()
+            client.force_login(self.staff)
+            self.assertIsNone(self._profiled(client, HTTP_X_PROFILE="1"))
+
+
+class SuggestTests(PayloadCacheMixin, TransactionTestCase):
+    """
+    Índice de sugestões em memória (core.suggest): montado no warm-up,
+    atualizado pelos sinais e remontado quando outro worker muda as versões.
+    Sem transação envolvendo o teste: a remontagem roda em outra thread.
+    """
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.multiple(
+            suggest, _index=None, _versions=None, _checked_at=0.0, _rebuilding=None
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Skill.objects.create(name="Python")
+        Project.objects.create(
+            title="Sistema de Notas",
+            slug="notas",
+            short_description="-",
+            translations={"en": {"title": "Grade System"}},
+        )
+        for role in ("Dev", "Tech Lead"):
+            Experience.objects.create(
+                company_name="Informação SA", role=role, start_date=date(2020, 1, 1)
+            )
+
+    def _labels(self, prefix: str, lang: str = "") -> list:
+        response = self.client.get(f"/api/suggest/?prefix={prefix}&lang={lang}")
+        self.assertEqual(response.status_code, 200)
+        return [item["label"] for item in response.json()["results"]]
+
+    def test_prefix_matches_any_word_without_accents(self):
+        self.assertEqual(self._labels("NOT"), ["Sistema de Notas"])
+        self.assertEqual(self._labels("informacao"), ["Informação SA"])
+        self.assertEqual(self._labels("grade", lang="en"), ["Grade System"])
+        self.assertEqual(self.client.get("/api/suggest/").status_code, 400)
+
+    def test_warm_worker_answers_without_queries(self):
+        with mock.patch.object(health, "get_prober"):
+            warmup.warm_up_worker()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._labels("py"), ["Python"])
+            self.client.get("/api/portfolio/")
+
+    @override_settings(SUGGEST_CHECK_INTERVAL=3600)
+    def test_local_writes_update_the_index_in_place(self):
+        suggest.get_index()
+        suggest._checked_at = time.monotonic()  # sem conferir versões no teste
+
+        with mock.patch.object(suggest.SuggestIndex, "build") as build:
+            skill = Skill.objects.create(name="PostgreSQL")
+            self.assertEqual(self._labels("p"), ["PostgreSQL", "Python"])
+            skill.delete()
+            Experience.objects.filter(role="Dev").delete()
+            self.assertEqual(self._labels("p"), ["Python"])
+            # A empresa fica enquanto outra experiência a citar.
+            self.assertEqual(self._labels("info"), ["Informação SA"])
+        build.assert_not_called()
+
+    @override_settings(SUGGEST_CHECK_INTERVAL=0)
+    def test_other_workers_changes_trigger_a_rebuild(self):
+        self.assertEqual(self._labels("dj"), [])
+
+        # Outro worker (ou SQL direto): sem sinal aqui, só a versão muda.
+        Skill.objects.bulk_create([Skill(name="Django")])
+        bump_versions("skills")
+
+        deadline = time.monotonic() + 5
+        labels = self._labels("dj")
+        while labels != ["Django"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+            labels = self._labels("dj")
+        self.assertEqual(labels, ["Django"])
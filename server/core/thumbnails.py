@@ -0,0 +1,116 @@
+# core/thumbnails.py
+"""
+Agendamento da geração de variantes das imagens de projeto.
+
+O redimensionamento (core.imaging) roda num ProcessPoolExecutor criado sob
+demanda, fora do ciclo do request: o save() só agenda o trabalho depois do
+commit. Quando as variantes ficam prontas, ProjectImage.variants é
+atualizado (se a imagem não mudou nesse meio tempo) e a versão de
+"projects" é incrementada para invalidar os payloads em cache.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .cache import bump_versions
+from .imaging import render_variants
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = "projects/variants"
+
+_executor = None
+_lock = threading.Lock()
+
+
+def variants_root() -> str:
+    return os.path.join(settings.MEDIA_ROOT, VARIANTS_DIR)
+
+
+def variant_url(name: str) -> str:
+    return f"{settings.MEDIA_URL}{VARIANTS_DIR}/{name}"
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            # "spawn": os filhos não herdam conexões de banco nem threads do
+            # processo web (o fork de um processo com threads não é seguro).
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.THUMBNAIL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def variants_are_current(image) -> bool:
+    """
+    True se as variantes registradas cobrem as larguras/formatos
+    configurados e os arquivos existem no disco.
+    """
+    if not image.variants:
+        return False
+    formats = {v["format"] for v in image.variants}
+    if formats != set(settings.PROJECT_IMAGE_FORMATS):
+        return False
+    src_width = image.width or max(settings.PROJECT_IMAGE_WIDTHS)
+    expected = {min(w, src_width) for w in settings.PROJECT_IMAGE_WIDTHS}
+    if {v["width"] for v in image.variants} != expected:
+        return False
+    root = variants_root()
+    return all(os.path.exists(os.path.join(root, v["name"])) for v in image.variants)
+
+
+def render_args(image) -> tuple:
+    return (
+        image.image.path,
+        image.content_hash,
+        variants_root(),
+        list(settings.PROJECT_IMAGE_WIDTHS),
+        list(settings.PROJECT_IMAGE_FORMATS),
+    )
+
+
+def store_variants(pk: int, content_hash: str, variants: list) -> int:
+    from .models import ProjectImage
+
+    # Filtra pelo hash: se a imagem foi trocada enquanto as variantes da
+    # anterior eram geradas, o resultado antigo é descartado.
+    updated = ProjectImage.objects.filter(pk=pk, content_hash=content_hash).update(
+        variants=variants
+    )
+    if updated:
+        # update() não dispara sinais.
+        bump_versions("projects")
+    return updated
+
+
+def _on_done(pk: int, content_hash: str):
+    def callback(future):
+        try:
+            store_variants(pk, content_hash, future.result())
+        except Exception:
+            logger.exception("Falha ao gerar variantes da imagem de projeto %s", pk)
+        finally:
+            # O callback roda numa thread do executor, com conexão própria.
+            connection.close()
+
+    return callback
+
+
+def schedule_variants(image) -> None:
+    if not image.image or not image.content_hash or variants_are_current(image):
+        return
+    args = render_args(image)
+
+    def submit():
+        future = get_executor().submit(render_variants, *args)
+        future.add_done_callback(_on_done(image.pk, image.content_hash))
+
+    transaction.on_commit(submit)
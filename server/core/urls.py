@@ -11,8 +11,19 @@ from .views import (
     sections_list,
     projects_list,
     project_detail,
+    links_health,
     portfolio_full,
-    ContactCreateView,   
+    portfolio_stats,
+    ContactCreateView,
+    batch_requests,
+    contact_stats,
+    contact_stats_reconcile,
+    db_pool_stats,
+    health_detail,
+    profiles_list,
+    profile_download,
+    reorder_section,
+    suggest,
 )
 
 urlpatterns = [
@@ -26,6 +37,17 @@ urlpatterns = [
     path("sections/", sections_list),
     path("projects/", projects_list),
     path("projects/<slug:slug>/", project_detail),
+    path("links/health/", links_health),
+    path("suggest/", suggest),
     path("contact/", ContactCreateView.as_view()),
     path("portfolio/", portfolio_full, name="api-portfolio-full"),
+    path("stats/", portfolio_stats),
+    path("batch/", batch_requests),
+    path("internal/db-pool/", db_pool_stats),
+    path("internal/health/", health_detail),
+    path("internal/profiles/", profiles_list),
+    path("internal/profiles/<int:profile_id>/", profile_download),
+    path("internal/reorder/<slug:section>/", reorder_section),
+    path("internal/contact-stats/", contact_stats),
+    path("internal/contact-stats/reconcile/", contact_stats_reconcile),
 ]
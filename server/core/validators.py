@@ -0,0 +1,59 @@
+# core/validators.py
+"""
+Validação rápida do payload de contato.
+
+Substitui o full_clean() no caminho de /api/contact/: só checa o que os
+campos de ContactMessage exigem (tipo, obrigatoriedade, tamanho máximo e
+formato do e-mail), com limites lidos uma vez dos models. O e-mail passa
+pelo validate_email do Django, o mesmo do EmailField.
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from .models import ContactMessage
+
+CONTACT_FIELDS = ("name", "email", "subject", "message")
+
+CONTACT_FIELD_LIMITS = {
+    "name": ContactMessage._meta.get_field("name").max_length,
+    "email": ContactMessage._meta.get_field("email").max_length,
+    "subject": ContactMessage._meta.get_field("subject").max_length,
+    # TextField não tem max_length no banco; o limite vem das settings.
+    "message": settings.CONTACT_MESSAGE_MAX_LENGTH,
+}
+
+REQUIRED_MESSAGE = "Campo obrigatório."
+
+
+def clean_contact_payload(payload) -> tuple:
+    """
+    Retorna (dados limpos, erros no formato {"campo": ["mensagem"]}).
+    """
+    if not isinstance(payload, dict):
+        return {}, {"__all__": ["O corpo deve ser um objeto JSON."]}
+
+    cleaned = {}
+    errors = {}
+    for field in CONTACT_FIELDS:
+        value = payload.get(field, "")
+        if not isinstance(value, str):
+            errors[field] = ["Deve ser texto."]
+            continue
+        limit = CONTACT_FIELD_LIMITS[field]
+        value = value.strip()
+        if not value:
+            errors[field] = [REQUIRED_MESSAGE]
+        elif len(value) > limit:
+            errors[field] = [f"Máximo de {limit} caracteres."]
+        elif "\x00" in value:
+            errors[field] = ["Caracteres inválidos."]
+        else:
+            cleaned[field] = value
+
+    if "email" in cleaned:
+        try:
+            validate_email(cleaned["email"])
+        except ValidationError:
+            errors["email"] = ["Informe um endereço de e-mail válido."]
+    return cleaned, errors
@@ -1,15 +1,19 @@
 import json
+import re
+from datetime import date, timedelta
 
-from django.http import JsonResponse, Http404
+from django.http import HttpResponse, JsonResponse, Http404
 from django.views.decorators.http import require_http_methods
-from django.core.exceptions import ValidationError
+from django.contrib.admin.views.decorators import staff_member_required
+from django.utils import timezone
+from django.utils.cache import add_never_cache_headers, patch_vary_headers
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt   # 👈 novo
 from django.core.mail import send_mail                 # 👈 novo
 from django.conf import settings                       # 👈 novo
-from django.core.mail import EmailMultiAlternatives  # novo
 from django.conf import settings
+from django.db import transaction
 
 from .models import (
     UserProfile,
@@ -22,6 +26,7 @@ from .models import (
     Service,
     Language,
     SectionConfig,
+    LinkHealth,
 )
 
 from .serializers import (
@@ -35,7 +40,28 @@ from .serializers import (
     language_to_dict,
     section_config_to_dict,
     contact_message_to_dict,
+    link_health_to_dict,
 )
+from .batch import BatchError, parse_batch, run_batch
+from .dbpool import all_pool_metrics
+from .edgecache import edge_cached
+from .health import readiness, readiness_detail
+from .profiling import get_profile, list_profiles
+from .rollups import BUCKETS, DAY, bucket_range, reconcile, series
+from .journal import get_journal
+from .locales import current_chain, default_locale
+from .notifications import contact_email
+from .ordering import FIRST, LAST, ORDERED_MODELS, ReorderError, move, set_order
+from .payloads import (
+    SECTION_BUILDERS,
+    portfolio_payload,
+    project_payload,
+    stats_payload,
+)
+from .spamfilter import DUPLICATE, SPAM, get_prefilter
+from .stats import STATS_SCOPES
+from .suggest import SUGGEST_SCOPES, suggestions
+from .validators import REQUIRED_MESSAGE, clean_contact_payload
 
 # ---------- Helpers gerais ----------
 
@@ -49,6 +75,36 @@ def api_error(message: str, status: int = 400, extra: dict | None = None):
     return JsonResponse(payload, status=status)
 
 
+ACCEPTS_BR_RE = re.compile(r"\bbr\b")
+ACCEPTS_GZIP_RE = re.compile(r"\bgzip\b")
+
+
+def payload_response(request, payload):
+    """
+    Resposta com um payload de core.payloads, já na compressão aceita pelo
+    cliente (brotli > gzip > sem compressão). Payload stale (versão anterior,
+    servida enquanto a nova é montada) não pode ficar guardado na borda.
+    """
+    accept = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    encoding = None
+    if payload.br is not None and ACCEPTS_BR_RE.search(accept):
+        encoding = "br"
+    elif payload.gzip is not None and ACCEPTS_GZIP_RE.search(accept):
+        encoding = "gzip"
+    response = HttpResponse(payload.encoded(encoding), content_type="application/json")
+    if encoding:
+        response["Content-Encoding"] = encoding
+    if payload.stale:
+        add_never_cache_headers(response)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def request_locale(request) -> str:
+    # Definido pelo ContentLocaleMiddleware.
+    return getattr(request, "content_locale", default_locale())
+
+
 # ---------- ENDPOINT DE CONTATO (COM CSRF EXEMPT) ----------
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -57,150 +113,93 @@ class ContactCreateView(View):
     """
     Endpoint para criação de mensagem de contato.
 
-    - Espera JSON no body.
-    - Faz validação básica e salva em contact_message.
+    - Espera JSON no body (Content-Type e Content-Length obrigatórios,
+      limitado a CONTACT_MAX_BODY_BYTES).
+    - Valida com core.validators (sem full_clean) e salva em contact_message.
+    - Descarta duplicatas e spam (core.spamfilter) antes de gravar.
     - Envia e-mail automático (texto + HTML) para o dono do portfólio.
+    - Com CONTACT_INGEST_MODE = "journal", grava no journal local
+      (core.journal) e responde 202; o INSERT e o e-mail ficam para a
+      thread de gravação.
     """
 
     def post(self, request, *args, **kwargs):
         try:
-            body_unicode = request.body.decode("utf-8")
-            try:
-                payload = json.loads(body_unicode)
-            except json.JSONDecodeError:
-                return api_error("JSON inválido.", status=400)
+            # Rejeições baratas antes de ler o corpo.
+            content_type = request.META.get("CONTENT_TYPE", "")
+            if content_type.split(";", 1)[0].strip().lower() != "application/json":
+                return api_error("Content-Type deve ser application/json.", status=415)
 
-            name = payload.get("name", "").strip()
-            email = payload.get("email", "").strip()
-            subject = payload.get("subject", "").strip()
-            message = payload.get("message", "").strip()
+            max_bytes = settings.CONTACT_MAX_BODY_BYTES
+            try:
+                content_length = int(request.META.get("CONTENT_LENGTH") or "")
+            except ValueError:
+                return api_error("Content-Length obrigatório.", status=411)
+            if content_length > max_bytes:
+                return api_error("Mensagem muito grande.", status=413)
 
-            if not name or not email or not subject or not message:
-                return api_error(
-                    "Campos obrigatórios: name, email, subject, message.",
-                    status=400,
-                )
-
-            contact = ContactMessage(
-                name=name,
-                email=email,
-                subject=subject,
-                message=message,
-            )
+            # Lê no máximo o permitido, mesmo que o Content-Length minta.
+            raw_body = request.read(max_bytes + 1)
+            if len(raw_body) > max_bytes:
+                return api_error("Mensagem muito grande.", status=413)
 
             try:
-                contact.full_clean()
-            except ValidationError as exc:
+                payload = json.loads(raw_body)
+            except ValueError:
+                return api_error("JSON inválido.", status=400)
+
+            data, errors = clean_contact_payload(payload)
+            if errors:
+                if any(e == [REQUIRED_MESSAGE] for e in errors.values()):
+                    return api_error(
+                        "Campos obrigatórios: name, email, subject, message.",
+                        status=400,
+                        extra={"fields": errors},
+                    )
                 return api_error(
                     "Erro de validação.",
                     status=400,
-                    extra={"fields": exc.message_dict},
+                    extra={"fields": errors},
                 )
 
-            contact.save()
-
-            # --------- E-MAIL: TEXTO + HTML BONITÃO ---------
+            name = data["name"]
+            email = data["email"]
+            subject = data["subject"]
+            message = data["message"]
 
-            owner_email = settings.DEFAULT_FROM_EMAIL
-            logo_url = getattr(settings, "PORTFOLIO_LOGO_URL", None)
-
-            email_subject = f"[Portfólio] Nova mensagem de {name}: {subject}"
-
-            # Texto puro (fallback)
-            text_content = (
-                "Você recebeu uma nova mensagem pelo portfólio.\n\n"
-                f"Nome: {name}\n"
-                f"E-mail: {email}\n"
-                f"Assunto: {subject}\n\n"
-                "Mensagem:\n"
-                f"{message}\n"
-            )
-
-            # HTML estiloso
-            html_content = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-  <head>
-    <meta charset="UTF-8" />
-    <title>Nova mensagem de contato</title>
-  </head>
-  <body style="margin:0;padding:0;background-color:#0b1120;font-family:system-ui,-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="padding:24px 0;">
-      <tr>
-        <td align="center">
-          <table width="600" cellpadding="0" cellspacing="0" style="background-color:#020617;border-radius:16px;border:1px solid #1f2937;overflow:hidden;">
-            <tr>
-              <td style="padding:16px 24px;border-bottom:1px solid #1f2937;background:linear-gradient(135deg,#0ea5e9,#6366f1);">
-                <table width="100%">
-                  <tr>
-                    <td align="left" style="color:#f9fafb;font-size:16px;font-weight:600;">
-                      Portfólio · Erik Ingleson
-                    </td>
-                    <td align="right">
-                      {"<img src='" + logo_url + "' alt='Logo' style='max-height:32px;display:block;' />" if logo_url else ""}
-                    </td>
-                  </tr>
-                </table>
-              </td>
-            </tr>
-
-            <tr>
-              <td style="padding:24px;">
-                <h1 style="margin:0 0 12px;font-size:20px;color:#e5e7eb;">
-                  Nova mensagem de contato
-                </h1>
-                <p style="margin:0 0 16px;font-size:14px;color:#9ca3af;line-height:1.6;">
-                  Você recebeu uma nova mensagem pelo formulário de contato do seu portfólio.
-                </p>
-
-                <table cellpadding="0" cellspacing="0" style="width:100%;margin-bottom:16px;font-size:14px;color:#e5e7eb;">
-                  <tr>
-                    <td style="padding:4px 0;width:120px;color:#9ca3af;">Nome:</td>
-                    <td style="padding:4px 0;">{name}</td>
-                  </tr>
-                  <tr>
-                    <td style="padding:4px 0;width:120px;color:#9ca3af;">E-mail:</td>
-                    <td style="padding:4px 0;">
-                      <a href="mailto:{email}" style="color:#38bdf8;text-decoration:none;">{email}</a>
-                    </td>
-                  </tr>
-                  <tr>
-                    <td style="padding:4px 0;width:120px;color:#9ca3af;">Assunto:</td>
-                    <td style="padding:4px 0;">{subject}</td>
-                  </tr>
-                </table>
-
-                <div style="margin-top:16px;">
-                  <p style="margin:0 0 8px;font-size:14px;color:#9ca3af;">Mensagem:</p>
-                  <div style="background-color:#020617;border-radius:8px;border:1px solid #1f2937;padding:16px;color:#e5e7eb;font-size:14px;line-height:1.6;white-space:pre-wrap;">
-                    {message}
-                  </div>
-                </div>
-              </td>
-            </tr>
-
-            <tr>
-              <td style="padding:16px 24px;border-top:1px solid #1f2937;text-align:center;font-size:12px;color:#6b7280;">
-                Enviado automaticamente pelo portfólio de Erik Ingleson.
-              </td>
-            </tr>
-          </table>
-        </td>
-      </tr>
-    </table>
-  </body>
-</html>
-"""
+            prefilter = get_prefilter()
+            verdict = prefilter.check(name, email, subject, message)
+            if verdict.verdict == DUPLICATE:
+                return api_error("Mensagem duplicada.", status=409)
+            if verdict.verdict == SPAM:
+                return api_error("Mensagem rejeitada pelo filtro de spam.", status=400)
 
             try:
-                msg = EmailMultiAlternatives(
-                    subject=email_subject,
-                    body=text_content,
-                    from_email=owner_email,
-                    to=[owner_email],
+                if settings.CONTACT_INGEST_MODE == "journal":
+                    journal_id = get_journal().append(data)
+                else:
+                    # Já validado acima: dispensa o full_clean(). A mensagem, os
+                    # contadores e a contagem diária (post_save) entram juntos.
+                    with transaction.atomic():
+                        contact = ContactMessage.objects.create(
+                            name=name,
+                            email=email,
+                            subject=subject,
+                            message=message,
+                        )
+            except Exception:
+                # Não gravou: o reenvio do usuário não pode virar "duplicada".
+                prefilter.release(verdict)
+                raise
+            prefilter.record(verdict)
+
+            if settings.CONTACT_INGEST_MODE == "journal":
+                return JsonResponse(
+                    {"status": "accepted", "journal_id": journal_id}, status=202
                 )
-                msg.attach_alternative(html_content, "text/html")
-                msg.send()
+
+            try:
+                contact_email(name, email, subject, message).send()
             except Exception as mail_exc:
                 # Se o e-mail falhar, o contato continua salvo
                 return api_error(
@@ -220,63 +219,82 @@ class ContactCreateView(View):
 
 
 
+# ---------- Lote de requisições ----------
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def batch_requests(request):
+    """
+    Executa vários GETs da API em uma única ida e volta (core.batch).
+
+    Corpo: {"requests": [{"id": "perfil", "path": "/api/profile/"},
+    {"id": "destaques", "path": "/api/projects/?highlight=true"}]}.
+    Resposta: {"responses": [{"id", "status", "body"}]}, na mesma ordem; um
+    sub-request com erro não derruba os outros.
+    """
+    content_type = request.META.get("CONTENT_TYPE", "")
+    if content_type.split(";", 1)[0].strip().lower() != "application/json":
+        return api_error("Content-Type deve ser application/json.", status=415)
+
+    max_bytes = settings.BATCH_MAX_BODY_BYTES
+    raw_body = request.read(max_bytes + 1)
+    if len(raw_body) > max_bytes:
+        return api_error("Lote muito grande.", status=413)
+
+    try:
+        items = parse_batch(json.loads(raw_body), settings.BATCH_MAX_REQUESTS)
+    except ValueError as exc:
+        message = str(exc) if isinstance(exc, BatchError) else "JSON inválido."
+        return api_error(message, status=400)
+
+    try:
+        return HttpResponse(run_batch(request, items), content_type="application/json")
+    except Exception as exc:
+        return api_error(
+            "Erro ao executar o lote.",
+            status=500,
+            extra={"detail": str(exc)},
+        )
+
+
 # ---------- Views baseadas em função (listas simples) ----------
 
+def _requested_sections(request) -> list:
+    # Blocos de ?sections= (ou todos); nomes inválidos já deram 400. Sempre
+    # inclui "sections": o SectionConfig decide quais blocos saem e a ordem.
+    if "sections" not in request.GET:
+        return list(SECTION_BUILDERS)
+    names = {name.strip() for name in request.GET["sections"].split(",")} | {"sections"}
+    return [name for name in SECTION_BUILDERS if name in names]
+
+
 @require_http_methods(["GET"])
+@edge_cached("content", _requested_sections)
 def portfolio_full(request):
     """
     Retorna todos os dados do portfólio em uma única resposta JSON.
+    O corpo vem pronto de core.payloads (cacheado por idioma e versão de
+    conteúdo, já comprimido). Seções desabilitadas no SectionConfig ficam de
+    fora; ?sections=projects,skills limita a resposta aos blocos pedidos.
     """
-    try:
-        profile = UserProfile.objects.first()
-        profile_data = user_profile_to_dict(profile) if profile else None
-
-        sections = [
-            section_config_to_dict(s)
-            for s in SectionConfig.objects.all().order_by("order_index")
-        ]
-        skills = [
-            skill_to_dict(s)
-            for s in Skill.objects.all().order_by("order_index", "name")
-        ]
-        experiences = [
-            experience_to_dict(e)
-            for e in Experience.objects.all().order_by("order_index", "-start_date")
-        ]
-        certifications = [
-            certification_to_dict(c)
-            for c in Certification.objects.all().order_by("order_index", "-issue_date")
-        ]
-        education_list = [
-            education_to_dict(e)
-            for e in Education.objects.all().order_by("order_index", "-start_date")
-        ]
-        services = [
-            service_to_dict(s)
-            for s in Service.objects.all().order_by("order_index", "title")
-        ]
-        languages = [
-            language_to_dict(l)
-            for l in Language.objects.all().order_by("order_index", "name")
-        ]
-        projects = [
-            project_to_dict(p)
-            for p in Project.objects.all().order_by("-created_at")
-        ]
-
-        data = {
-            "profile": profile_data,
-            "sections": sections,
-            "skills": skills,
-            "experiences": experiences,
-            "certifications": certifications,
-            "education": education_list,
-            "services": services,
-            "languages": languages,
-            "projects": projects,
-        }
-        return JsonResponse(data, status=200)
+    selected = None
+    if "sections" in request.GET:
+        selected = {name.strip() for name in request.GET["sections"].split(",") if name.strip()}
+        unknown = selected - set(SECTION_BUILDERS)
+        if not selected or unknown:
+            return api_error(
+                "Parâmetro 'sections' inválido.",
+                status=400,
+                extra={
+                    "unknown": sorted(unknown),
+                    "allowed": list(SECTION_BUILDERS),
+                },
+            )
 
+    try:
+        return payload_response(
+            request, portfolio_payload(request_locale(request), selected)
+        )
     except Exception as exc:
         return api_error(
             "Erro ao carregar dados completos do portfólio.",
@@ -286,6 +304,25 @@ def portfolio_full(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("stats", STATS_SCOPES)
+def portfolio_stats(request):
+    """
+    Estatísticas agregadas: tempo de experiência e de estudo (períodos
+    sobrepostos contam uma vez), habilidades por categoria e validade das
+    certificações.
+    """
+    try:
+        return payload_response(request, stats_payload())
+    except Exception as exc:
+        return api_error(
+            "Erro ao calcular estatísticas do portfólio.",
+            status=500,
+            extra={"detail": str(exc)},
+        )
+
+
+@require_http_methods(["GET"])
+@edge_cached("content", ["profile"])
 def profile_detail(request):
     try:
         profile = UserProfile.objects.first()
@@ -301,6 +338,7 @@ def profile_detail(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["skills"])
 def skills_list(request):
     skills = Skill.objects.all().order_by("order_index", "name")
     data = [skill_to_dict(s) for s in skills]
@@ -308,6 +346,7 @@ def skills_list(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["experiences"])
 def experience_list(request):
     experiences = Experience.objects.all().order_by("order_index", "-start_date")
     data = [experience_to_dict(e) for e in experiences]
@@ -315,6 +354,7 @@ def experience_list(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["certifications"])
 def certifications_list(request):
     certs = Certification.objects.all().order_by("order_index", "-issue_date")
     data = [certification_to_dict(c) for c in certs]
@@ -322,6 +362,7 @@ def certifications_list(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["education"])
 def education_list(request):
     items = Education.objects.all().order_by("order_index", "-start_date")
     data = [education_to_dict(e) for e in items]
@@ -329,6 +370,7 @@ def education_list(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["services"])
 def services_list(request):
     services = Service.objects.all().order_by("order_index", "title")
     data = [service_to_dict(s) for s in services]
@@ -336,6 +378,7 @@ def services_list(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["languages"])
 def languages_list(request):
     langs = Language.objects.all().order_by("order_index", "name")
     data = [language_to_dict(l) for l in langs]
@@ -343,6 +386,7 @@ def languages_list(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["sections"])
 def sections_list(request):
     sections = SectionConfig.objects.all().order_by("order_index")
     data = [section_config_to_dict(s) for s in sections]
@@ -350,11 +394,12 @@ def sections_list(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["projects"])
 def projects_list(request):
     """
     Lista todos os projetos. Aceita filtro opcional ?highlight=true
     """
-    qs = Project.objects.all().order_by("-created_at")
+    qs = Project.objects.select_related("repo_metadata").prefetch_related("images").order_by("-created_at")
 
     highlight = request.GET.get("highlight")
     if highlight is not None:
@@ -366,13 +411,289 @@ def projects_list(request):
 
 
 @require_http_methods(["GET"])
+@edge_cached("content", ["projects"])
 def project_detail(request, slug: str):
     """
-    Detalhes de um projeto específico.
+    Detalhes de um projeto específico. Cacheado por slug e idioma
+    (core.payloads); slugs desconhecidos dão 404 sem consultar o banco.
     """
     try:
-        project = Project.objects.get(slug=slug)
+        payload = project_payload(slug, request_locale(request))
     except Project.DoesNotExist:
+        payload = None
+    if payload is None:
         raise Http404("Projeto não encontrado.")
 
-    return JsonResponse(project_to_dict(project), status=200)
+    return payload_response(request, payload)
+
+
+@require_http_methods(["GET"])
+@edge_cached("links")
+def links_health(request):
+    """
+    Resultado da última verificação das URLs externas (ver check_links).
+    Aceita filtro opcional ?status=ok|broken|error
+    """
+    qs = LinkHealth.objects.all()
+
+    status = request.GET.get("status")
+    if status is not None:
+        if status not in dict(LinkHealth.STATUS_CHOICES):
+            return api_error("Status inválido.", status=400)
+        qs = qs.filter(status=status)
+
+    data = [link_health_to_dict(l) for l in qs]
+    return JsonResponse(data, status=200, safe=False)
+
+
+@require_http_methods(["GET"])
+@edge_cached("content", SUGGEST_SCOPES)
+def suggest(request):
+    """
+    Autocomplete da busca: habilidades, projetos e empresas com alguma
+    palavra começando por ?prefix= (sem diferença de acentos e caixa).
+    ?limit= opcional, até SUGGEST_MAX_LIMIT. Respondido pelo índice em
+    memória de core.suggest, sem consulta ao banco.
+    """
+    prefix = request.GET.get("prefix", "")
+    if not prefix.strip():
+        return api_error("Informe o parâmetro 'prefix'.", status=400)
+    if len(prefix) > settings.SUGGEST_MAX_PREFIX:
+        return api_error(
+            f"'prefix' aceita no máximo {settings.SUGGEST_MAX_PREFIX} caracteres.", status=400
+        )
+
+    limit = settings.SUGGEST_LIMIT
+    if "limit" in request.GET:
+        try:
+            limit = int(request.GET["limit"])
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= settings.SUGGEST_MAX_LIMIT:
+            return api_error(
+                f"'limit' deve ser um inteiro entre 1 e {settings.SUGGEST_MAX_LIMIT}.", status=400
+            )
+
+    try:
+        results = suggestions(prefix, current_chain(), limit)
+    except Exception as exc:
+        return api_error("Erro ao buscar sugestões.", status=500, extra={"detail": str(exc)})
+    return JsonResponse({"prefix": prefix, "results": results}, status=200)
+
+
+# ---------- Instrumentação ----------
+
+@staff_member_required
+@require_http_methods(["GET"])
+def db_pool_stats(request):
+    """
+    Estatísticas dos pools de conexão (vazio se DB_POOL estiver desligado).
+    """
+    return JsonResponse(all_pool_metrics(), status=200)
+
+
+def _parse_moves(payload) -> list:
+    """
+    [{"id": 5, "after": 3}, {"id": 7, "before": 2}, {"id": 9, "to": "first"}]
+    -> [(pk, posição)] de core.ordering.
+    """
+    moves = payload.get("moves")
+    if not isinstance(moves, list) or not moves:
+        raise ReorderError("Informe 'moves' (lista) ou 'order' (todos os ids).")
+    parsed = []
+    for item in moves:
+        if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+            raise ReorderError("Cada movimento precisa de 'id' inteiro.")
+        if isinstance(item.get("after"), int):
+            position = ("after", item["after"])
+        elif isinstance(item.get("before"), int):
+            position = ("before", item["before"])
+        elif item.get("to") in (FIRST, LAST):
+            position = item["to"]
+        else:
+            raise ReorderError(
+                "Cada movimento precisa de 'after' ou 'before' (id) ou 'to' (first/last)."
+            )
+        parsed.append((item["id"], position))
+    return parsed
+
+
+@staff_member_required
+@require_http_methods(["POST"])
+def reorder_section(request, section: str):
+    """
+    Reordena os itens de uma seção (core.ordering).
+
+    Corpo: {"moves": [{"id": 5, "after": 3}, {"id": 9, "to": "first"}]}
+    (normalmente grava uma linha por movimento) ou {"order": [ids...]} com
+    a ordem completa (um bulk_update). Só o cache da seção é invalidado.
+    """
+    model = ORDERED_MODELS.get(section)
+    if model is None:
+        return api_error(
+            "Seção inválida.", status=404, extra={"allowed": list(ORDERED_MODELS)}
+        )
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return api_error("JSON inválido.", status=400)
+    if not isinstance(payload, dict):
+        return api_error("JSON inválido.", status=400)
+
+    try:
+        if "order" in payload:
+            pks = payload["order"]
+            if not isinstance(pks, list) or not all(isinstance(pk, int) for pk in pks):
+                raise ReorderError("'order' deve ser uma lista de ids.")
+            result = set_order(model, pks)
+        else:
+            result = move(model, _parse_moves(payload))
+    except ReorderError as exc:
+        return api_error(str(exc), status=400)
+
+    return JsonResponse(result, status=200)
+
+
+@staff_member_required
+@require_http_methods(["GET"])
+def profiles_list(request):
+    """
+    Perfis de requisição guardados (core.profiling), do mais recente ao
+    mais antigo.
+    """
+    return JsonResponse(list_profiles(), status=200, safe=False)
+
+
+@staff_member_required
+@require_http_methods(["GET"])
+def profile_download(request, profile_id: int):
+    """
+    Baixa um perfil no formato do pstats (.prof); ?format=text devolve o
+    resumo ordenado por tempo acumulado.
+    """
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise Http404("Perfil não encontrado.")
+
+    if request.GET.get("format") == "text":
+        header = f"{profile['method']} {profile['path']} -> {profile['status']} em {profile['duration_ms']} ms\n\n"
+        return HttpResponse(header + profile["summary"], content_type="text/plain; charset=utf-8")
+
+    response = HttpResponse(profile["stats"], content_type="application/octet-stream")
+    response["Content-Disposition"] = f'attachment; filename="profile-{profile_id}.prof"'
+    return response
+
+
+def _stats_range(request):
+    """
+    (início, fim) de ?start=&end= (AAAA-MM-DD); padrão: os últimos
+    CONTACT_STATS_DEFAULT_DAYS dias. Levanta ValueError se inválido.
+    """
+    end = request.GET.get("end")
+    end = date.fromisoformat(end) if end else timezone.localdate()
+    start = request.GET.get("start")
+    if start:
+        start = date.fromisoformat(start)
+    else:
+        start = end - timedelta(days=settings.CONTACT_STATS_DEFAULT_DAYS - 1)
+    if start > end:
+        raise ValueError("'start' deve ser anterior a 'end'.")
+    if (end - start).days >= settings.CONTACT_STATS_MAX_DAYS:
+        raise ValueError(f"Intervalo máximo: {settings.CONTACT_STATS_MAX_DAYS} dias.")
+    return start, end
+
+
+@staff_member_required
+@require_http_methods(["GET"])
+def contact_stats(request):
+    """
+    Mensagens de contato por dia ou semana (?bucket=day|week), com total,
+    lidas e não lidas, lidas da contagem diária (core.rollups): o custo
+    depende só do intervalo, não do tamanho de contact_message.
+    """
+    bucket = request.GET.get("bucket", DAY)
+    if bucket not in BUCKETS:
+        return api_error("Agrupamento inválido.", status=400, extra={"allowed": list(BUCKETS)})
+    try:
+        start, end = _stats_range(request)
+    except ValueError as exc:
+        return api_error("Intervalo inválido.", status=400, extra={"detail": str(exc)})
+
+    items = series(start, end, bucket)
+    start, end = bucket_range(start, end, bucket)
+    return JsonResponse(
+        {
+            "bucket": bucket,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "total": sum(item["total"] for item in items),
+            "unread": sum(item["unread"] for item in items),
+            "series": items,
+        },
+        status=200,
+    )
+
+
+@staff_member_required
+@require_http_methods(["POST"])
+def contact_stats_reconcile(request):
+    """
+    Recalcula a contagem diária a partir de contact_message no intervalo
+    (?start=&end=, padrão como em contact_stats; ?all=1 para a tabela toda)
+    e corrige as divergências. ?dry_run=1 só as lista.
+    """
+    try:
+        start, end = (None, None) if request.GET.get("all") == "1" else _stats_range(request)
+    except ValueError as exc:
+        return api_error("Intervalo inválido.", status=400, extra={"detail": str(exc)})
+    fix = request.GET.get("dry_run") != "1"
+    try:
+        differences = reconcile(start, end, fix=fix)
+    except Exception as exc:
+        return api_error(
+            "Erro ao recalcular a contagem diária.", status=500, extra={"detail": str(exc)}
+        )
+    return JsonResponse(
+        {
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+            "fixed": fix,
+            "differences": differences,
+        },
+        status=200,
+    )
+
+
+@require_http_methods(["GET", "HEAD"])
+def health_live(request):
+    """
+    Liveness: o processo responde. Não toca em nenhuma dependência.
+    """
+    return HttpResponse(b'{"status": "ok"}', content_type="application/json")
+
+
+@require_http_methods(["GET", "HEAD"])
+def health_ready(request):
+    """
+    Readiness: banco(s), cache e SMTP, com latência e percentis, segundo a
+    última rodada do prober em segundo plano (core.health). Só lê memória;
+    503 se uma dependência obrigatória estiver fora. Sem detalhes de erro
+    (ver health_detail).
+    """
+    ready, body = readiness()
+    response = HttpResponse(body, content_type="application/json", status=200 if ready else 503)
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@staff_member_required
+@require_http_methods(["GET"])
+def health_detail(request):
+    """
+    O mesmo resultado do readiness com as mensagens de erro de cada
+    dependência e as métricas dos pools (fora do endpoint público).
+    """
+    ready, detail = readiness_detail()
+    response = JsonResponse(detail, status=200 if ready else 503)
+    add_never_cache_headers(response)
+    return response
@@ -0,0 +1,122 @@
+# core/warmup.py
+"""
+Aquecimento dos processos do gunicorn (ver gunicorn.conf.py).
+
+- warm_up_master(): roda uma vez no master com preload_app, antes do fork.
+  Importa views/admin, compila o URL resolver e deixa o payload do
+  portfólio no cache; tudo isso é herdado pelos workers (copy-on-write).
+- warm_up_worker(): roda em cada worker logo após o fork. Abre as conexões
+  com o banco e carrega o payload e os slugs de projeto na memória do
+  processo, para que a primeira requisição não pague por isso, e inicia o
+  prober do readiness (core.health) e, no modo journal, o journal de
+  contato (que já reprocessa os segmentos órfãos de um crash ou restart).
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def _compile_urls(resolver=None) -> int:
+    """
+    Força a compilação das regex de todas as rotas.
+    """
+    resolver = resolver or get_resolver()
+    count = 0
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex  # compila e memoriza
+        if hasattr(pattern, "url_patterns"):
+            count += _compile_urls(pattern)
+        else:
+            count += 1
+    resolver._populate()
+    return count
+
+
+def _close_connections() -> None:
+    # Conexões (e pools) abertas no master não podem ser compartilhadas
+    # entre processos após o fork.
+    for conn in connections.all(initialized_only=True):
+        conn.close()
+        if getattr(conn, "pool", None) is not None:
+            conn.close_pool()
+
+
+def warm_up_master() -> dict:
+    timings = {}
+
+    start = time.perf_counter()
+    from django.contrib import admin  # noqa: F401
+    from core import admin as core_admin, views  # noqa: F401
+    timings["imports_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    routes = _compile_urls()
+    timings["urls_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    try:
+        from core.locales import supported_locales
+        from core.payloads import portfolio_payload
+
+        for locale in supported_locales():
+            portfolio_payload(locale)
+    except Exception:
+        logger.exception("Falha ao pré-serializar o payload do portfólio.")
+    finally:
+        _close_connections()
+    timings["payload_ms"] = (time.perf_counter() - start) * 1000
+
+    logger.info("Warm-up do master: %d rotas, %s", routes, timings)
+    return timings
+
+
+def warm_up_worker() -> dict:
+    timings = {}
+
+    start = time.perf_counter()
+    for alias in connections:
+        try:
+            connections[alias].ensure_connection()
+        except Exception:
+            logger.warning("Sem conexão com o banco %s no warm-up.", alias)
+    timings["db_connect_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    try:
+        from core.cache import get_version
+        from core.locales import supported_locales
+        from core.payloads import portfolio_payload, project_slugs
+
+        for locale in supported_locales():
+            portfolio_payload(locale)
+        project_slugs(get_version("projects"))
+    except Exception:
+        logger.exception("Falha ao carregar o payload do portfólio.")
+    timings["payload_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    try:
+        from core.suggest import get_index
+
+        get_index()
+    except Exception:
+        logger.exception("Falha ao montar o índice de sugestões.")
+    timings["suggest_ms"] = (time.perf_counter() - start) * 1000
+
+    from core.health import get_prober
+
+    get_prober()
+
+    if settings.CONTACT_INGEST_MODE == "journal":
+        from core.journal import get_journal
+
+        try:
+            get_journal()
+        except Exception:
+            logger.exception("Falha ao iniciar o journal de contato.")
+    return timings
@@ -0,0 +1,38 @@
+# gunicorn.conf.py
+"""
+Configuração do gunicorn.
+
+Com preload_app o app é importado uma vez no master e os workers nascem
+já aquecidos (core.warmup); novas réplicas e restarts não pagam o custo
+de importação e compilação nas primeiras requisições.
+
+Vale para server.wsgi (processo "web" do procfile) e para server.asgi com
+-k uvicorn.workers.UvicornWorker (processo "events", só para o SSE de
+/api/events/).
+"""
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+
+def when_ready(server):
+    # Com preload_app, roda no master depois de importar o app e antes do fork.
+    if preload_app:
+        from core.warmup import warm_up_master
+
+        server.log.info("warm-up master: %s", warm_up_master())
+
+
+def post_worker_init(worker):
+    # Já no worker, depois do fork e com o app carregado (com ou sem preload).
+    from core.warmup import warm_up_worker
+
+    worker.log.info("warm-up worker %s: %s", worker.pid, warm_up_worker())
+
+
+def worker_exit(server, worker):
+    # Restart/parada graciosa: grava o journal de contato antes de sair (a
+    # thread dele é daemon e morreria junto).
+    from core.journal import shutdown
+
+    shutdown()
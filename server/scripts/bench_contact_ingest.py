@@ -0,0 +1,73 @@
+"""
+Benchmark de CPU por requisição em /api/contact/ sob enxurrada de payloads
+grandes: caminho antigo (request.body + json.loads + full_clean) contra o
+atual (rejeição por Content-Length e core.validators).
+
+Uso: python manage.py shell -c "from scripts.bench_contact_ingest import run; run()"
+"""
+import json
+import time
+
+from django.test import RequestFactory
+
+from core.models import ContactMessage
+from core.validators import clean_contact_payload
+from core.views import ContactCreateView
+
+N = 2000
+
+factory = RequestFactory()
+
+
+def legacy_parse(request):
+    payload = json.loads(request.body.decode("utf-8"))
+    contact = ContactMessage(
+        name=payload.get("name", "").strip(),
+        email=payload.get("email", "").strip(),
+        subject=payload.get("subject", "").strip(),
+        message=payload.get("message", "").strip(),
+    )
+    contact.full_clean()
+
+
+def current_parse(request):
+    # O mesmo que a view faz antes do pré-filtro e do INSERT.
+    return ContactCreateView().post(request)
+
+
+def current_validate(request):
+    clean_contact_payload(json.loads(request.read()))
+
+
+def _measure(func, body):
+    requests = [
+        factory.post("/api/contact/", body, content_type="application/json")
+        for _ in range(N)
+    ]
+    start = time.process_time()
+    for request in requests:
+        try:
+            func(request)
+        except Exception:
+            pass
+    return (time.process_time() - start) / N * 1e6
+
+
+def run():
+    oversized = json.dumps({
+        "name": "Bot",
+        "email": "bot@example.com",
+        "subject": "Oferta",
+        "message": "x" * 1_000_000,
+    })
+    accepted = json.dumps({
+        "name": "Ana",
+        "email": "ana@example.com",
+        "subject": "Proposta",
+        "message": "Olá! Gostaria de conversar sobre um projeto. " * 20,
+    })
+
+    print(f"rejeitado (1 MB): antigo {_measure(legacy_parse, oversized):8.1f} µs"
+          f" | atual {_measure(current_parse, oversized):8.1f} µs")
+    print(f"aceito (parse+validação): antigo {_measure(legacy_parse, accepted):8.1f} µs"
+          f" | atual {_measure(current_validate, accepted):8.1f} µs")
@@ -0,0 +1,132 @@
+"""
+Modo journal de /api/contact/ (core.journal):
+
+1. Vazão: N envios pela view no modo direto (um INSERT por requisição) e
+   no modo journal (fsync local + 202; INSERTs em lote em segundo plano),
+   com o número de transações de escrita de cada um.
+2. Crash e replay: um processo filho grava mensagens no journal e morre
+   com SIGKILL no meio de uma linha, sem ter gravado nada no banco. O
+   replay grava todas as mensagens confirmadas, descarta a linha
+   incompleta, ajusta os contadores e, rodado de novo sobre o mesmo
+   segmento (crash entre o commit e a remoção), não duplica nada.
+
+As mensagens criadas são apagadas no final.
+Uso: python manage.py shell -c "from scripts.bench_contact_journal import run; run()"
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core import inbox, journal
+from core.models import ContactMessage
+from core.views import ContactCreateView
+
+N = 300
+CRASH_RECORDS = 50
+SUBJECT = "bench-journal"
+
+factory = RequestFactory()
+
+CHILD = """
+import os, signal
+from core.journal import get_journal
+j = get_journal()
+for i in range({count}):
+    j.append({{"name": "Filho", "email": "filho@example.com", "subject": "{subject}",
+              "message": "Mensagem confirmada %d antes do crash." % i}})
+os.write(j._segment.fd, b'{{"journal_id": "incompleto", "name": "Cor')
+os.kill(os.getpid(), signal.SIGKILL)
+"""
+
+
+def _post(i: int, tag: str):
+    body = json.dumps({
+        "name": "Ana",
+        "email": f"ana{i}@example.com",
+        "subject": SUBJECT,
+        "message": f"Olá! Mensagem {tag} número {i} sobre um projeto novo.",
+    })
+    request = factory.post("/api/contact/", body, content_type="application/json")
+    return ContactCreateView.as_view()(request)
+
+
+def _writes(queries) -> int:
+    return sum(1 for q in queries if q["sql"].lstrip().upper().startswith(("INSERT", "UPDATE")))
+
+
+def _throughput(directory):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        statuses = {_post(i, "direta").status_code for i in range(N)}
+        elapsed = time.perf_counter() - start
+    print(f"  direto:  {elapsed / N * 1000:6.2f} ms/req  status {statuses}  "
+          f"escritas no banco: {_writes(queries)}")
+
+    with override_settings(CONTACT_INGEST_MODE="journal", CONTACT_JOURNAL_DIR=directory):
+        start = time.perf_counter()
+        statuses = {_post(i, "journal").status_code for i in range(N)}
+        elapsed = time.perf_counter() - start
+        target = 2 * N
+        while ContactMessage.objects.filter(subject=SUBJECT).count() < target:
+            time.sleep(0.05)
+        drained = time.perf_counter() - start
+    print(f"  journal: {elapsed / N * 1000:6.2f} ms/req  status {statuses}  "
+          f"no banco após {drained:.2f} s, em lotes de até "
+          f"{settings.CONTACT_JOURNAL_BATCH_SIZE} (1 bulk_create + 1 UPDATE por lote)")
+
+
+def _crash_and_replay(directory):
+    env = {
+        **os.environ,
+        "CONTACT_JOURNAL_DIR": directory,
+        "CONTACT_JOURNAL_FLUSH_INTERVAL": "3600",
+    }
+    code = CHILD.format(count=CRASH_RECORDS, subject=SUBJECT)
+    child = subprocess.run(
+        [sys.executable, "manage.py", "shell", "-c", code],
+        cwd=settings.BASE_DIR, env=env, capture_output=True,
+    )
+    segments = [n for n in os.listdir(directory) if n.endswith(journal.SEGMENT_SUFFIX)]
+    print(f"  filho morto com sinal {-child.returncode}; segmentos deixados: {len(segments)}")
+
+    path = os.path.join(directory, segments[0])
+    kept = os.path.join(directory, "copia.bak")
+    shutil.copy(path, kept)
+
+    before = inbox.get_counters()
+    inserted = journal.replay_orphans(directory, batch_size=20)
+    after = inbox.get_counters()
+    print(f"  replay: {inserted} gravadas (esperado {CRASH_RECORDS}); "
+          f"contadores +{after.total_count - before.total_count} total, "
+          f"+{after.unread_count - before.unread_count} não lidas; "
+          f"segmento apagado: {not os.path.exists(path)}")
+
+    # Crash depois do commit e antes de apagar o segmento.
+    os.rename(kept, path)
+    again = journal.replay_orphans(directory, batch_size=20)
+    print(f"  replay repetido: {again} gravadas (esperado 0)")
+
+
+def run():
+    directory = tempfile.mkdtemp(prefix="contact-journal-")
+    try:
+        with override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+            CONTACT_PREFILTER_WINDOW=1,
+        ):
+            print(f"{N} envios:")
+            _throughput(directory)
+            print("crash e replay:")
+            _crash_and_replay(tempfile.mkdtemp(dir=directory))
+    finally:
+        inbox.delete_messages(ContactMessage.objects.filter(subject=SUBJECT))
+        shutil.rmtree(directory, ignore_errors=True)
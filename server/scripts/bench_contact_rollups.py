@@ -0,0 +1,147 @@
+"""
+Séries de /api/internal/contact-stats/ (core.rollups) com MESSAGES
+mensagens de teste espalhadas pelos últimos DAYS dias:
+
+1. Backfill (reconcile em janelas, como o comando backfill_contact_rollups).
+2. Série de 30 e de 365 dias, por dia e por semana: GROUP BY direto em
+   contact_message x leitura da contagem diária, com os mesmos números.
+3. Custo por mensagem do ajuste incremental no post_save (INSERTS
+   create() com e sem a contagem diária) e de marcar um lote como lido.
+4. Reconciliação da tabela inteira, sem divergências.
+
+Cria e apaga as mensagens de teste.
+Uso: python manage.py shell -c "from scripts.bench_contact_rollups import run; run()"
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core import inbox, rollups
+from core.models import ContactMessage
+
+MESSAGES = 200_000
+DAYS = 730
+INSERTS = 2000
+REPEAT = 20
+MARK = "bench-rollups"
+
+
+def _create(rng) -> None:
+    now = timezone.now()
+    batch = []
+    for i in range(MESSAGES):
+        batch.append(ContactMessage(
+            name=MARK, email="bench@example.com", subject=MARK, message=MARK,
+            is_read=rng.random() < 0.7,
+        ))
+        if len(batch) == 5000 or i == MESSAGES - 1:
+            with transaction.atomic():
+                created = ContactMessage.objects.bulk_create(batch)
+                inbox.adjust_counters(
+                    total=len(created), unread=sum(1 for m in created if not m.is_read)
+                )
+            batch = []
+    # created_at é auto_now_add: espalha depois, por fora da contagem diária
+    # (o backfill acerta).
+    pks = list(ContactMessage.objects.filter(subject=MARK).values_list("pk", flat=True))
+    rng.shuffle(pks)
+    per_hour = len(pks) // (DAYS * 24) + 1
+    with transaction.atomic():
+        for hour, start in enumerate(range(0, len(pks), per_hour)):
+            ContactMessage.objects.filter(pk__in=pks[start:start + per_hour]).update(
+                created_at=now - timedelta(hours=hour, minutes=rng.randrange(60))
+            )
+
+
+def _raw_series(start, end, bucket) -> dict:
+    # O que seria preciso sem a contagem diária.
+    by_day = rollups.recount(*rollups.bucket_range(start, end, bucket))
+    periods = {}
+    for (day, is_read), n in by_day.items():
+        period = rollups.week_start(day) if bucket == rollups.WEEK else day
+        counts = periods.setdefault(period, {"unread": 0, "read": 0})
+        counts["read" if is_read else "unread"] += n
+    return periods
+
+
+def _timed(fn, *args) -> tuple:
+    timings = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - t)
+    return result, sorted(timings)[len(timings) // 2] * 1000
+
+
+def _same(items, periods) -> bool:
+    return all(
+        periods.get(date.fromisoformat(item["period"]), {"unread": 0, "read": 0})
+        == {"unread": item["unread"], "read": item["read"]}
+        for item in items
+    )
+
+
+def _insert_ms(count: int) -> float:
+    t = time.perf_counter()
+    for _ in range(count):
+        ContactMessage.objects.create(
+            name=MARK, email="bench@example.com", subject=MARK, message=MARK
+        )
+    return (time.perf_counter() - t) * 1000 / count
+
+
+def run():
+    rng = random.Random(50)
+    start = time.perf_counter()
+    _create(rng)
+    print(f"{MESSAGES} mensagens em {DAYS} dias criadas em {time.perf_counter() - start:.1f} s")
+    try:
+        first, last = rollups.day_range()
+        start = time.perf_counter()
+        fixed = 0
+        day = first
+        while day <= last:
+            window_end = min(day + timedelta(days=30), last)
+            fixed += len(rollups.reconcile(day, window_end))
+            day = window_end + timedelta(days=1)
+        print(f"backfill: {fixed} contagens gravadas em {time.perf_counter() - start:.1f} s")
+
+        today = timezone.localdate()
+        for days in (30, 365):
+            for bucket in rollups.BUCKETS:
+                start_day = today - timedelta(days=days - 1)
+                items, rollup_ms = _timed(rollups.series, start_day, today, bucket)
+                periods, raw_ms = _timed(_raw_series, start_day, today, bucket)
+                print(f"  {days:3} dias / {bucket:4}: GROUP BY {raw_ms:7.2f} ms   "
+                      f"contagem diária {rollup_ms:6.2f} ms   "
+                      f"iguais: {'sim' if _same(items, periods) else 'NÃO'}")
+
+        with_rollups = _insert_ms(INSERTS)
+        adjust = rollups.adjust
+        rollups.adjust = lambda deltas: None
+        try:
+            without = _insert_ms(INSERTS)
+        finally:
+            rollups.adjust = adjust
+        print(f"insert (post_save): {without:.3f} ms sem, {with_rollups:.3f} ms com "
+              f"a contagem diária")
+        # As inseridas sem a contagem são a única divergência (e é corrigida).
+        print(f"  divergências de hoje: {rollups.reconcile(today, today)}")
+
+        pks = list(
+            ContactMessage.objects.filter(subject=MARK, is_read=False)
+            .values_list("pk", flat=True)[:5000]
+        )
+        t = time.perf_counter()
+        changed = inbox.set_read(ContactMessage.objects.filter(pk__in=pks), True)
+        print(f"marcar {changed} como lidas: {(time.perf_counter() - t) * 1000:.0f} ms")
+
+        t = time.perf_counter()
+        differences = rollups.reconcile(fix=False)
+        print(f"reconciliação completa: {len(differences)} divergência(s) em "
+              f"{(time.perf_counter() - t) * 1000:.0f} ms")
+    finally:
+        inbox.delete_messages(ContactMessage.objects.filter(subject=MARK))
@@ -0,0 +1,68 @@
+"""
+Benchmark de conexões sob carga em rajadas: uma conexão nova por
+requisição (sem pool, com o mesmo sslmode das settings) contra o pool do
+psycopg 3. Precisa de DATABASE_URL apontando para um PostgreSQL.
+
+Uso: python manage.py shell -c "from scripts.bench_db_pool import run; run()"
+"""
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg
+from django.db import connections
+from psycopg_pool import ConnectionPool
+
+BURSTS = 20
+BURST_SIZE = 16
+POOL_SIZE = 8
+
+
+def _connect_kwargs():
+    wrapper = connections["default"]
+    if wrapper.vendor != "postgresql":
+        raise SystemExit("Este benchmark precisa de PostgreSQL (DATABASE_URL).")
+    params = wrapper.get_connection_params()
+    params.pop("cursor_factory", None)
+    params.pop("context", None)
+    params.pop("prepare_threshold", None)
+    params.pop("server_side_binding", None)
+    return params
+
+
+def _run_bursts(handle_request):
+    latencies = []
+    with ThreadPoolExecutor(max_workers=BURST_SIZE) as executor:
+        for _ in range(BURSTS):
+            latencies.extend(executor.map(lambda _: handle_request(), range(BURST_SIZE)))
+            time.sleep(0.05)  # intervalo entre rajadas
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def run():
+    kwargs = _connect_kwargs()
+
+    def without_pool():
+        start = time.perf_counter()
+        with psycopg.connect(**kwargs) as conn:
+            conn.execute("SELECT 1").fetchone()
+        return (time.perf_counter() - start) * 1000
+
+    pool = ConnectionPool(kwargs=kwargs, min_size=POOL_SIZE, max_size=POOL_SIZE, open=True)
+    pool.wait()
+
+    def with_pool():
+        start = time.perf_counter()
+        with pool.connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+        return (time.perf_counter() - start) * 1000
+
+    try:
+        for label, func in (("sem pool", without_pool), ("com pool", with_pool)):
+            p50, p99 = _run_bursts(func)
+            print(f"{label}: p50 {p50:7.2f} ms | p99 {p99:7.2f} ms")
+        stats = pool.get_stats()
+        print(f"espera média no pool: {stats.get('requests_wait_ms', 0) / max(1, stats.get('requests_num', 1)):.2f} ms")
+    finally:
+        pool.close()
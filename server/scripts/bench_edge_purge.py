@@ -0,0 +1,101 @@
+"""
+Cache de borda (core.edgecache) contra um endpoint de purge local (stub
+HTTP que só registra os pedidos):
+
+1. Cabeçalhos Cache-Control / Surrogate-Key das rotas públicas.
+2. Alterações em models (save, tradução, delete, reordenação em massa)
+   geram purges só das chaves afetadas, agrupados pela thread do purger.
+
+Cria e apaga habilidades de teste.
+Uso: python manage.py shell -c "from scripts.bench_edge_purge import run; run()"
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import Client, override_settings
+
+from core import edgecache, ordering
+from core.models import Skill
+
+ROUTES = (
+    "/api/portfolio/",
+    "/api/portfolio/?sections=skills",
+    "/api/skills/",
+    "/api/projects/",
+    "/api/stats/",
+    "/api/links/health/",
+)
+
+
+class PurgeStandIn(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        self.received.append(
+            (self.headers.get("Surrogate-Key"), self.headers.get("Fastly-Key"))
+        )
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _wait_purges(count: int, timeout: float = 5.0) -> list:
+    deadline = time.monotonic() + timeout
+    while len(PurgeStandIn.received) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)  # pedidos agrupados que ainda estejam a caminho
+    received = list(PurgeStandIn.received)
+    PurgeStandIn.received.clear()
+    return received
+
+
+def run():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PurgeStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/purge"
+
+    client = Client(HTTP_HOST="localhost")
+    print("cabeçalhos:")
+    for route in ROUTES:
+        response = client.get(route)
+        print(f"  {route:34} {response.status_code}  {response.get('Cache-Control')}"
+              f"  | {response.get('Surrogate-Key')}")
+
+    edgecache.get_purger.cache_clear()
+    with override_settings(
+        EDGE_PURGER="core.edgecache.HTTPPurger",
+        EDGE_PURGE_URL=url,
+        EDGE_PURGE_TOKEN="stub-token",
+    ):
+        print("purges:")
+        others = [
+            Skill.objects.create(name=f"Bench vizinho {i}", category="backend")
+            for i in range(2)
+        ]
+        _wait_purges(2)
+        skill = Skill.objects.create(name="Bench purge", category="backend")
+        print(f"  criação:            {_wait_purges(1)}")
+
+        skill.translations = {"en": {"level": "Advanced"}}
+        skill.save()
+        print(f"  só tradução:        {_wait_purges(1)}")
+
+        ordering.move(Skill, [(skill.pk, ordering.FIRST)])
+        print(f"  reordenação:        {_wait_purges(1)}")
+
+        for i in range(20):
+            ordering.move(Skill, [(skill.pk, ordering.LAST if i % 2 else ordering.FIRST)])
+        purges = _wait_purges(20)
+        print(f"  20 reordenações:    {len(purges)} pedido(s) de purge (agrupados): {purges[:2]}")
+
+        skill.delete()
+        print(f"  exclusão:           {_wait_purges(1)}")
+        for other in others:
+            other.delete()
+        _wait_purges(2)
+    edgecache.get_purger.cache_clear()
+    server.shutdown()
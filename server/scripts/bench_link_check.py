@@ -0,0 +1,125 @@
+"""
+Benchmark do verificador de links contra servidores HTTP locais (stub):
+vários "hosts" (portas) com latência simulada, rotas que respondem 200,
+404, 405 só no HEAD e redirecionamento. Confere os resultados e compara
+com uma verificação sequencial (urllib, uma conexão por URL).
+
+Uso: python manage.py shell -c "from scripts.bench_link_check import run; run()"
+"""
+import asyncio
+import multiprocessing
+import time
+import urllib.error
+import urllib.request
+
+from core.linkcheck import LinkChecker
+from core.models import LinkHealth
+
+HOSTS = 10
+URLS = 5000
+LATENCY = 0.02
+SEQUENTIAL_SAMPLE = 100
+
+ROUTES = {
+    "ok": (200, LinkHealth.STATUS_OK),
+    "missing": (404, LinkHealth.STATUS_BROKEN),
+    "nohead": (200, LinkHealth.STATUS_OK),
+    "redirect": (200, LinkHealth.STATUS_OK),
+}
+
+
+class StubServer:
+    def __init__(self, connections, requests):
+        self.connections = connections
+        self.requests = requests
+
+    async def handle(self, reader, writer):
+        self.connections.value += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                method, target, _ = head.split(b"\r\n", 1)[0].decode().split(" ")
+                self.requests.value += 1
+                await asyncio.sleep(LATENCY)
+                route = target.strip("/").split("/")[0]
+                headers = ""
+                if route == "missing":
+                    status = "404 Not Found"
+                elif route == "nohead" and method == "HEAD":
+                    status = "405 Method Not Allowed"
+                elif route == "redirect":
+                    status = "301 Moved Permanently"
+                    headers = "Location: /ok/redirected\r\n"
+                else:
+                    status = "200 OK"
+                body = b"" if method == "HEAD" else b"stub"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n{headers}Content-Length: 4\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _serve(conn, connections, requests):
+    # Processo separado: servidor e verificador não disputam o GIL.
+    async def main():
+        stub = StubServer(connections, requests)
+        servers = [await asyncio.start_server(stub.handle, "127.0.0.1", 0) for _ in range(HOSTS)]
+        conn.send([server.sockets[0].getsockname()[1] for server in servers])
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def _start_servers():
+    connections = multiprocessing.Value("i", 0, lock=False)
+    requests = multiprocessing.Value("i", 0, lock=False)
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=_serve, args=(child, connections, requests), daemon=True
+    )
+    process.start()
+    return process, connections, requests, parent.recv()
+
+
+def _sequential(url):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=5) as r:
+            return r.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+def run():
+    process, connections, requests, ports = _start_servers()
+    routes = list(ROUTES)
+    urls = [
+        f"http://127.0.0.1:{ports[i % HOSTS]}/{routes[i % len(routes)]}/{i}"
+        for i in range(URLS)
+    ]
+
+    start = time.perf_counter()
+    for url in urls[:SEQUENTIAL_SAMPLE]:
+        _sequential(url)
+    sequential = (time.perf_counter() - start) / SEQUENTIAL_SAMPLE * URLS
+    connections.value = requests.value = 0
+
+    checker = LinkChecker(concurrency=100, per_host=6, timeout=5)
+    start = time.perf_counter()
+    results = asyncio.run(checker.check_all(urls))
+    elapsed = time.perf_counter() - start
+
+    wrong = [
+        r for r in results
+        if r.status != ROUTES[r.url.split("/")[3]][1]
+        or r.status_code != ROUTES[r.url.split("/")[3]][0]
+    ]
+    print(f"{URLS} URLs em {HOSTS} hosts, latência simulada de {LATENCY * 1000:.0f} ms")
+    print(f"  sequencial (estimado): {sequential:8.1f} s")
+    print(f"  assíncrono:            {elapsed:8.2f} s ({URLS / elapsed:,.0f} URLs/s)")
+    print(f"  requisições: {requests.value}, conexões abertas: {connections.value}")
+    print(f"  resultados incorretos: {len(wrong)}")
+    process.terminate()
@@ -0,0 +1,186 @@
+"""
+Payloads por worker (memória de cada processo) x arquivo compartilhado
+(core.payloadstore, PAYLOAD_STORE_ENABLED):
+
+WORKERS processos (python manage.py shell, com um FileBasedCache comum
+para as versões de conteúdo, como em produção) servem as mesmas rotas:
+/api/portfolio/ em cada idioma e /api/projects/<slug>/ de PROJECTS
+projetos de teste. Um worker sobe primeiro e os outros depois, como num
+restart parcial. Para cada modo:
+
+- tempo da primeira passada pelas rotas (warm-up) de cada worker;
+- latência das passadas seguintes (p50/p99 por requisição, Client);
+- memória de cada worker depois do warm-up, com todos vivos: RSS e PSS
+  (que divide as páginas compartilhadas entre os processos), como
+  acréscimo sobre o processo antes do warm-up.
+
+Cria e apaga os projetos de teste.
+Uso: python manage.py shell -c "from scripts.bench_payload_store import run; run()"
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+
+from core.models import Project
+
+WORKERS = 4
+# Abaixo do MAX_ENTRIES (300) do FileBasedCache, que senão descarta
+# chaves de versão e faz os workers remontarem tudo.
+PROJECTS = 100
+ROUNDS = 10
+SLUG_PREFIX = "bench-store-"
+RESULT = "RESULT "
+
+TEXT = (
+    "Plataforma de exemplo com Django, React e PostgreSQL, filas de tarefas, "
+    "cache por versão e observabilidade; descrição longa para o benchmark. "
+)
+
+
+def memory() -> dict:
+    values = {}
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key.lower()] = int(rest.split()[0])
+    return values
+
+
+def _routes() -> list:
+    from core.locales import supported_locales
+
+    slugs = Project.objects.filter(slug__startswith=SLUG_PREFIX).values_list("slug", flat=True)
+    return [f"/api/portfolio/?lang={locale}" for locale in supported_locales()] + [
+        f"/api/projects/{slug}/?lang={locale}"
+        for slug in slugs
+        for locale in supported_locales()
+    ]
+
+
+def worker():
+    """
+    Roda dentro de cada processo filho: warm-up, latência, espera o pai e
+    mede a memória.
+    """
+    from django.test import Client
+
+    client = Client(HTTP_HOST="localhost", HTTP_ACCEPT_ENCODING="br, gzip")
+    routes = _routes()
+    before = memory()
+
+    start = time.perf_counter()
+    for route in routes:
+        assert client.get(route).status_code == 200, route
+    warm_up = time.perf_counter() - start
+
+    timings = []
+    for _ in range(ROUNDS):
+        for route in routes:
+            start = time.perf_counter()
+            client.get(route)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    print("ready", flush=True)
+    sys.stdin.readline()  # todos os workers vivos e aquecidos
+    after = memory()
+    print(RESULT + json.dumps({
+        "warm_up_ms": warm_up * 1000,
+        "p50_us": statistics.median(timings) * 1e6,
+        "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+        "rss_kb": after["rss"] - before["rss"],
+        "pss_kb": after["pss"] - before["pss"],
+        "requests": len(routes),
+    }), flush=True)
+
+
+def _spawn(env):
+    return subprocess.Popen(
+        [sys.executable, "manage.py", "shell", "-c",
+         "from scripts.bench_payload_store import worker; worker()"],
+        cwd=settings.BASE_DIR, env=env, text=True,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+    )
+
+
+def _wait_ready(process) -> None:
+    line = process.stdout.readline()
+    if line.strip() != "ready":
+        raise RuntimeError(f"worker falhou: {line!r}")
+
+
+def _mode(label: str, env: dict) -> None:
+    first = _spawn(env)
+    _wait_ready(first)
+    others = [_spawn(env) for _ in range(WORKERS - 1)]
+    for process in others:
+        _wait_ready(process)
+
+    results = []
+    for process in [first, *others]:
+        process.stdin.write("\n")
+        process.stdin.flush()
+    for process in [first, *others]:
+        line = next(l for l in process.stdout if l.startswith(RESULT))
+        results.append(json.loads(line[len(RESULT):]))
+        process.wait()
+
+    print(f"{label}:")
+    for index, r in enumerate(results):
+        print(f"  worker {index}: warm-up {r['warm_up_ms']:7.1f} ms  "
+              f"p50 {r['p50_us']:6.0f} µs  p99 {r['p99_us']:6.0f} µs  "
+              f"RSS +{r['rss_kb'] / 1024:5.1f} MB  PSS +{r['pss_kb'] / 1024:5.1f} MB")
+    print(f"  total: PSS +{sum(r['pss_kb'] for r in results) / 1024:.1f} MB "
+          f"em {WORKERS} workers, {results[0]['requests']} rotas")
+
+
+def run():
+    directory = tempfile.mkdtemp(prefix="payload-store-")
+    Project.objects.bulk_create([
+        Project(
+            title=f"Projeto de benchmark {i}",
+            slug=f"{SLUG_PREFIX}{i}",
+            short_description=TEXT,
+            long_description=TEXT * 20,
+            translations={"en": {
+                "title": f"Benchmark project {i}",
+                "short_description": TEXT.upper(),
+                "long_description": TEXT.upper() * 20,
+            }},
+        )
+        for i in range(PROJECTS)
+    ])
+    # bulk_create não passa pelos sinais que mudam a versão dos projetos.
+    from core.cache import bump_versions
+
+    bump_versions("projects")
+    try:
+        base = {
+            **os.environ,
+            "CACHE_BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "PAYLOAD_STORE_PATH": os.path.join(directory, "payloads.bin"),
+        }
+        _mode("por worker", {
+            **base,
+            "CACHE_LOCATION": os.path.join(directory, "cache-worker"),
+            "PAYLOAD_STORE_ENABLED": "False",
+        })
+        _mode("compartilhado (mmap)", {
+            **base,
+            "CACHE_LOCATION": os.path.join(directory, "cache-shared"),
+            "PAYLOAD_STORE_ENABLED": "True",
+        })
+        path = os.path.join(directory, "payloads.bin")
+        print(f"arquivo: {os.path.getsize(path) // 1024} KB aparentes (esparso), "
+              f"{os.stat(path).st_blocks * 512 // 1024} KB em disco")
+    finally:
+        Project.objects.filter(slug__startswith=SLUG_PREFIX).delete()
+        shutil.rmtree(directory, ignore_errors=True)
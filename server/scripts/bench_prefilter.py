@@ -0,0 +1,43 @@
+"""
+Benchmark do pré-filtro de contato (core.spamfilter), sem o cache
+compartilhado: mensagens novas (check + record, como na view) e depois as
+mesmas de novo (todas duplicadas).
+
+Uso: python manage.py shell -c "from scripts.bench_prefilter import run; run()"
+"""
+import time
+
+from core.spamfilter import ContactPrefilter
+
+N = 200_000
+
+
+def run():
+    prefilter = ContactPrefilter(
+        window=3600,
+        capacity=N,
+        error_rate=0.001,
+        spam_threshold=4,
+        use_shared_cache=False,
+    )
+    payloads = [
+        (
+            f"Visitante {i}",
+            f"visitante{i % 5000}@example.com",
+            f"Proposta {i % 97}",
+            f"Olá, gostaria de conversar sobre o projeto número {i}.",
+        )
+        for i in range(N)
+    ]
+
+    start = time.perf_counter()
+    for payload in payloads:
+        prefilter.record(prefilter.check(*payload))
+    first_pass = time.perf_counter() - start
+
+    start = time.perf_counter()
+    duplicates = sum(not prefilter.check(*payload).accepted for payload in payloads)
+    second_pass = time.perf_counter() - start
+
+    print(f"novos:      {N / first_pass:,.0f} checks/s")
+    print(f"duplicados: {N / second_pass:,.0f} checks/s ({duplicates}/{N} detectados)")
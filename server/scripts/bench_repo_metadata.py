@@ -0,0 +1,119 @@
+"""
+Benchmark do enriquecimento de repositórios contra uma API GitHub local
+(stub, com latência simulada e suporte a ETag): primeira execução
+(respostas 200) e revalidação (respostas 304), com e sem concorrência.
+Tudo roda dentro de uma transação desfeita no final.
+
+Uso: python manage.py shell -c "from scripts.bench_repo_metadata import run; run()"
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import time
+
+from django.db import transaction
+from django.test import override_settings
+
+from core.models import Project, RepositoryMetadata
+from core.repometa import run_enrichment
+
+REPOS = 200
+LATENCY = 0.05
+
+
+async def _handle(reader, writer, counters):
+    try:
+        while True:
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            lines = head.split("\r\n")
+            path = lines[0].split(" ")[1]
+            headers = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+            await asyncio.sleep(LATENCY)
+            parts = path.strip("/").split("/")  # repos/<dono>/<nome>[/languages]
+            if parts[2].startswith("missing"):
+                status, body = "404 Not Found", {"message": "Not Found"}
+            elif len(parts) == 4:
+                status, body = "200 OK", {"Python": 5000, "TypeScript": 9000}
+            else:
+                status, body = "200 OK", {
+                    "full_name": f"{parts[1]}/{parts[2]}",
+                    "description": "stub",
+                    "html_url": f"https://github.com/{parts[1]}/{parts[2]}",
+                    "stargazers_count": len(parts[2]),
+                    "forks_count": 1,
+                    "language": "Python",
+                    "pushed_at": "2024-05-01T12:00:00Z",
+                }
+            data = json.dumps(body).encode()
+            etag = '"%s"' % hashlib.md5(data).hexdigest()
+            if status.startswith("200") and headers.get("If-None-Match") == etag:
+                status, data = "304 Not Modified", b""
+            counters[status[:3]] = counters.get(status[:3], 0) + 1
+            writer.write(
+                f"HTTP/1.1 {status}\r\nETag: {etag}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _serve(conn):
+    async def main():
+        counters = {}
+        server = await asyncio.start_server(
+            lambda r, w: _handle(r, w, counters), "127.0.0.1", 0
+        )
+        conn.send(server.sockets[0].getsockname()[1])
+        loop = asyncio.get_running_loop()
+        while True:
+            # Pedido de contadores pelo pipe: responde e zera.
+            await loop.run_in_executor(None, conn.recv)
+            conn.send(dict(counters))
+            counters.clear()
+
+    asyncio.run(main())
+
+
+def run():
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve, args=(child,), daemon=True)
+    process.start()
+    base_url = f"http://127.0.0.1:{parent.recv()}"
+
+    def counters():
+        parent.send(None)
+        return parent.recv()
+
+    with transaction.atomic():
+        for i in range(REPOS):
+            name = f"missing-{i}" if i % 50 == 0 else f"repo-{i}"
+            Project.objects.create(
+                title=f"Bench {i}",
+                slug=f"bench-repo-{i}",
+                short_description="bench",
+                repo_url=f"https://github.com/bench/{name}",
+            )
+
+        for concurrency in (1, 16):
+            RepositoryMetadata.objects.filter(project__slug__startswith="bench-repo-").delete()
+            with override_settings(
+                REPO_METADATA_API_URL=base_url, REPO_METADATA_CONCURRENCY=concurrency
+            ):
+                print(f"concorrência {concurrency}:")
+                for label, force in (("primeira consulta", False), ("revalidação", True)):
+                    summary = run_enrichment(force=force)
+                    print(f"  {label:18} {summary['seconds']:6.2f} s  "
+                          f"respostas: {counters()}  resultado: "
+                          f"{summary['updated']} atualizados, {summary['not_modified']} "
+                          f"sem mudança, {summary['not_found']} não encontrados")
+
+        stars = RepositoryMetadata.objects.filter(
+            project__slug="bench-repo-1", found=True
+        ).values_list("stars", flat=True)
+        print(f"conferência: estrelas de bench/repo-1 = {list(stars)}")
+        transaction.set_rollback(True)
+    process.terminate()
@@ -0,0 +1,203 @@
+"""
+Single-flight (core.singleflight) sob concorrência, com o cache no banco
+(DatabaseCache, add atômico) comum a PROCESSES processos de THREADS
+threads cada:
+
+A cada rodada o pai invalida blocos (bump_versions) e todos os chamadores
+pedem /api/portfolio/ (portfolio_payload) ao mesmo tempo. Cada processo
+conta quantas vezes montou cada bloco e o payload completo, e quantos
+chamadores receberam a versão anterior (stale) ou esperaram a nova.
+
+- rodada fria: nenhum payload no cache (as versões já existem), ninguém
+  tem versão anterior para servir;
+- "skills": só o bloco de habilidades muda;
+- todos os blocos mudam.
+
+Com single-flight cada bloco invalidado e o payload completo são montados
+exatamente uma vez por rodada. A última parte repete as rodadas sem
+single-flight (cada chamador que não acha a chave monta), para comparar.
+
+Uso: python manage.py shell -c "from scripts.bench_single_flight import run; run()"
+"""
+import collections
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+
+from core.cache import bump_versions, get_versions
+from core.locales import default_locale, fallback_chain
+
+PROCESSES = 4
+THREADS = 8
+TABLE = "bench_single_flight_cache"
+RESULT = "RESULT "
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": TABLE,
+    }
+}
+
+
+def _serialize_sqlite_writes():
+    # No SQLite, add/set concorrentes do DatabaseCache falham calados
+    # (SQLITE_BUSY ao promover a trava de leitura); com BEGIN IMMEDIATE as
+    # escritas esperam a vez.
+    if connection.vendor == "sqlite":
+        settings.DATABASES["default"].setdefault("OPTIONS", {})["transaction_mode"] = "IMMEDIATE"
+        connection.close()
+
+
+def _count_builds(payloads, counts, lock):
+    def counting(name, build):
+        def wrapped(*args):
+            with lock:
+                counts[name] += 1
+            return build(*args)
+        return wrapped
+
+    for name, build in list(payloads.SECTION_BUILDERS.items()):
+        payloads.SECTION_BUILDERS[name] = counting(name, build)
+    payloads.compress = counting("(payload completo)", payloads.compress)
+
+
+def _without_single_flight(payloads):
+    # Comportamento sem a trava: quem não acha a chave monta e grava.
+    from django.core.cache import cache
+
+    from core.singleflight import Flight
+
+    def naive(key, build, timeout, stale=None):
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            cache.set(key, value, timeout)
+        return Flight(value, False)
+
+    payloads.single_flight = naive
+
+
+def worker():
+    """
+    Roda em cada processo filho: uma rodada por linha recebida no stdin.
+    """
+    from django.db import close_old_connections
+
+    from core import payloads
+
+    _serialize_sqlite_writes()
+    counts = collections.Counter()
+    lock = threading.Lock()
+    _count_builds(payloads, counts, lock)
+    if os.environ.get("BENCH_NO_SINGLE_FLIGHT") == "True":
+        _without_single_flight(payloads)
+    locale = default_locale()
+
+    print("ready", flush=True)
+    for _ in sys.stdin:
+        counts.clear()
+        outcomes = collections.Counter()
+        waits = []
+        barrier = threading.Barrier(THREADS)
+
+        def call():
+            barrier.wait()
+            start = time.perf_counter()
+            payload = payloads.portfolio_payload(locale)
+            elapsed = time.perf_counter() - start
+            with lock:
+                outcomes["stale" if payload.stale else "atual"] += 1
+                waits.append(elapsed)
+            close_old_connections()
+
+        threads = [threading.Thread(target=call) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(RESULT + json.dumps({
+            "builds": counts, "outcomes": outcomes, "max_ms": max(waits) * 1000,
+        }), flush=True)
+
+
+def _round(processes, label, scopes) -> None:
+    if scopes:
+        bump_versions(*scopes)
+    for process in processes:
+        process.stdin.write("go\n")
+        process.stdin.flush()
+    builds = collections.Counter()
+    outcomes = collections.Counter()
+    slowest = 0.0
+    for process in processes:
+        line = next(l for l in process.stdout if l.startswith(RESULT))
+        result = json.loads(line[len(RESULT):])
+        builds.update(result["builds"])
+        outcomes.update(result["outcomes"])
+        slowest = max(slowest, result["max_ms"])
+    once = "sim" if set(builds.values()) == {1} else "não"
+    print(f"  {label:24} montagens: {dict(sorted(builds.items()))}")
+    print(f"  {'':24} uma por chave: {once}; chamadores: {dict(outcomes)}, "
+          f"mais lento {slowest:.0f} ms")
+
+
+def _series(title: str, env: dict) -> None:
+    # Versões criadas antes, como num sistema em uso: a rodada fria mede só
+    # os payloads.
+    from core.payloads import SECTION_BUILDERS, _scopes
+
+    chain = fallback_chain(default_locale())
+    get_versions([scope for name in SECTION_BUILDERS for scope in _scopes(name, chain)])
+
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "manage.py", "shell", "-c",
+             "from scripts.bench_single_flight import worker; worker()"],
+            cwd=settings.BASE_DIR, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        for _ in range(PROCESSES)
+    ]
+    for process in processes:
+        if process.stdout.readline().strip() != "ready":
+            raise RuntimeError("worker falhou ao iniciar")
+
+    print(f"{title} ({PROCESSES} processos x {THREADS} threads):")
+    _round(processes, "fria", ())
+    _round(processes, "bump skills", ("skills",))
+    _round(processes, "bump skills (de novo)", ("skills",))
+    _round(processes, "bump de todos os blocos", ("profile", "sections", "skills",
+                                                  "experiences", "certifications",
+                                                  "education", "services",
+                                                  "languages", "projects"))
+    for process in processes:
+        process.stdin.close()
+        process.wait()
+
+
+def run():
+    env = {
+        **os.environ,
+        "CACHE_BACKEND": CACHES["default"]["BACKEND"],
+        "CACHE_LOCATION": TABLE,
+    }
+    _serialize_sqlite_writes()
+    with override_settings(CACHES=CACHES):
+        call_command("createcachetable", verbosity=0)
+        try:
+            _series("com single-flight", env)
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {TABLE}")
+            _series("sem single-flight", {**env, "BENCH_NO_SINGLE_FLIGHT": "True"})
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {TABLE}")
@@ -0,0 +1,149 @@
+"""
+/api/suggest/ (core.suggest) com ENTRIES registros de teste divididos
+entre habilidades, projetos (com título traduzido) e experiências:
+
+1. Montagem do índice (três consultas + ordenação) e tamanho.
+2. Latência de prefixos de 1 a 4 letras tirados dos próprios textos, com
+   e sem acento: só a busca no índice, a view (RequestFactory) e a pilha
+   inteira com middlewares (Client), p50/p99.
+3. Atualização incremental (sinal + on_commit) de um save e de um delete.
+
+Cria e apaga os registros de teste.
+Uso: python manage.py shell -c "from scripts.bench_suggest import run; run()"
+"""
+import random
+import time
+from datetime import date
+
+from django.test import Client, RequestFactory
+
+from core import suggest
+from core.locales import fallback_chain, default_locale
+from core.models import Experience, Project, Skill
+from core.views import suggest as suggest_view
+
+ENTRIES = 100_000
+QUERIES = 20_000
+SLUG_PREFIX = "bench-suggest-"
+MARK = "bench-suggest"
+
+WORDS = (
+    "gestão informação análise automação integração educação saúde "
+    "logística finanças energia mobilidade segurança inteligência dados "
+    "plataforma serviço aplicação sistema portal agenda catálogo estoque "
+    "relatório pagamento cadastro vendas clínica escola transporte obra "
+    "ótica ágil pública módulo núcleo fábrica órbita cálculo índice"
+).split()
+TECH = (
+    "Python Django React TypeScript PostgreSQL Redis Docker Kubernetes "
+    "GraphQL Node Go Rust Kafka Terraform Linux Nginx Celery FastAPI"
+).split()
+
+
+def _text(rng, words: int) -> str:
+    return " ".join(rng.choice(WORDS + TECH) for _ in range(words)).capitalize()
+
+
+def _create(rng) -> None:
+    third = ENTRIES // 3
+    Skill.objects.bulk_create(
+        [Skill(name=f"{_text(rng, 2)} {i}", category=MARK) for i in range(third)],
+        batch_size=2000,
+    )
+    Project.objects.bulk_create(
+        [
+            Project(
+                title=_text(rng, 4),
+                slug=f"{SLUG_PREFIX}{i}",
+                short_description=MARK,
+                translations={"en": {"title": f"Project {_text(rng, 3)}"}},
+            )
+            for i in range(third)
+        ],
+        batch_size=2000,
+    )
+    Experience.objects.bulk_create(
+        [
+            Experience(
+                company_name=f"{_text(rng, 2)} {i % (third // 2)}",
+                role=MARK,
+                start_date=date(2020, 1, 1),
+            )
+            for i in range(ENTRIES - 2 * third)
+        ],
+        batch_size=2000,
+    )
+
+
+def _delete() -> None:
+    Skill.objects.filter(category=MARK).delete()
+    Project.objects.filter(slug__startswith=SLUG_PREFIX).delete()
+    Experience.objects.filter(role=MARK).delete()
+
+
+def _percentiles(timings) -> str:
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    return f"p50 {p50:7.1f} µs  p99 {p99:7.1f} µs"
+
+
+def _prefixes(rng) -> list:
+    prefixes = []
+    for _ in range(QUERIES):
+        word = rng.choice(WORDS + TECH)
+        prefix = word[: rng.randint(1, 4)]
+        prefixes.append(prefix if rng.random() < 0.5 else suggest.fold(prefix))
+    return prefixes
+
+
+def run():
+    rng = random.Random(49)
+    start = time.perf_counter()
+    _create(rng)
+    print(f"{ENTRIES} registros criados em {time.perf_counter() - start:.1f} s")
+    try:
+        start = time.perf_counter()
+        index = suggest.SuggestIndex.build()
+        print(f"índice: {len(index)} itens, {len(index._keys)} chaves, "
+              f"montado em {(time.perf_counter() - start) * 1000:.0f} ms")
+        suggest._index, suggest._versions = index, suggest.get_versions(suggest._scopes())
+
+        prefixes = _prefixes(rng)
+        chain = fallback_chain(default_locale())
+        timings = []
+        for prefix in prefixes:
+            t = time.perf_counter()
+            index.search(prefix, chain, 8)
+            timings.append(time.perf_counter() - t)
+        print(f"  busca no índice:   {_percentiles(timings)}")
+
+        factory = RequestFactory()
+        timings = []
+        for prefix in prefixes:
+            request = factory.get("/api/suggest/", {"prefix": prefix})
+            t = time.perf_counter()
+            suggest_view(request)
+            timings.append(time.perf_counter() - t)
+        print(f"  view:              {_percentiles(timings)}")
+
+        client = Client(HTTP_HOST="localhost")
+        timings = []
+        for prefix in prefixes[:5000]:
+            t = time.perf_counter()
+            client.get("/api/suggest/", {"prefix": prefix})
+            timings.append(time.perf_counter() - t)
+        print(f"  pilha completa:    {_percentiles(timings)}  (Client, com middlewares)")
+
+        skill = Skill.objects.create(name="Computação Quântica", category=MARK)
+        t = time.perf_counter()
+        found = index.search("quant", chain, 8)
+        print(f"save -> sugestão:    {found[:1]} ({(time.perf_counter() - t) * 1e6:.0f} µs)")
+        t = time.perf_counter()
+        index.update(Skill, skill)
+        print(f"  update incremental: {(time.perf_counter() - t) * 1e6:.0f} µs")
+        skill.delete()
+        print(f"delete -> sugestão:  {index.search('quant', chain, 8)}")
+    finally:
+        suggest._index = None
+        _delete()
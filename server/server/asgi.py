@@ -3,14 +3,39 @@ ASGI config for server project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Besides the Django app, it serves the content-invalidation SSE stream
+(settings.CONTENT_EVENTS_PATH) straight from asyncio. The procfile runs it
+as a separate "events" process, under gunicorn with uvicorn workers (same
+gunicorn.conf.py hooks):
+
+    gunicorn server.asgi:application -k uvicorn.workers.UvicornWorker -c gunicorn.conf.py
+
+The "web" process stays on server.wsgi: under ASGI every sync view runs in
+a per-request thread-sensitive context, so persistent connections
+(CONN_MAX_AGE) are never reused. Route /api/events/ to the events process
+(its own host or a proxy rule) and point the client at it with
+NEXT_PUBLIC_EVENTS_BASE_URL.
+
+The stream follows version bumps made by any process only with a shared
+cache backend (see CACHES in settings; core.E001 in `check --deploy`).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from core.events import content_events_app  # noqa: E402  (precisa do setup acima)
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"] == settings.CONTENT_EVENTS_PATH:
+        return await content_events_app(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -44,14 +44,17 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.media.MediaWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "core.middleware.ContentLocaleMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.profiling.RequestProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "server.urls"
@@ -80,14 +83,251 @@ WSGI_APPLICATION = "server.wsgi.application"
 # =========================
 # DATABASE
 # =========================
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+# Segundos para abrir uma conexão com o PostgreSQL.
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+
+# Réplicas de leitura: URLs separadas por vírgula, viram replica_1, replica_2...
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+
+
+def _database(config: dict, alias: str) -> dict:
+    # Pool nativo do psycopg 3 (opt-in, só PostgreSQL): as conexões são abertas
+    # uma vez por processo e reaproveitadas entre requisições e threads, sem
+    # novo handshake TLS. Métricas em core.dbpool.pool_metrics().
+    if config.get("ENGINE") == "django.db.backends.postgresql":
+        # Sem isto o libpq espera a conexão indefinidamente (e com ela o
+        # prober do readiness, core.health).
+        config.setdefault("OPTIONS", {}).setdefault("connect_timeout", DB_CONNECT_TIMEOUT)
+    if DB_POOL and config.get("ENGINE") == "django.db.backends.postgresql":
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+            "name": alias,
+        }
+        # Testa cada conexão ao sair do pool (um round trip a mais por checkout).
+        config["CONN_HEALTH_CHECKS"] = os.getenv("DB_POOL_CHECK", "True") == "True"
+    return config
+
+
 DATABASES = {
-    "default": dj_database_url.config(
-        default=os.getenv("DATABASE_URL"),
-        conn_max_age=600,
-        ssl_require=not DEBUG,
+    "default": _database(
+        dj_database_url.config(
+            default=os.getenv("DATABASE_URL"),
+            conn_max_age=0 if DB_POOL else 600,
+            ssl_require=not DEBUG,
+        ),
+        "default",
+    )
+}
+
+for _index, _url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    _replica = dj_database_url.parse(
+        _url, conn_max_age=0 if DB_POOL else 600, ssl_require=not DEBUG
     )
+    # Nos testes as réplicas apontam para o banco de teste do primário.
+    _replica["TEST"] = {"MIRROR": "default"}
+    DATABASES[f"replica_{_index}"] = _database(_replica, f"replica_{_index}")
+
+# Leituras de requisições GET/HEAD vão para as réplicas (ver core.routers).
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+# Depois de uma escrita, o mesmo cliente lê do primário por este tempo.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# Réplica com falha fica fora da rotação por este tempo.
+REPLICA_RETRY_SECONDS = int(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+# =========================
+# CACHE
+# =========================
+# As versões de conteúdo (core.cache), os payloads e as travas do
+# single-flight ficam no cache e precisam ser vistos por todos os processos
+# (workers do gunicorn e o processo ASGI do SSE), com incr/add atômicos e
+# sem ida ao banco: em produção, redis (REDIS_URL) ou memcached
+# (CACHE_BACKEND / CACHE_LOCATION). Sem nenhum deles o padrão é o locmem,
+# e com DEBUG desligado o `check --deploy` do release falha (core.checks).
+REDIS_URL = os.getenv("REDIS_URL", "")
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.redis.RedisCache"
+            if REDIS_URL
+            else "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", REDIS_URL or "portfolio"),
+    }
 }
 
+# =========================
+# PAYLOADS COMPARTILHADOS (core.payloadstore)
+# =========================
+# Payloads prontos num arquivo mapeado (mmap) comum aos workers da máquina,
+# em vez de uma cópia na memória de cada um. Precisa ser um disco local.
+PAYLOAD_STORE_ENABLED = os.getenv("PAYLOAD_STORE_ENABLED", "False") == "True"
+PAYLOAD_STORE_PATH = Path(
+    os.getenv("PAYLOAD_STORE_PATH", BASE_DIR / "var" / "payload-store" / "payloads.bin")
+)
+# Tamanho fixo do arquivo (esparso); cheio, ele é compactado.
+PAYLOAD_STORE_SIZE = int(os.getenv("PAYLOAD_STORE_SIZE", str(64 * 1024 * 1024)))
+
+# =========================
+# SINGLE-FLIGHT (core.singleflight)
+# =========================
+# Um só worker monta cada payload de uma versão nova; a trava fica no cache
+# (precisa de um backend com add atômico: redis, memcached).
+# Expiração da trava, para o caso de o processo morrer montando.
+SINGLE_FLIGHT_LOCK_TIMEOUT = int(os.getenv("SINGLE_FLIGHT_LOCK_TIMEOUT", "30"))
+# Espera máxima de quem não tem versão anterior para servir; depois monta.
+SINGLE_FLIGHT_WAIT = float(os.getenv("SINGLE_FLIGHT_WAIT", "5.0"))
+SINGLE_FLIGHT_POLL = float(os.getenv("SINGLE_FLIGHT_POLL", "0.02"))
+
+# =========================
+# EDGE CACHE (CDN / proxy reverso, core.edgecache)
+# =========================
+EDGE_CACHE_ENABLED = os.getenv("EDGE_CACHE_ENABLED", "True") == "True"
+# Em segundos. O s-maxage é longo porque cada alteração gera um purge das
+# respostas afetadas; o navegador (max-age 0) sempre revalida na borda.
+EDGE_CACHE_POLICIES = {
+    "content": {
+        "max_age": 0,
+        "s_maxage": int(os.getenv("EDGE_CACHE_S_MAXAGE", str(24 * 60 * 60))),
+        "stale_while_revalidate": 60,
+        "stale_if_error": 24 * 60 * 60,
+    },
+    # Estatísticas mudam com a data, sem alteração no banco.
+    "stats": {
+        "max_age": 0,
+        "s_maxage": 60 * 60,
+        "stale_while_revalidate": 60,
+        "stale_if_error": 24 * 60 * 60,
+    },
+    # Gravado em massa pelo check_links, sem purge.
+    "links": {
+        "max_age": 60,
+        "s_maxage": 5 * 60,
+        "stale_while_revalidate": 60,
+        "stale_if_error": 60 * 60,
+    },
+}
+# Prefixo das chaves em Surrogate-Key, para CDNs compartilhados.
+EDGE_CACHE_KEY_PREFIX = os.getenv("EDGE_CACHE_KEY_PREFIX", "")
+# "core.edgecache.NullPurger" (sem CDN) ou "core.edgecache.HTTPPurger".
+EDGE_PURGER = os.getenv("EDGE_PURGER", "core.edgecache.NullPurger")
+EDGE_PURGE_URL = os.getenv("EDGE_PURGE_URL", "")
+EDGE_PURGE_TOKEN = os.getenv("EDGE_PURGE_TOKEN")
+EDGE_PURGE_TOKEN_HEADER = os.getenv("EDGE_PURGE_TOKEN_HEADER", "Fastly-Key")
+EDGE_PURGE_TIMEOUT = float(os.getenv("EDGE_PURGE_TIMEOUT", "5"))
+
+# =========================
+# CONTENT EVENTS (SSE)
+# =========================
+CONTENT_EVENTS_PATH = "/api/events/"
+CONTENT_EVENTS_POLL_INTERVAL = float(os.getenv("CONTENT_EVENTS_POLL_INTERVAL", "1.0"))
+CONTENT_EVENTS_HEARTBEAT = float(os.getenv("CONTENT_EVENTS_HEARTBEAT", "15.0"))
+
+# =========================
+# CONTACT PRE-FILTER
+# =========================
+CONTACT_PREFILTER_WINDOW = int(os.getenv("CONTACT_PREFILTER_WINDOW", "3600"))
+CONTACT_PREFILTER_CAPACITY = int(os.getenv("CONTACT_PREFILTER_CAPACITY", "100000"))
+CONTACT_PREFILTER_ERROR_RATE = 0.001
+CONTACT_SPAM_SCORE_THRESHOLD = int(os.getenv("CONTACT_SPAM_SCORE_THRESHOLD", "4"))
+
+# Limites do corpo de /api/contact/ (o tamanho da mensagem não tem limite no banco).
+CONTACT_MESSAGE_MAX_LENGTH = int(os.getenv("CONTACT_MESSAGE_MAX_LENGTH", "5000"))
+CONTACT_MAX_BODY_BYTES = int(os.getenv("CONTACT_MAX_BODY_BYTES", "32768"))
+
+# "direct": um INSERT por mensagem. "journal": grava num journal local com
+# fsync, responde 202 e insere em lotes em segundo plano (core.journal).
+CONTACT_INGEST_MODE = os.getenv("CONTACT_INGEST_MODE", "direct")
+# Precisa ser um disco local e persistente, comum aos workers da máquina.
+CONTACT_JOURNAL_DIR = Path(os.getenv("CONTACT_JOURNAL_DIR", BASE_DIR / "var" / "contact-journal"))
+CONTACT_JOURNAL_FLUSH_INTERVAL = float(os.getenv("CONTACT_JOURNAL_FLUSH_INTERVAL", "1.0"))
+CONTACT_JOURNAL_BATCH_SIZE = int(os.getenv("CONTACT_JOURNAL_BATCH_SIZE", "500"))
+
+# =========================
+# CONTACT RETENTION (archive_contact_messages, core.retention)
+# =========================
+# Destino dos arquivos antes de apagar as mensagens: caminho absoluto num
+# volume persistente (nunca o disco efêmero do dyno). Vazio, o comando só
+# mantém as partições e não apaga nada.
+CONTACT_ARCHIVE_DIR = os.getenv("CONTACT_ARCHIVE_DIR", "")
+
+# =========================
+# CONTACT STATS (/api/internal/contact-stats/, core.rollups)
+# =========================
+# Período padrão da série (dias até hoje) e maior intervalo aceito.
+CONTACT_STATS_DEFAULT_DAYS = int(os.getenv("CONTACT_STATS_DEFAULT_DAYS", "30"))
+CONTACT_STATS_MAX_DAYS = int(os.getenv("CONTACT_STATS_MAX_DAYS", "1830"))
+
+# =========================
+# HEALTH (/health/live/, /health/ready/, /api/internal/health/)
+# =========================
+# O readiness é calculado em segundo plano a cada intervalo (core.health).
+# Cada teste (consulta ao banco, cache, SMTP) é limitado ao timeout.
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+HEALTH_SMTP_INTERVAL = float(os.getenv("HEALTH_SMTP_INTERVAL", "60"))
+# Rodadas guardadas por dependência para os percentis de latência.
+HEALTH_PROBE_WINDOW = int(os.getenv("HEALTH_PROBE_WINDOW", "120"))
+
+# =========================
+# PROFILING (core.profiling)
+# =========================
+# Desligado, o middleware nem entra na cadeia.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+# Perfila 1 em cada N requisições (0 = só sob pedido de staff).
+PROFILING_SAMPLE_RATE = int(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_BUFFER_SIZE = int(os.getenv("PROFILING_BUFFER_SIZE", "50"))
+
+# =========================
+# SUGGEST (/api/suggest/, core.suggest)
+# =========================
+SUGGEST_LIMIT = int(os.getenv("SUGGEST_LIMIT", "8"))
+SUGGEST_MAX_LIMIT = int(os.getenv("SUGGEST_MAX_LIMIT", "20"))
+SUGGEST_MAX_PREFIX = int(os.getenv("SUGGEST_MAX_PREFIX", "100"))
+# Intervalo mínimo entre as conferências das versões de conteúdo (alterações
+# feitas em outros workers aparecem depois disso mais a remontagem).
+SUGGEST_CHECK_INTERVAL = float(os.getenv("SUGGEST_CHECK_INTERVAL", "2.0"))
+
+# =========================
+# PROJECT DETAIL
+# =========================
+# Idade máxima do conjunto de slugs válidos usado para responder 404 sem
+# consultar o banco (as alterações feitas pelo admin valem na hora).
+PROJECT_SLUGS_TTL = int(os.getenv("PROJECT_SLUGS_TTL", "60"))
+
+# =========================
+# BATCH (/api/batch/)
+# =========================
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+BATCH_MAX_BODY_BYTES = int(os.getenv("BATCH_MAX_BODY_BYTES", "16384"))
+
+# =========================
+# LINK CHECK
+# =========================
+# Resultados mais novos que isto não são verificados de novo (sem --force).
+LINK_CHECK_TTL = int(os.getenv("LINK_CHECK_TTL", str(6 * 60 * 60)))
+LINK_CHECK_CONCURRENCY = int(os.getenv("LINK_CHECK_CONCURRENCY", "100"))
+LINK_CHECK_PER_HOST = int(os.getenv("LINK_CHECK_PER_HOST", "6"))
+LINK_CHECK_TIMEOUT = float(os.getenv("LINK_CHECK_TIMEOUT", "10"))
+
+# =========================
+# REPOSITORY METADATA (GitHub)
+# =========================
+# Base da API; em testes pode apontar para um servidor local.
+REPO_METADATA_API_URL = os.getenv("REPO_METADATA_API_URL", "https://api.github.com")
+# Sem token o limite da API é de 60 requisições/hora por IP.
+REPO_METADATA_TOKEN = os.getenv("GITHUB_TOKEN")
+# Metadados mais novos que isto não são consultados de novo (sem --force).
+REPO_METADATA_TTL = int(os.getenv("REPO_METADATA_TTL", str(60 * 60)))
+REPO_METADATA_CONCURRENCY = int(os.getenv("REPO_METADATA_CONCURRENCY", "8"))
+REPO_METADATA_TIMEOUT = float(os.getenv("REPO_METADATA_TIMEOUT", "10"))
+
 # =========================
 # EMAIL
 # =========================
@@ -108,11 +348,28 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
 STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     }
 }
 
+# =========================
+# MEDIA (imagens de projeto)
+# =========================
+MEDIA_URL = "/media/"
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", BASE_DIR / "media"))
+
+# Uploads sempre vão para arquivo temporário em disco, nunca para a memória.
+FILE_UPLOAD_HANDLERS = ["django.core.files.uploadhandler.TemporaryFileUploadHandler"]
+
+PROJECT_IMAGE_WIDTHS = [320, 640, 1280]
+PROJECT_IMAGE_FORMATS = ["webp", "jpeg"]
+# Processos do pool que gera as variantes em segundo plano.
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "1"))
+
 # =========================
 # I18N
 # =========================
@@ -121,4 +378,13 @@ TIME_ZONE = "UTC"
 USE_I18N = True
 USE_TZ = True
 
+# Idioma das colunas de texto do conteúdo; os demais ficam em `translations`
+# (ver core.locales). Escolhido por ?lang= ou Accept-Language.
+CONTENT_LANGUAGE = os.getenv("CONTENT_LANGUAGE", "pt-br").lower()
+CONTENT_LOCALES = [
+    locale.strip().lower()
+    for locale in os.getenv("CONTENT_LOCALES", f"{CONTENT_LANGUAGE},en").split(",")
+    if locale.strip()
+]
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
\ No newline at end of file
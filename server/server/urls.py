@@ -18,6 +18,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
 
+from core.views import health_live, health_ready
+
 
 def health(request):
     return JsonResponse({"status": "ok"})
@@ -25,6 +27,8 @@ def health(request):
 
 urlpatterns = [
     path("", health),  # opcional, só pra ter uma home que não seja 404
+    path("health/live/", health_live),
+    path("health/ready/", health_ready),
     path("admin/", admin.site.urls),
     path("api/", include("core.urls")),
 ]